@@ -1,38 +1,74 @@
+import os
+
+import click
 from dotenv import load_dotenv
 from flask import Flask
 from flask_bcrypt import Bcrypt
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
-from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 
-load_dotenv()
+from app.utils.blocklist import TokenBlocklist
+from app.utils.cache import ResponseCache
+from app.utils.compression import ResponseCompressor
+from app.utils.hashing import PasswordHasher
+from app.utils.json_provider import FastJSONProvider
+from app.utils.metrics import RequestMetrics
+from app.utils.principals import PrincipalCache
+from app.utils.query_tracker import QueryTracker
+from app.utils.replicas import ReplicaRouter, RoutingSession
+from app.utils.search import SearchIndex
+from app.utils.snapshot import PortfolioSnapshot
+from app.utils.sqlite import SQLiteProfile
 
 # Initialize extensions
-db = SQLAlchemy()
-migrate = Migrate()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 bcrypt = Bcrypt()
 jwt = JWTManager()
+response_cache = ResponseCache()
+token_blocklist = TokenBlocklist()
+principal_cache = PrincipalCache()
+password_hasher = PasswordHasher()
+portfolio_snapshot = PortfolioSnapshot()
+search_index = SearchIndex()
+request_metrics = RequestMetrics()
+query_tracker = QueryTracker()
+replica_router = ReplicaRouter()
+sqlite_profile = SQLiteProfile()
+response_compressor = ResponseCompressor()
 
 
 @jwt.token_in_blocklist_loader
 def check_if_token_revoked(jwt_header, jwt_payload):
-    from app.models.revoked_token import RevokedToken
-    jti = jwt_payload["jti"]
-    revoked = RevokedToken.query.filter_by(jti=jti).first()
-    return revoked is not None  # True if token is revoked
+    return token_blocklist.is_revoked(jwt_payload["jti"])  # True if token is revoked
 
 
-def create_app():
+def create_app(config=None):
+    # Before the config module is imported, as it reads the environment when its class is defined
+    load_dotenv()
+    if config is None:
+        config = os.getenv("APP_CONFIG", "app.config.Config")
     app = Flask(__name__)
-    app.config.from_object("app.config.Config")
+    app.config.from_object(config)
     app.url_map.strict_slashes = False
+    app.json = FastJSONProvider(app)
 
     # Initialize extensions with the app
     db.init_app(app)
+    sqlite_profile.init_app(app)
     bcrypt.init_app(app)
     jwt.init_app(app)
-    migrate.init_app(app, db)
+    response_cache.init_app(app)
+    token_blocklist.init_app(app)
+    principal_cache.init_app(app)
+    password_hasher.init_app(app)
+    portfolio_snapshot.init_app(app)
+    search_index.init_app(app)
+    request_metrics.init_app(app)
+    query_tracker.init_app(app)
+    replica_router.init_app(app)
+    # Registered last, so it runs first among the after-request hooks and metrics see the bytes sent
+    response_compressor.init_app(app)
 
     allowed_origins = "https://princeling.dev"
 
@@ -43,10 +79,11 @@ def create_app():
         allow_headers=["Content-Type", "Authorization", "Access-Control-Allow-Credentials"],
         expose_headers=["Access-Control-Allow-Origin"]
     )
-    print(f"Allowed Origins: {allowed_origins}")
+    app.logger.debug("Allowed origins: %s", allowed_origins)
 
     # Register blueprints
-    from app.routes import test_routes, user_routes, project_routes, social_link_routes, admin_routes, tag_routes
+    from app.routes import test_routes, user_routes, project_routes, social_link_routes, admin_routes, tag_routes, \
+        portfolio_routes
     if app.config['FLASK_ENV'] == "development":
         app.register_blueprint(test_routes)
     app.register_blueprint(user_routes)
@@ -54,5 +91,15 @@ def create_app():
     app.register_blueprint(social_link_routes)
     app.register_blueprint(tag_routes)
     app.register_blueprint(admin_routes)
+    app.register_blueprint(portfolio_routes)
+
+    # Register CLI commands. Flask-Migrate's `flask db` group is only needed under the flask CLI.
+    from app.commands import import_data_command, purge_revoked_tokens_command, ensure_schema_command
+    app.cli.add_command(import_data_command)
+    app.cli.add_command(purge_revoked_tokens_command)
+    app.cli.add_command(ensure_schema_command)
+    if click.get_current_context(silent=True) is not None:
+        from app.utils.migrations import init_migrate
+        init_migrate(app)
 
     return app
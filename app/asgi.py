@@ -0,0 +1,241 @@
+import io
+import re
+import sys
+
+from asgiref.wsgi import WsgiToAsgi
+from flask import abort, jsonify, request
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+from werkzeug.exceptions import HTTPException
+
+from app.exception.validation_error import ValidationError
+from app import db
+from app.models import Project, SocialLink, Tag
+from app.models.project import projects_tags
+from app.routes.project_routes import filter_projects
+from app.routes.tag_routes import INCLUDE_OPTIONS
+from app.utils.cache import async_cached_response
+from app.utils.pagination import PageRequest
+from app.utils.replicas import PRIMARY_ONLY_ENVIRON_KEY
+from app.utils.sqlite import apply_sqlite_profile
+
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+POOL_OPTIONS = ("pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping")
+
+
+def async_database_uri(config):
+    """`ASYNC_SQLALCHEMY_DATABASE_URI`, or the main database URI with its driver swapped for an asyncio one."""
+    if config.get("ASYNC_SQLALCHEMY_DATABASE_URI"):
+        return config["ASYNC_SQLALCHEMY_DATABASE_URI"]
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    if url.drivername not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No asyncio driver known for {url.drivername}. Set ASYNC_SQLALCHEMY_DATABASE_URI.")
+    return url.set(drivername=ASYNC_DRIVERS[url.drivername])
+
+
+def _validation_error(e):
+    return jsonify({
+        "message": e.message,
+        "error": "Validation error"
+    }), 400
+
+
+class AsyncReadApp:
+    """
+    ASGI application serving the public read endpoints on SQLAlchemy's asyncio engine.
+
+    GET and HEAD requests for project, tag and social link reads are answered by coroutines
+    (aiomysql in production, aiosqlite with SQLite), so one process can have many of them
+    waiting on the database at once. Everything else is passed to the Flask app on a thread.
+    The coroutines run inside a Flask request context with the app's before and after request
+    hooks, and share its response cache, so responses match the synchronous views.
+    Reads always go to the primary: the requests are marked so the replica router's hook,
+    whose health probes would block the event loop, leaves them alone.
+    """
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        options = flask_app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {}
+        with flask_app.app_context():
+            # The engine's URL, as Flask-SQLAlchemy resolves relative SQLite paths to the instance folder
+            uri = async_database_uri({**flask_app.config, "SQLALCHEMY_DATABASE_URI": db.engine.url})
+        self.engine = create_async_engine(uri, **{name: options[name] for name in POOL_OPTIONS if name in options})
+        if self.engine.dialect.name == "sqlite" and flask_app.config["SQLITE_PROFILE_ENABLED"]:
+            apply_sqlite_profile(self.engine.sync_engine, flask_app.config)
+        self.sessions = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.routes = (
+            (re.compile(r"^/v1/projects/?$"), self.get_projects),
+            (re.compile(r"^/v1/projects/(?P<project_id>\d+)/?$"), self.get_project),
+            (re.compile(r"^/v1/tags/?$"), self.get_all_tags),
+            (re.compile(r"^/v1/sociallinks/?$"), self.get_social_links),
+            (re.compile(r"^/v1/sociallinks/(?P<social_link_id>\d+)/?$"), self.get_social_link),
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] == "http" and scope["method"] in ("GET", "HEAD"):
+            for pattern, view in self.routes:
+                match = pattern.match(scope["path"])
+                if match:
+                    kwargs = {name: int(value) for name, value in match.groupdict().items()}
+                    await self._serve(scope, send, view, kwargs)
+                    return
+        await self.wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.engine.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _serve(self, scope, send, view, kwargs):
+        app = self.flask_app
+        with app.request_context(_environ(scope)):
+            try:
+                rv = app.preprocess_request()
+                if rv is None:
+                    rv = await view(**kwargs)
+            except HTTPException as e:
+                rv = app.handle_user_exception(e)
+            except Exception as e:
+                rv = app.handle_exception(e)
+            response = app.process_response(app.make_response(rv))
+            body = b"" if scope["method"] == "HEAD" else response.get_data()
+
+        await send({
+            "type": "http.response.start",
+            "status": response.status_code,
+            "headers": [(name.lower().encode("latin1"), value.encode("latin1"))
+                        for name, value in response.headers.items()],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    @async_cached_response
+    async def get_projects(self):
+        try:
+            page = PageRequest(
+                {"id": Project.id, "begin_date": Project.begin_date, "updated_at": Project.updated_at},
+                Project.id
+            )
+            statement = filter_projects(select(Project).options(selectinload(Project.tags)), request.args)
+        except ValidationError as e:
+            return _validation_error(e)
+
+        async with self.sessions() as session:
+            rows = (await session.execute(page.apply(statement))).scalars().all()
+        projects, next_cursor = page.page(rows)
+        return jsonify(page.response([project.dump() for project in projects], next_cursor)), 200
+
+    @async_cached_response
+    async def get_project(self, project_id):
+        async with self.sessions() as session:
+            project = await session.get(Project, project_id, options=[selectinload(Project.tags)])
+        if project is None:
+            abort(404, description="Project not found")
+        return jsonify(project.dump()), 200
+
+    @async_cached_response
+    async def get_all_tags(self):
+        include = request.args.get('include', 'count')
+        if include not in INCLUDE_OPTIONS:
+            return jsonify({
+                "message": f"Invalid include. Must be one of {', '.join(INCLUDE_OPTIONS)}.",
+                "error": "Bad request"
+            }), 400
+
+        try:
+            page = PageRequest({"id": Tag.id}, Tag.id)
+        except ValidationError as e:
+            return _validation_error(e)
+
+        async with self.sessions() as session:
+            if include == 'projects':
+                statement = page.apply(select(Tag).options(selectinload(Tag.projects)))
+                tags, next_cursor = page.page((await session.execute(statement)).scalars().all())
+                return jsonify(page.response([tag.dump() for tag in tags], next_cursor)), 200
+
+            rows, next_cursor = page.page(
+                (await session.execute(page.apply(Tag.project_counts_statement()))).all(),
+                key=lambda row: row[0]
+            )
+            references = {tag.id: [] for tag, _ in rows}
+            if include != 'count':
+                links = await session.execute(
+                    select(projects_tags.c.tag_id, Project.id, Project.slug)
+                    .join(Project, Project.id == projects_tags.c.project_id)
+                    .where(projects_tags.c.tag_id.in_(references))
+                    .order_by(projects_tags.c.tag_id, Project.id)
+                )
+                for tag_id, project_id, project_slug in links:
+                    references[tag_id].append(project_id if include == 'project_ids' else project_slug)
+
+        if include == 'count':
+            items = [{**tag.to_dict(partial=True), "project_count": count} for tag, count in rows]
+        else:
+            items = [
+                {**tag.to_dict(partial=True), "project_count": count, include: references[tag.id]}
+                for tag, count in rows
+            ]
+        return jsonify(page.response(items, next_cursor)), 200
+
+    @async_cached_response
+    async def get_social_links(self):
+        try:
+            page = PageRequest({"id": SocialLink.id}, SocialLink.id)
+        except ValidationError as e:
+            return _validation_error(e)
+
+        async with self.sessions() as session:
+            rows = (await session.execute(page.apply(select(SocialLink)))).scalars().all()
+        social_links, next_cursor = page.page(rows)
+        return jsonify(page.response([sl.dump() for sl in social_links], next_cursor)), 200
+
+    @async_cached_response
+    async def get_social_link(self, social_link_id):
+        async with self.sessions() as session:
+            social_link = await session.get(SocialLink, social_link_id)
+        if social_link is None:
+            abort(404)
+        return jsonify(social_link.dump()), 200
+
+
+def _environ(scope):
+    """A WSGI environ for a bodiless request, enough for a Flask request context."""
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf8").decode("latin1"),
+        "PATH_INFO": scope["path"].encode("utf8").decode("latin1"),
+        "QUERY_STRING": scope["query_string"].decode("latin1"),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "SERVER_NAME": scope["server"][0] if scope.get("server") else "localhost",
+        "SERVER_PORT": str(scope["server"][1]) if scope.get("server") else "80",
+        "REMOTE_ADDR": scope["client"][0] if scope.get("client") else "",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+        PRIMARY_ONLY_ENVIRON_KEY: True,
+    }
+    for name, value in scope.get("headers", ()):
+        key = name.decode("latin1").upper().replace("-", "_")
+        if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            key = f"HTTP_{key}"
+        value = value.decode("latin1")
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
@@ -0,0 +1,52 @@
+import json
+from collections import Counter
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+
+@click.command('import-data')
+@click.argument('path', type=click.File('r'))
+@click.option('--chunk-size', type=int, default=None, help='Rows written per transaction.')
+@click.option('--dry-run', is_flag=True, help='Validate the payload without writing anything.')
+@with_appcontext
+def import_data_command(path, chunk_size, dry_run):
+    """Bulk-imports projects, social links and users from a JSON file."""
+    from app.utils.bulk_import import BulkImport
+
+    report = BulkImport(chunk_size=chunk_size).run(json.load(path), dry_run=dry_run)
+    for error in report['errors']:
+        click.echo(f"{error['section']}[{error['index']}]: {error['error']}", err=True)
+    failed = Counter(error['section'] for error in report['errors'])
+    counts = report['valid'] if dry_run else report['imported']
+    outcome = 'valid' if dry_run else 'imported'
+    for section in BulkImport.SECTIONS:
+        click.echo(f"{section}: {counts.get(section, 0)} {outcome}, {failed[section]} errors")
+    click.echo(
+        f"{'Validated' if dry_run else 'Imported'} {sum(counts.values())} rows in {report['elapsed_seconds']}s "
+        f"({report['rows_per_second']} rows/s, {len(report['errors'])} errors)"
+    )
+
+
+@click.command('purge-revoked-tokens')
+@click.option('--batch-size', type=int, default=1000, show_default=True, help='Rows deleted per transaction.')
+@with_appcontext
+def purge_revoked_tokens_command(batch_size):
+    """Deletes revoked tokens that have outlived the refresh token lifetime. Suitable for cron."""
+    from app.models.revoked_token import RevokedToken
+
+    deleted, batches, seconds = RevokedToken.purge_expired(batch_size=batch_size)
+    click.echo(f"Purged {deleted} revoked tokens in {batches} batches ({seconds:.3f}s)")
+
+
+@click.command('ensure-schema')
+@with_appcontext
+def ensure_schema_command():
+    """Migrates the database unless its schema is already current. Safe to run from several processes at once."""
+    from app.utils.migrations import ensure_schema
+
+    if ensure_schema(current_app):
+        click.echo("Schema migrated")
+    else:
+        click.echo("Schema already current")
@@ -1,18 +1,96 @@
 import os
 
+from sqlalchemy.engine import make_url
+
+from app.utils.pool import InstrumentedQueuePool
+
+
+def _sqlite_in_memory(uri):
+    """Whether `uri` names an in-memory SQLite database, which Flask-SQLAlchemy serves from a StaticPool."""
+    return make_url(uri).database in (None, "", ":memory:")
+
 
 class Config:
     FLASK_ENV = os.getenv("FLASK_ENV")
 
+    # Database backend: "mariadb" or "sqlite". DATABASE_URL, when set, is used as is.
+    DATABASE_BACKEND = os.getenv("DATABASE_BACKEND", "mariadb").lower()
+
     username = os.getenv("MARIADB_USER")
     password = os.getenv("MARIADB_PASSWORD")
     host = os.getenv("MARIADB_HOST")
     port = os.getenv("MARIADB_PORT")
     database = os.getenv("MARIADB_DATABASE")
+    # Relative paths are resolved against the instance folder
+    SQLITE_PATH = os.getenv("SQLITE_PATH", "personal.db")
 
-    SQLALCHEMY_DATABASE_URI = f"mysql+pymysql://{username}:{password}@{host}:{port}/{database}"
+    if os.getenv("DATABASE_URL"):
+        SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
+    elif DATABASE_BACKEND == "sqlite":
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{SQLITE_PATH}"
+    elif DATABASE_BACKEND == "mariadb":
+        SQLALCHEMY_DATABASE_URI = f"mysql+pymysql://{username}:{password}@{host}:{port}/{database}"
+    else:
+        raise ValueError(f"Unknown DATABASE_BACKEND {DATABASE_BACKEND!r}. Use 'mariadb' or 'sqlite'.")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Connection pool. Each gunicorn thread holds at most one connection, so size the pool to
+    # the thread count and keep workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) below max_connections.
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", os.getenv("GUNICORN_THREADS", 4)))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 2))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+    # Recycle connections before MariaDB's wait_timeout closes them; pre-ping catches the rest
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", 5))
+    DB_READ_TIMEOUT = int(os.getenv("DB_READ_TIMEOUT", 30))
+    DB_WRITE_TIMEOUT = int(os.getenv("DB_WRITE_TIMEOUT", 30))
+    MARIADB_ENGINE_OPTIONS = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+        "connect_args": {
+            "connect_timeout": DB_CONNECT_TIMEOUT,
+            "read_timeout": DB_READ_TIMEOUT,
+            "write_timeout": DB_WRITE_TIMEOUT,
+        },
+    }
+    # A local file cannot drop connections, so there is nothing to pre-ping or recycle
+    SQLITE_ENGINE_OPTIONS = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    }
+    if not SQLALCHEMY_DATABASE_URI.startswith("sqlite"):
+        SQLALCHEMY_ENGINE_OPTIONS = MARIADB_ENGINE_OPTIONS
+    elif _sqlite_in_memory(SQLALCHEMY_DATABASE_URI):
+        # A StaticPool shares its one connection and takes no queue pool options
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+    else:
+        SQLALCHEMY_ENGINE_OPTIONS = SQLITE_ENGINE_OPTIONS
+
+    # SQLite profile, applied to every new SQLite connection. WAL lets reads run alongside a
+    # write, and synchronous=NORMAL is durable in WAL mode except across a power loss.
+    SQLITE_PROFILE_ENABLED = os.getenv("SQLITE_PROFILE_ENABLED", "true").lower() == "true"
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    SQLITE_STATEMENT_CACHE_SIZE = int(os.getenv("SQLITE_STATEMENT_CACHE_SIZE", 256))
+
+    # Read replicas: comma separated URIs. Safe GETs of these blueprints read from a replica.
+    SQLALCHEMY_REPLICA_URIS = [uri for uri in os.getenv("DATABASE_REPLICA_URIS", "").split(",") if uri]
+    REPLICA_READ_BLUEPRINTS = ["project_routes", "tag_routes", "social_link_routes"]
+    # Clients stay on the primary this long after a write, covering replication lag
+    REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 5))
+    REPLICA_RETRY_INTERVAL = float(os.getenv("REPLICA_RETRY_INTERVAL", 30))
+
     SECRET_KEY = os.getenv("SECRET_KEY")
+    # Encode JSON responses with orjson when it is installed
+    JSON_USE_ORJSON = os.getenv("JSON_USE_ORJSON", "true").lower() == "true"
 
     # JWT
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
@@ -23,5 +101,61 @@ class Config:
     JWT_COOKIE_SAMESITE = "Strict"
     JWT_SESSION_COOKIE = False
     JWT_CSRF_IN_COOKIES = False
+    # Trust the `is_admin` claim embedded in access tokens instead of looking the user up.
+    # Demoting an admin then only takes effect once their access token expires.
+    JWT_TRUST_ADMIN_CLAIM = os.getenv("JWT_TRUST_ADMIN_CLAIM", "false").lower() == "true"
+
+    # Principal cache
+    PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", 60))
+
+    # Revoked token blocklist
+    REVOKED_TOKEN_FILTER_CAPACITY = int(os.getenv("REVOKED_TOKEN_FILTER_CAPACITY", 100_000))
+    REVOKED_TOKEN_FILTER_ERROR_RATE = float(os.getenv("REVOKED_TOKEN_FILTER_ERROR_RATE", 0.001))
+    REVOKED_TOKEN_EXACT_SIZE = int(os.getenv("REVOKED_TOKEN_EXACT_SIZE", 10_000))
+    REVOKED_TOKEN_SYNC_INTERVAL = float(os.getenv("REVOKED_TOKEN_SYNC_INTERVAL", 5))
+    # Ids re-read on every sync, covering revocations that commit after ones with higher ids
+    REVOKED_TOKEN_SYNC_WINDOW = int(os.getenv("REVOKED_TOKEN_SYNC_WINDOW", 1000))
+
+    # Password hashing
+    BCRYPT_LOG_ROUNDS = int(os.getenv("BCRYPT_LOG_ROUNDS", 16))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", 8))
+
+    # Keyset pagination
+    PAGINATION_DEFAULT_LIMIT = int(os.getenv("PAGINATION_DEFAULT_LIMIT", 20))
+    PAGINATION_MAX_LIMIT = int(os.getenv("PAGINATION_MAX_LIMIT", 100))
+
+    # Bulk import
+    BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", 1000))
+
+    # Project search
+    SEARCH_INDEX_TTL = float(os.getenv("SEARCH_INDEX_TTL", 300))
+
+    # Response cache
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", 30))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 512))
+
+    # Response compression, negotiated through Accept-Encoding (brotli when installed, else gzip)
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 500))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 5))
+
+    # Request metrics. Set METRICS_DIR to a directory shared by all workers to aggregate across them.
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_DIR = os.getenv("METRICS_DIR") or None
+    METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", 5))
+
+    # Query tracker: logs likely N+1 patterns and slow statements. On by default in development.
+    QUERY_TRACKER_ENABLED = os.getenv("QUERY_TRACKER_ENABLED", str(FLASK_ENV == "development")).lower() == "true"
+    QUERY_TRACKER_REPEAT_THRESHOLD = int(os.getenv("QUERY_TRACKER_REPEAT_THRESHOLD", 5))
+    QUERY_TRACKER_SLOW_QUERY_MS = float(os.getenv("QUERY_TRACKER_SLOW_QUERY_MS", 100))
+
+    # Schema migrations. With MIGRATE_ON_START, main.py checks the alembic version on start and
+    # migrates behind a lock only when it is behind, so workers starting together migrate once.
+    MIGRATIONS_DIRECTORY = os.getenv("MIGRATIONS_DIRECTORY", "migrations")
+    MIGRATE_ON_START = os.getenv("MIGRATE_ON_START", "false").lower() == "true"
+    MIGRATION_LOCK_TIMEOUT = int(os.getenv("MIGRATION_LOCK_TIMEOUT", 120))
 
     ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "").split(",")
\ No newline at end of file
@@ -0,0 +1,8 @@
+class ServiceBusyError(Exception):
+    """
+    Exception for work rejected because a bounded resource is saturated.
+    """
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
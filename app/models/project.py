@@ -1,8 +1,8 @@
 import re
 from datetime import datetime
 
-from slugify import slugify
-from sqlalchemy import Column, String, Boolean, Table, Integer, ForeignKey, Date
+from sqlalchemy import Column, String, Boolean, Table, Integer, ForeignKey, Date, Index, insert, func, select
+from sqlalchemy.dialects import mysql, sqlite
 from sqlalchemy.orm import relationship, validates
 
 from app import db
@@ -13,27 +13,85 @@ from app.utils.utils import is_valid_date
 
 name_regex = re.compile(r'^[a-zA-Z0-9_ ]{3,120}$')
 
+PROJECT_TYPES = ("personal", "commission", "other")
+PROJECT_STATUSES = ("completed", "maintained", "developing")
+
+
+SLUG_MAX_LENGTH = 16
+# Longest "-N" suffix that generated slugs leave room for
+SLUG_SUFFIX_MAX_LENGTH = 8
+
+
+class SlugAllocator:
+    """
+    Allocates unique slugs against a known set of taken ones.
+
+    The base slug is truncated to leave room for a "-N" suffix, with trailing hyphens stripped,
+    so candidates stay distinct and within the length limit. One of the first len(taken) + 1
+    candidates must be free. The allocator also remembers where each base's search stopped,
+    so allocating many similar slugs in one batch stays linear.
+    """
+
+    def __init__(self, taken):
+        self.taken = set(taken)
+        self._next_suffix = {}
+
+    def __contains__(self, slug):
+        return slug in self.taken
+
+    def add(self, slug):
+        self.taken.add(slug)
+
+    def allocate(self, name):
+        base_slug = _slugify(name)
+        if not base_slug:
+            return base_slug
+
+        slug = base_slug
+        count = self._next_suffix.get(base_slug, 1)
+        while slug in self.taken:
+            suffix = f"-{count}"
+            slug = f"{base_slug[:SLUG_MAX_LENGTH - len(suffix)].rstrip('-')}{suffix}"
+            count += 1
+        self._next_suffix[base_slug] = count
+        self.taken.add(slug)
+        return slug
+
+
+def _slugify(name):
+    # python-slugify compiles its patterns on import, so it is loaded when the first slug is made
+    from slugify import slugify
+    return slugify(name)[:SLUG_MAX_LENGTH]
+
 
 def generate_unique_slug(name):
-    base_slug = slugify(name)[:16]
-    slug = base_slug
-    count = 1
-    while Project.query.filter_by(slug=slug).first():
-        slug = f"{base_slug}-{count}"[:16]
-        count += 1
-    return slug
+    base_slug = _slugify(name)
+    if not base_slug:
+        return base_slug
+
+    # Every candidate starts with this prefix, so one query finds everything it could collide with
+    prefix = base_slug[:SLUG_MAX_LENGTH - SLUG_SUFFIX_MAX_LENGTH]
+    taken = db.session.query(Project.slug).filter(Project.slug.like(f"{prefix}%"))
+    return SlugAllocator(slug for (slug,) in taken).allocate(name)
 
 
 # Association table
 projects_tags = Table(
     'projects_tags', db.Model.metadata,
     Column('project_id', Integer, ForeignKey('projects.id'), primary_key=True),
-    Column('tag_id', Integer, ForeignKey('tags.id'), primary_key=True)
+    Column('tag_id', Integer, ForeignKey('tags.id'), primary_key=True),
+    # The primary key leads with project_id; filtering projects by tag needs the reverse
+    Index('ix_projects_tags_tag_id_project_id', 'tag_id', 'project_id')
 )
 
 
 class Project(db.Model, BaseModel, CRUDMixin, SerializerMixin, TimestampMixin):
     __tablename__ = 'projects'
+    __table_args__ = (
+        Index('ix_projects_status_type_featured_begin_date', 'status', 'type', 'featured', 'begin_date'),
+        {'extend_existing': True},
+    )
+    __serialized_relationships__ = ('tags',)
 
     slug = Column(String(64), unique=True, nullable=False)
     name = Column(String(120), nullable=False)
@@ -53,10 +111,19 @@ class Project(db.Model, BaseModel, CRUDMixin, SerializerMixin, TimestampMixin):
         back_populates='projects'
     )
 
-    def __init__(self, **kwargs):
+    def __init__(self, slugs=None, **kwargs):
+        # Batch callers pass a SlugAllocator of the slugs in use, so uniqueness is checked without a query per row
+        self._slugs = slugs
         if "slug" not in kwargs or not kwargs["slug"]:
-            kwargs["slug"] = generate_unique_slug(kwargs.get("name", ""))
+            if slugs is not None:
+                kwargs["slug"] = slugs.allocate(kwargs.get("name", ""))
+            else:
+                kwargs["slug"] = generate_unique_slug(kwargs.get("name", ""))
+            # Already checked against every existing slug, so validate_slug can skip its lookup
+            self._generated_slug = kwargs["slug"]
         super().__init__(**kwargs)
+        if slugs is not None:
+            slugs.add(self.slug)
 
     def add_tag(self, tag):
         if tag not in self.tags:
@@ -72,29 +139,17 @@ class Project(db.Model, BaseModel, CRUDMixin, SerializerMixin, TimestampMixin):
     def dump(self):
         return self.to_dict()
 
-    def to_dict(self, exclude=None, partial=False):
-        exclude = exclude or []
-        if hasattr(self, '__table__'):
-            serialized_data = {
-                column.name: getattr(self, column.name)
-                for column in self.__table__.columns
-                if column.name not in exclude
-            }
-            if not partial:
-                # Now check for `tags` relationships and serialize them as well.
-                if hasattr(self, 'tags'):
-                    serialized_data['tags'] = [tag.to_dict(partial=True) for tag in self.tags]
-            return serialized_data
-        raise AttributeError(f"{self.__class__.__name__} does not have a __table__ attribute.")
-
     @validates("slug")
     def validate_slug(self, key, value):
         if not value:
             raise ValidationError(f"Slug is required. ({self.name})")
         if len(value) < 3 or len(value) > 64:
             raise ValidationError(f"Invalid slug. Must be between 3 and 64 characters. ({self.name})")
-        if Project.query.filter_by(slug=value).first():
-            raise ValidationError(f"Slug already in use. ({self.name})")
+        if value != getattr(self, '_generated_slug', None):
+            slugs = getattr(self, '_slugs', None)
+            in_use = value in slugs if slugs is not None else Project.query.filter_by(slug=value).first()
+            if in_use:
+                raise ValidationError(f"Slug already in use. ({self.name})")
         return value
 
     @validates("name")
@@ -139,7 +194,7 @@ class Project(db.Model, BaseModel, CRUDMixin, SerializerMixin, TimestampMixin):
     def validate_type(self, key, value):
         if not value:
             raise ValidationError(f"Type is required. ({self.name})")
-        if value not in ["personal", "commission", "other"]:
+        if value not in PROJECT_TYPES:
             raise ValidationError(f"Invalid type. Must be one of 'personal', 'commission', or 'other'. ({self.name})")
         return value
 
@@ -147,7 +202,7 @@ class Project(db.Model, BaseModel, CRUDMixin, SerializerMixin, TimestampMixin):
     def validate_status(self, key, value):
         if not value:
             raise ValidationError(f"Status is required. ({self.name})")
-        if value not in ["completed", "maintained", "developing"]:
+        if value not in PROJECT_STATUSES:
             raise ValidationError(f"Invalid status. Must be one of 'completed', 'maintained', or 'developing'. ({self.name})")
         return value
 
@@ -174,6 +229,7 @@ class Project(db.Model, BaseModel, CRUDMixin, SerializerMixin, TimestampMixin):
 
 class Tag(db.Model, BaseModel, CRUDMixin, SerializerMixin, TimestampMixin):
     __tablename__ = 'tags'
+    __serialized_relationships__ = ('projects',)
 
     name = Column(String(16), unique=True, nullable=False)
     is_tech = Column(Boolean, default=False, nullable=False)
@@ -195,24 +251,71 @@ class Tag(db.Model, BaseModel, CRUDMixin, SerializerMixin, TimestampMixin):
             tag.save(commit=commit)
         return tag
 
+    @staticmethod
+    def with_project_counts():
+        """Query of `(tag, project_count)` rows, computed with a single GROUP BY over `projects_tags`."""
+        return (
+            db.session.query(Tag, func.count(projects_tags.c.project_id))
+            .outerjoin(projects_tags, projects_tags.c.tag_id == Tag.id)
+            .group_by(Tag.id)
+        )
+
+    @staticmethod
+    def project_counts_statement():
+        """`with_project_counts()` as a select statement, for sessions that only execute statements."""
+        return (
+            select(Tag, func.count(projects_tags.c.project_id))
+            .outerjoin(projects_tags, projects_tags.c.tag_id == Tag.id)
+            .group_by(Tag.id)
+        )
+
+    @staticmethod
+    def get_or_create_many(tags):
+        """
+        Resolves `(name, is_tech)` pairs to tags, creating the missing ones without committing.
+
+        Existing tags are fetched with one `IN` query and missing ones are inserted with a single
+        multi-row upsert, so concurrent creators of the same name don't trip the unique constraint.
+        Returns one tag per distinct name, in input order. Like `get_or_create`, an existing tag
+        keeps its `is_tech` flag.
+        """
+        requested = {}
+        for name, is_tech in tags:
+            if not name or len(name) > 16:
+                raise ValidationError(f"Invalid name. Must be between 1 and 16 characters. ({name})")
+            requested.setdefault(name, bool(is_tech))
+        if not requested:
+            return []
+
+        resolved = {tag.name: tag for tag in Tag.query.filter(Tag.name.in_(requested))}
+        # Case-insensitive collations match names spelled differently, which are not missing either
+        found = {name.lower() for name in resolved}
+        missing = [name for name in requested if name.lower() not in found]
+        if missing:
+            db.session.execute(Tag._upsert_statement(), [
+                {"name": name, "is_tech": requested[name]} for name in missing
+            ])
+            # A locking read sees rows committed by concurrent creators since this transaction began
+            created = Tag.query.filter(Tag.name.in_(missing)).with_for_update(read=True)
+            resolved.update({tag.name: tag for tag in created})
+
+        # Case-insensitive collations may resolve a name to an existing tag spelled differently
+        folded = {name.lower(): tag for name, tag in resolved.items()}
+        return [resolved.get(name) or folded[name.lower()] for name in requested]
+
+    @staticmethod
+    def _upsert_statement(dialect=None):
+        dialect = dialect or db.session.get_bind(mapper=Tag.__mapper__).dialect.name
+        if dialect in ("mysql", "mariadb"):
+            # A no-op on conflict: an existing tag keeps its spelling and is_tech flag
+            return mysql.insert(Tag.__table__).on_duplicate_key_update(id=Tag.__table__.c.id)
+        if dialect == "sqlite":
+            return sqlite.insert(Tag.__table__).on_conflict_do_nothing(index_elements=["name"])
+        return insert(Tag.__table__)
+
     def dump(self):
         return self.to_dict()
 
-    def to_dict(self, exclude=None, partial=False):
-        exclude = exclude or []
-        if hasattr(self, '__table__'):
-            serialized_data = {
-                column.name: getattr(self, column.name)
-                for column in self.__table__.columns
-                if column.name not in exclude
-            }
-            if not partial:
-                # Now check for `projects` relationships and serialize them as well.
-                if hasattr(self, 'projects'):
-                    serialized_data['projects'] = [project.to_dict(partial=True) for project in self.projects]
-            return serialized_data
-        raise AttributeError(f"{self.__class__.__name__} does not have a __table__ attribute.")
-
     @validates("name")
     def validate_name(self, key, value):
         if not value:
@@ -1,5 +1,7 @@
+import time
 from datetime import datetime
 
+from flask import current_app
 from sqlalchemy import Column, String, DateTime, Integer, ForeignKey
 from sqlalchemy.orm import relationship, validates
 
@@ -12,7 +14,7 @@ class RevokedToken(db.Model, BaseModel, CRUDMixin, SerializerMixin):
     __tablename__ = 'revoked_tokens'
 
     jti = Column(String(36), unique=True, nullable=False)  # JWT ID
-    revoked_at = Column(DateTime, default=datetime.now())
+    revoked_at = Column(DateTime, default=datetime.now, index=True)
 
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     user = relationship('User', backref='revoked_tokens')
@@ -20,6 +22,40 @@ class RevokedToken(db.Model, BaseModel, CRUDMixin, SerializerMixin):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
+    @staticmethod
+    def purge_expired(batch_size=1000):
+        """
+        Deletes tokens revoked longer ago than the refresh token lifetime. By then, every token
+        revoked at that time has expired on its own. Rows are deleted in batches of `batch_size`,
+        one transaction each, using the `revoked_at` index.
+
+        Returns the number of rows deleted, the number of batches and the elapsed seconds.
+        """
+        started = time.perf_counter()
+        lifetime = current_app.config['JWT_REFRESH_TOKEN_EXPIRES']
+        if not lifetime:
+            # Refresh tokens never expire, so no revocation can be forgotten
+            return 0, 0, time.perf_counter() - started
+
+        cutoff = datetime.now() - lifetime
+        deleted = batches = 0
+        while True:
+            ids = [row_id for (row_id,) in (
+                db.session.query(RevokedToken.id)
+                .filter(RevokedToken.revoked_at < cutoff)
+                .order_by(RevokedToken.revoked_at)
+                .limit(batch_size)
+            )]
+            if not ids:
+                break
+            RevokedToken.query.filter(RevokedToken.id.in_(ids)).delete(synchronize_session=False)
+            db.session.commit()
+            deleted += len(ids)
+            batches += 1
+            if len(ids) < batch_size:
+                break
+        return deleted, batches, time.perf_counter() - started
+
     @validates("jti")
     def validate_jti(self, key, value):
         if not value:
@@ -32,7 +68,9 @@ class RevokedToken(db.Model, BaseModel, CRUDMixin, SerializerMixin):
     def validate_revoked_at(self, key, value):
         if not value:
             raise ValueError("Revoked at is required.")
-        return datetime.strptime(value, "%Y-%m-%d").date()
+        if isinstance(value, datetime):
+            return value
+        return datetime.strptime(value, "%Y-%m-%d")
 
     @validates("user_id")
     def validate_user_id(self, key, value):
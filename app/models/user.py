@@ -1,6 +1,5 @@
 import re
 
-import email_validator
 from sqlalchemy import String, Column, Boolean
 from sqlalchemy.orm import validates
 
@@ -8,7 +7,7 @@ from app import db
 from app.exception.validation_error import ValidationError
 from app.models.base import BaseModel
 from app.utils.mixins import SerializerMixin, TimestampMixin, CRUDMixin
-from app.utils.utils import hash_password
+from app.utils.utils import hash_password, check_password
 
 username_regex = re.compile(r'^[a-zA-Z0-9_]{3,16}$')
 
@@ -22,20 +21,34 @@ class User(db.Model, TimestampMixin, SerializerMixin, CRUDMixin, BaseModel):
     email_confirmed = Column(Boolean, default=False)
     is_admin = Column(Boolean, default=False)
 
-    def __init__(self, **kwargs):
+    def __init__(self, usernames=None, emails=None, **kwargs):
+        # Batch callers pass the usernames and confirmed emails in use, so uniqueness is checked without a query per row
+        self._usernames = usernames
+        self._emails = emails
         super().__init__(**kwargs)
 
     def password_matches(self, password):
-        return hash_password(password) == self.password
+        return check_password(self.password, password)
+
+    def rehash_password(self, password):
+        """Re-hashes an already verified password with the configured cost factor."""
+        self.password = password
+        self.save()
 
     @validates("email")
     def validate_email(self, key, value):
         if not value:
             raise ValidationError("Email is required.")
-        user = User.query.filter_by(email=value).first()
-        if user and user.email_confirmed:
+        emails = getattr(self, '_emails', None)
+        if emails is not None:
+            in_use = value in emails
+        else:
+            user = User.query.filter_by(email=value).first()
+            in_use = user is not None and user.email_confirmed
+        if in_use:
             raise ValidationError("Email already in use.")
 
+        import email_validator
         email_validator.validate_email(value)
 
         return value
@@ -48,7 +61,9 @@ class User(db.Model, TimestampMixin, SerializerMixin, CRUDMixin, BaseModel):
             raise ValidationError(
                 "Invalid username. Must be between 3 and 16 characters, and can only contain letters, numbers, and underscores."
             )
-        if User.query.filter_by(username=value).first():
+        usernames = getattr(self, '_usernames', None)
+        in_use = value in usernames if usernames is not None else User.query.filter_by(username=value).first()
+        if in_use:
             raise ValidationError("Username already in use.")
         return value
 
@@ -63,7 +78,7 @@ class User(db.Model, TimestampMixin, SerializerMixin, CRUDMixin, BaseModel):
     @validates("is_admin")
     def validate_is_admin(self, key, value):
         if not value or not isinstance(value, bool):
-            return False
+            value = False
         return value
 
     def dump(self):
@@ -1,4 +1,42 @@
-from flask import Blueprint
+from flask import Blueprint, jsonify, request
+
+from app import token_blocklist, request_metrics, replica_router
+from app.utils.bulk_import import BulkImport
+from app.utils.validators import admin_required
 
 API_PREFIX: str = '/v1/admin'
 bp = Blueprint('admin_routes', __name__, url_prefix=API_PREFIX)
+
+
+@bp.route('/blocklist/stats', methods=['GET'])
+@admin_required
+def get_blocklist_stats():
+    return jsonify(token_blocklist.stats()), 200
+
+
+@bp.route('/replicas', methods=['GET'])
+@admin_required
+def get_replicas():
+    return jsonify(replica_router.stats()), 200
+
+
+@bp.route('/metrics', methods=['GET'])
+@admin_required
+def get_metrics():
+    prometheus = request.args.get('format') == 'prometheus' or \
+        request.accept_mimetypes.best_match(['application/json', 'text/plain']) == 'text/plain'
+    if prometheus:
+        return request_metrics.prometheus(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+    return jsonify(request_metrics.summary()), 200
+
+
+@bp.route('/import', methods=['POST'])
+@admin_required
+def bulk_import():
+    data = request.get_json()
+    if not data:
+        return jsonify({"error": "No data provided"}), 400
+
+    dry_run = request.args.get('dry_run', 'false').lower() in ('true', '1')
+    report = BulkImport().run(data, dry_run=dry_run)
+    return jsonify(report), 200
@@ -0,0 +1,12 @@
+from flask import Blueprint
+
+from app import portfolio_snapshot
+from app.utils.cache import response_for
+
+API_PREFIX: str = '/v1/portfolio'
+bp = Blueprint('portfolio_routes', __name__, url_prefix=API_PREFIX)
+
+
+@bp.route('/', methods=['GET'])
+def get_portfolio():
+    return response_for(portfolio_snapshot.get())
@@ -1,9 +1,15 @@
+from datetime import datetime
+
 from flask import Blueprint, jsonify, request
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
-from app import db
+from app import db, response_cache, search_index
 from app.exception.validation_error import ValidationError
-from app.models.project import Project, Tag
-from app.utils.utils import is_present
+from app.models.project import Project, Tag, PROJECT_TYPES, PROJECT_STATUSES, projects_tags
+from app.utils.cache import cached_response
+from app.utils.pagination import PageRequest
+from app.utils.utils import is_present, is_valid_date
 from app.utils.validators import admin_required
 
 API_PREFIX: str = '/v1/projects'
@@ -35,32 +41,117 @@ def update_project(project, data):
 
     db.session.add(project)
 
+    tags = []
     if is_present(data, 'tags'):
         project.clear_tags()
-        tags_data = data.pop('tags', [])
-        for tag_name in tags_data:
-            tag = Tag.get_or_create(name=tag_name, is_tech=False)
-            project.add_tag(tag)
-
+        tags += [(tag_name, False) for tag_name in data.pop('tags', [])]
     if is_present(data, 'tech'):
-        tech_data = data.pop('tech', [])
-        for tag_name in tech_data:
-            tag = Tag.get_or_create(name=tag_name, is_tech=True)
-            project.add_tag(tag)
+        tags += [(tag_name, True) for tag_name in data.pop('tech', [])]
+
+    # Resolve all tags at once, in the same transaction as the project
+    for tag in Tag.get_or_create_many(tags):
+        project.add_tag(tag)
 
     # Persist the updated project in the database
     project.save()
+    response_cache.bump()
+
+
+def parse_date_arg(args, key):
+    value = args.get(key)
+    if not value:
+        return None
+    if not is_valid_date(value):
+        raise ValidationError(f"Invalid {key}. Must be in the format YYYY-MM-DD.")
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def filter_projects(query, args):
+    """
+    Applies the `status`, `type`, `featured`, `tag` and `begin_date_from`/`begin_date_to` filters.
+    `status`, `type` and `tag` may be repeated to match any of the given values.
+    """
+    statuses = args.getlist('status')
+    if statuses:
+        if any(status not in PROJECT_STATUSES for status in statuses):
+            raise ValidationError(f"Invalid status. Must be one of {', '.join(PROJECT_STATUSES)}.")
+        query = query.filter(Project.status.in_(statuses))
+
+    types = args.getlist('type')
+    if types:
+        if any(project_type not in PROJECT_TYPES for project_type in types):
+            raise ValidationError(f"Invalid type. Must be one of {', '.join(PROJECT_TYPES)}.")
+        query = query.filter(Project.type.in_(types))
+
+    featured = args.get('featured')
+    if featured:
+        if featured.lower() not in ('true', 'false', '1', '0'):
+            raise ValidationError("Invalid featured. Must be 'true' or 'false'.")
+        query = query.filter(Project.featured == (featured.lower() in ('true', '1')))
+
+    begin_date_from = parse_date_arg(args, 'begin_date_from')
+    if begin_date_from:
+        query = query.filter(Project.begin_date >= begin_date_from)
+    begin_date_to = parse_date_arg(args, 'begin_date_to')
+    if begin_date_to:
+        query = query.filter(Project.begin_date <= begin_date_to)
+
+    tag_names = args.getlist('tag')
+    if tag_names:
+        # Resolved through the (tag_id, project_id) index rather than by scanning projects
+        tagged = (
+            select(projects_tags.c.project_id)
+            .join(Tag, Tag.id == projects_tags.c.tag_id)
+            .where(Tag.name.in_(tag_names))
+        )
+        query = query.filter(Project.id.in_(tagged))
+
+    return query
 
 
 @bp.route('/', methods=['GET'])
+@cached_response
 def get_projects():
-    projects = Project.query.all()
-    return jsonify([project.dump() for project in projects]), 200
+    try:
+        page = PageRequest(
+            {"id": Project.id, "begin_date": Project.begin_date, "updated_at": Project.updated_at},
+            Project.id
+        )
+        # Load every project's tags in one extra query instead of one per project
+        query = filter_projects(Project.query.options(selectinload(Project.tags)), request.args)
+    except ValidationError as e:
+        return jsonify({
+            "message": e.message,
+            "error": "Validation error"
+        }), 400
+
+    projects, next_cursor = page.page(page.apply(query).all())
+    return jsonify(page.response([project.dump() for project in projects], next_cursor)), 200
+
+
+@bp.route('/search', methods=['GET'])
+def search_projects():
+    query = request.args.get('q', '')
+    try:
+        limit = int(request.args.get('limit', 20))
+    except ValueError:
+        limit = 0
+    if limit < 1 or limit > 100:
+        return jsonify({
+            "message": "Invalid limit. Must be between 1 and 100.",
+            "error": "Bad request"
+        }), 400
+
+    results = search_index.search(query, limit=limit)
+    return jsonify([{**project, "score": round(score, 4)} for score, project in results]), 200
 
 
 @bp.route('/<int:project_id>', methods=['GET'])
+@cached_response
 def get_project(project_id):
-    project = Project.query.get_or_404(project_id, description="Project not found")
+    project = Project.query.options(selectinload(Project.tags)).get_or_404(
+        project_id, description="Project not found"
+    )
     return jsonify(project.dump()), 200
 
 
@@ -82,18 +173,16 @@ def create_project():
         # Project must be in session before any tags are added
         db.session.add(project)
 
-        # Attach tag objects to the project
-        for tag_name in tags_data:
-            tag = Tag.get_or_create(name=tag_name, is_tech=False)
-            project.add_tag(tag)
-
-        # Attach tech tags objects to the project
-        for tag_name in tech_tags_data:
-            tag = Tag.get_or_create(name=tag_name, is_tech=True)
+        # Attach tag and tech tag objects to the project, resolving them all at once
+        tags = Tag.get_or_create_many(
+            [(tag_name, False) for tag_name in tags_data] + [(tag_name, True) for tag_name in tech_tags_data]
+        )
+        for tag in tags:
             project.add_tag(tag)
 
         # Persist the new project in the database
         project.save()
+        response_cache.bump()
 
         # Serialize the created project for the response
         return jsonify(project.dump()), 201
@@ -169,6 +258,7 @@ def update_project_by_slug(project_slug):
 def delete_project_by_id(project_id):
     project = Project.query.get_or_404(project_id, description="Project not found")
     project.delete()
+    response_cache.bump()
     return jsonify({"message": "Project deleted successfully"}), 204
 
 
@@ -177,4 +267,5 @@ def delete_project_by_id(project_id):
 def delete_project_by_slug(slug):
     project = Project.query.filter_by(slug=slug).first_or_404(description="Project not found")
     project.delete()
+    response_cache.bump()
     return jsonify({"message": "Project deleted successfully"}), 204
@@ -1,8 +1,10 @@
 from flask import Blueprint, jsonify, request
 
-from app import db
+from app import db, response_cache
 from app.exception.validation_error import ValidationError
 from app.models.social_link import SocialLink
+from app.utils.cache import cached_response
+from app.utils.pagination import PageRequest
 from app.utils.utils import is_present
 from app.utils.validators import admin_required
 
@@ -11,12 +13,22 @@ bp = Blueprint('social_link_routes', __name__, url_prefix=API_PREFIX)
 
 
 @bp.route('/', methods=['GET'])
+@cached_response
 def get_social_links():
-    social_links = SocialLink.query.all()
-    return jsonify([sl.dump() for sl in social_links]), 200
+    try:
+        page = PageRequest({"id": SocialLink.id}, SocialLink.id)
+    except ValidationError as e:
+        return jsonify({
+            "message": e.message,
+            "error": "Validation error"
+        }), 400
+
+    social_links, next_cursor = page.page(page.apply(SocialLink.query).all())
+    return jsonify(page.response([sl.dump() for sl in social_links], next_cursor)), 200
 
 
 @bp.route('/<int:social_link_id>', methods=['GET'])
+@cached_response
 def get_social_link(social_link_id):
     social_link = SocialLink.query.get_or_404(social_link_id)
     return jsonify(social_link.dump()), 200
@@ -34,6 +46,7 @@ def create_social_link():
 
         # Persist in the database
         new_sl.save()
+        response_cache.bump()
 
         # Serialize for the response
         return jsonify(new_sl.dump()), 201
@@ -71,6 +84,7 @@ def update_social_link_by_id(social_link_id):
 
         # Persist in the database
         social_link.save()
+        response_cache.bump()
 
         # Serialize for the response
         return jsonify(social_link.dump()), 200
@@ -92,4 +106,5 @@ def update_social_link_by_id(social_link_id):
 def delete_social_link_by_id(social_link_id):
     social_link = SocialLink.query.get_or_404(social_link_id)
     social_link.delete()
+    response_cache.bump()
     return jsonify({"message": "Project deleted successfully"}), 204
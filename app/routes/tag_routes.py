@@ -1,12 +1,68 @@
-from flask import Blueprint, jsonify
+from collections import defaultdict
 
-from app.models import Tag
+from flask import Blueprint, jsonify, request
+from sqlalchemy.orm import selectinload
+
+from app import db
+from app.exception.validation_error import ValidationError
+from app.models import Tag, Project
+from app.models.project import projects_tags
+from app.utils.cache import cached_response
+from app.utils.pagination import PageRequest
 
 API_PREFIX: str = '/v1/tags'
 bp = Blueprint('tag_routes', __name__, url_prefix=API_PREFIX)
 
+INCLUDE_OPTIONS = ("count", "project_ids", "project_slugs", "projects")
+
 
 @bp.route('/', methods=['GET'])
+@cached_response
 def get_all_tags():
-    tags = Tag.query.all()
-    return jsonify([tag.dump() for tag in tags]), 200
+    include = request.args.get('include', 'count')
+    if include not in INCLUDE_OPTIONS:
+        return jsonify({
+            "message": f"Invalid include. Must be one of {', '.join(INCLUDE_OPTIONS)}.",
+            "error": "Bad request"
+        }), 400
+
+    try:
+        page = PageRequest({"id": Tag.id}, Tag.id)
+    except ValidationError as e:
+        return jsonify({
+            "message": e.message,
+            "error": "Validation error"
+        }), 400
+
+    if include == 'projects':
+        # Full nested form, with every tag's projects loaded in one extra query
+        tags, next_cursor = page.page(page.apply(Tag.query.options(selectinload(Tag.projects))).all())
+        return jsonify(page.response([tag.dump() for tag in tags], next_cursor)), 200
+
+    # Tags and their project counts in a single GROUP BY over the association table
+    rows, next_cursor = page.page(
+        page.apply(Tag.with_project_counts()).all(),
+        key=lambda row: row[0]
+    )
+    if include == 'count':
+        return jsonify(page.response([
+            {**tag.to_dict(partial=True), "project_count": count}
+            for tag, count in rows
+        ], next_cursor)), 200
+
+    # Project ids/slugs for every tag on the page, fetched in one pass over the association table
+    references = defaultdict(list)
+    links = (
+        db.session.query(projects_tags.c.tag_id, Project.id, Project.slug)
+        .join(Project, Project.id == projects_tags.c.project_id)
+        .filter(projects_tags.c.tag_id.in_([tag.id for tag, _ in rows]))
+        .order_by(projects_tags.c.tag_id, Project.id)
+        .all()
+    )
+    for tag_id, project_id, project_slug in links:
+        references[tag_id].append(project_id if include == 'project_ids' else project_slug)
+
+    return jsonify(page.response([
+        {**tag.to_dict(partial=True), "project_count": count, include: references[tag.id]}
+        for tag, count in rows
+    ], next_cursor)), 200
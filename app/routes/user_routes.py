@@ -1,12 +1,13 @@
-from email_validator import EmailNotValidError
 from flask import Blueprint, jsonify, request, abort, make_response
-from flask_bcrypt import check_password_hash
 from flask_jwt_extended import create_access_token, set_access_cookies, unset_jwt_cookies, create_refresh_token, \
     set_refresh_cookies, get_jwt_identity, jwt_required, get_jwt, get_csrf_token
 
+from app import token_blocklist, password_hasher
+from app.exception.service_busy_error import ServiceBusyError
 from app.exception.validation_error import ValidationError
 from app.models import RevokedToken
 from app.models.user import User, db
+from app.utils.pagination import PageRequest
 from app.utils.validators import validate_user_id, admin_required
 
 API_PREFIX: str = '/v1/users'
@@ -16,12 +17,23 @@ bp = Blueprint('user_routes', __name__, url_prefix=API_PREFIX)
 @bp.route('/', methods=['GET'])
 @admin_required
 def get_users():
-    users = User.query.all()
-    return jsonify([user.dump() for user in users] if users else [])
+    try:
+        page = PageRequest({"id": User.id}, User.id)
+    except ValidationError as e:
+        return jsonify({
+            "message": e.message,
+            "error": "Validation error"
+        }), 400
+
+    users, next_cursor = page.page(page.apply(User.query).all())
+    return jsonify(page.response([user.dump() for user in users], next_cursor))
 
 
 @bp.route('/', methods=['POST'])
 def create_user():
+    # email_validator is slow to import and only needed here, so it is loaded on first registration
+    from email_validator import EmailNotValidError
+
     data = request.get_json()
     if not data:
         return jsonify({
@@ -48,6 +60,14 @@ def create_user():
             "error": "Validation error"
         }), 400
 
+    except ServiceBusyError as e:
+        response = make_response(jsonify({
+            "message": e.message,
+            "error": "Service unavailable"
+        }), 503)
+        response.headers["Retry-After"] = "1"
+        return response
+
     except EmailNotValidError as e:  # Handle email specific validation errors
         print("Email not valid: ", e)
         return jsonify({
@@ -91,9 +111,19 @@ def login_user():
             }), 404
 
         # Validate password
-        if check_password_hash(user.password, password):
+        if user.password_matches(password):
+            # Upgrade hashes made with a different cost factor while the plain password is at hand
+            if password_hasher.needs_rehash(user.password):
+                try:
+                    user.rehash_password(password)
+                except (ValidationError, ServiceBusyError) as e:
+                    print(e)  # Keep the old hash; login must not fail because of the upgrade
+
             # Create access token
-            access_token = create_access_token(identity=str(user.id))
+            access_token = create_access_token(
+                identity=str(user.id),
+                additional_claims={"is_admin": bool(user.is_admin)}
+            )
             refresh_token = create_refresh_token(identity=str(user.id))
 
             csrf_access_token = get_csrf_token(access_token)
@@ -122,6 +152,13 @@ def login_user():
             "message": e.message,
             "error": "Validation error"
         }), 400
+    except ServiceBusyError as e:
+        response = make_response(jsonify({
+            "message": e.message,
+            "error": "Service unavailable"
+        }), 503)
+        response.headers["Retry-After"] = "1"
+        return response
     except Exception as e:
         print(e)
         return jsonify({
@@ -137,7 +174,7 @@ def refresh_tokens():
     user = User.query.get_or_404(identity)
 
     # Create new access & refresh tokens
-    access_token = create_access_token(identity=identity)
+    access_token = create_access_token(identity=identity, additional_claims={"is_admin": bool(user.is_admin)})
     refresh_token = create_refresh_token(identity=identity)
 
     csrf_access_token = get_csrf_token(access_token)
@@ -176,6 +213,7 @@ def logout_user():
     try:
         revoked_token = RevokedToken(jti=jti, user_id=user_id)
         revoked_token.save()
+        token_blocklist.add(jti)
 
         response = make_response(jsonify({"message": "Logout successful"}), 200)
         unset_jwt_cookies(response)
@@ -1,3 +1,3 @@
-from app.utils.utils import hash_password
+from app.utils.utils import hash_password, check_password
 
-__all__ = ['hash_password']
\ No newline at end of file
+__all__ = ['hash_password', 'check_password']
\ No newline at end of file
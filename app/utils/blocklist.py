@@ -0,0 +1,209 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+
+class BloomFilter:
+    """A fixed-size Bloom filter over strings, using double hashing on a single blake2b digest."""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(int(capacity), 1)
+        self.error_rate = error_rate
+        self.size = max(int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size / self.capacity * math.log(2))), 1)
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    @property
+    def byte_size(self):
+        return len(self._bits)
+
+    @property
+    def estimated_error_rate(self):
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+
+class _BlocklistState:
+    def __init__(self, capacity, error_rate, exact_size, sync_interval, sync_window):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.exact_size = exact_size
+        self.sync_interval = sync_interval
+        self.sync_window = sync_window
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.exact = OrderedDict()
+        self.last_id = 0
+        self.last_sync = None
+        self.lock = threading.Lock()
+        self.checks = 0
+        self.filter_negatives = 0
+        self.exact_hits = 0
+        self.db_lookups = 0
+        self.false_positives = 0
+
+
+class TokenBlocklist:
+    """
+    Per-worker view of the revoked token table.
+
+    Every revoked JTI is added to a Bloom filter, and the most recent ones are also kept in a
+    bounded exact set. A token the filter has never seen is accepted without a query. The
+    database is only consulted when the filter reports a possible hit that the exact set
+    cannot confirm.
+
+    Each worker loads the table on first use and then pulls newly revoked rows at most every
+    `REVOKED_TOKEN_SYNC_INTERVAL` seconds, so a revocation made through another worker is
+    seen within that delay. Revocations made through this worker are seen immediately.
+    Ids are assigned before commit, so a row can become visible after rows with higher ids;
+    each sync therefore re-reads the last `REVOKED_TOKEN_SYNC_WINDOW` ids as well.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('REVOKED_TOKEN_FILTER_CAPACITY', 100_000)
+        app.config.setdefault('REVOKED_TOKEN_FILTER_ERROR_RATE', 0.001)
+        app.config.setdefault('REVOKED_TOKEN_EXACT_SIZE', 10_000)
+        app.config.setdefault('REVOKED_TOKEN_SYNC_INTERVAL', 5)
+        app.config.setdefault('REVOKED_TOKEN_SYNC_WINDOW', 1000)
+        app.extensions['token_blocklist'] = _BlocklistState(
+            app.config['REVOKED_TOKEN_FILTER_CAPACITY'],
+            app.config['REVOKED_TOKEN_FILTER_ERROR_RATE'],
+            app.config['REVOKED_TOKEN_EXACT_SIZE'],
+            app.config['REVOKED_TOKEN_SYNC_INTERVAL'],
+            app.config['REVOKED_TOKEN_SYNC_WINDOW'],
+        )
+
+    @staticmethod
+    def _state():
+        return current_app.extensions['token_blocklist']
+
+    @staticmethod
+    def _remember(state, jti):
+        state.bloom.add(jti)
+        state.exact[jti] = None
+        state.exact.move_to_end(jti)
+        while len(state.exact) > state.exact_size:
+            state.exact.popitem(last=False)
+
+    def add(self, jti):
+        """Records a token revoked by this worker."""
+        state = self._state()
+        with state.lock:
+            self._remember(state, jti)
+
+    def sync(self, force=False):
+        """Pulls tokens revoked since the last sync, rebuilding the filter when it outgrows its capacity."""
+        from app.models.revoked_token import RevokedToken
+
+        state = self._state()
+        if not force and state.last_sync is not None and time.monotonic() - state.last_sync < state.sync_interval:
+            return
+
+        rows = (
+            RevokedToken.query
+            .with_entities(RevokedToken.id, RevokedToken.jti)
+            .filter(RevokedToken.id > state.last_id - state.sync_window)
+            .order_by(RevokedToken.id)
+            .all()
+        )
+        with state.lock:
+            # Skips rows merged before, by an earlier sync or another thread. A false positive
+            # skipped here is still safe: the filter reports it, so is_revoked asks the database.
+            fresh = [jti for _, jti in rows if jti not in state.bloom]
+            if state.bloom.count + len(fresh) <= state.capacity:
+                for jti in fresh:
+                    self._remember(state, jti)
+                if rows:
+                    state.last_id = max(state.last_id, rows[-1][0])
+                state.last_sync = time.monotonic()
+                return
+        self._rebuild(state)
+
+    def _rebuild(self, state):
+        """Reloads the whole table into a filter with room for twice as many tokens."""
+        from app.models.revoked_token import RevokedToken
+
+        rows = RevokedToken.query.with_entities(RevokedToken.id, RevokedToken.jti).order_by(RevokedToken.id).all()
+        capacity = state.capacity
+        while capacity < len(rows) * 2:
+            capacity *= 2
+        bloom = BloomFilter(capacity, state.error_rate)
+        for _, jti in rows:
+            bloom.add(jti)
+        with state.lock:
+            # Revocations this worker recorded while the table was being read
+            recent = [jti for jti in state.exact if jti not in bloom]
+            state.capacity, state.bloom = capacity, bloom
+            state.exact = OrderedDict((jti, None) for _, jti in rows[-state.exact_size:])
+            for jti in recent:
+                self._remember(state, jti)
+            state.last_id = rows[-1][0] if rows else 0
+            state.last_sync = time.monotonic()
+
+    def is_revoked(self, jti):
+        from app.models.revoked_token import RevokedToken
+
+        state = self._state()
+        self.sync()
+        with state.lock:
+            state.checks += 1
+            if jti in state.exact:
+                state.exact_hits += 1
+                return True
+            if jti not in state.bloom:
+                state.filter_negatives += 1
+                return False
+            state.db_lookups += 1
+
+        revoked = RevokedToken.query.filter_by(jti=jti).first() is not None
+        with state.lock:
+            if revoked:
+                self._remember(state, jti)
+            else:
+                state.false_positives += 1
+        return revoked
+
+    def stats(self):
+        state = self._state()
+        with state.lock:
+            return {
+                "filter_bits": state.bloom.size,
+                "filter_bytes": state.bloom.byte_size,
+                "filter_hash_count": state.bloom.hash_count,
+                "filter_capacity": state.capacity,
+                "filter_items": state.bloom.count,
+                "estimated_false_positive_rate": state.bloom.estimated_error_rate,
+                "observed_false_positive_rate": (
+                    state.false_positives / state.db_lookups if state.db_lookups else 0.0
+                ),
+                "exact_set_size": len(state.exact),
+                "checks": state.checks,
+                "filter_negatives": state.filter_negatives,
+                "exact_hits": state.exact_hits,
+                "db_lookups": state.db_lookups,
+                "false_positives": state.false_positives,
+                "seconds_since_sync": (
+                    time.monotonic() - state.last_sync if state.last_sync is not None else None
+                ),
+            }
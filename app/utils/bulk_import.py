@@ -0,0 +1,186 @@
+import time
+from flask import current_app
+from sqlalchemy import insert, or_
+
+from app import db, response_cache, search_index
+from app.exception.validation_error import ValidationError
+from app.models import Project, Tag, SocialLink, User
+from app.models.project import projects_tags, SlugAllocator
+
+# Columns filled in by the database or by column defaults
+GENERATED_COLUMNS = ("id", "created_at", "updated_at")
+
+
+def _row_values(instance):
+    """Extracts the validated column values of a transient model instance for a bulk insert."""
+    values = {}
+    for column in instance.__table__.columns:
+        if column.key in GENERATED_COLUMNS:
+            continue
+        value = getattr(instance, column.key)
+        # Scalar defaults are only applied on flush, which a transient instance never goes through
+        if value is None and column.default is not None and column.default.is_scalar:
+            value = column.default.arg
+        values[column.key] = value
+    return values
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class BulkImport:
+    """
+    Imports projects, social links and users in bulk.
+
+    The whole payload is validated first, without writing anything. Project slugs are
+    allocated against one preloaded set of existing slugs, usernames and emails are checked
+    against the ones in use, loaded with one query, and tags are resolved in one batch per chunk. Valid rows are then written with multi-row inserts, and each chunk is committed
+    as its own transaction. Rows that fail validation, or that belong to a chunk that fails to
+    commit, are listed in the error report. Everything else is imported.
+    """
+
+    SECTIONS = ("projects", "social_links", "users")
+
+    def __init__(self, chunk_size=None):
+        self.chunk_size = chunk_size or current_app.config['BULK_IMPORT_CHUNK_SIZE']
+        self.errors = []
+        self.imported = {section: 0 for section in self.SECTIONS}
+
+    def _error(self, section, index, message):
+        self.errors.append({"section": section, "index": index, "error": message})
+
+    def _validate(self, section, rows, build):
+        valid = []
+        if rows is None:
+            return valid
+        if not isinstance(rows, list):
+            self._error(section, None, f"'{section}' must be a list.")
+            return valid
+        for index, row in enumerate(rows):
+            if not isinstance(row, dict):
+                self._error(section, index, "Row must be an object.")
+                continue
+            try:
+                valid.append((index, *build(dict(row))))
+            except (ValidationError, ValueError) as e:  # EmailNotValidError is a ValueError
+                self._error(section, index, getattr(e, "message", str(e)))
+            except TypeError as e:
+                self._error(section, index, f"Invalid row. ({e})")
+        return valid
+
+    def validate(self, data):
+        slugs = SlugAllocator(slug for (slug,) in db.session.query(Project.slug))
+
+        def build_project(row):
+            tags = []
+            for field, is_tech in (('tags', False), ('tech', True)):
+                names = row.pop(field, None) or []
+                if not isinstance(names, list):
+                    raise ValidationError(f"'{field}' must be a list of tag names.")
+                tags += [(name, is_tech) for name in names]
+            for name, _ in tags:
+                if not isinstance(name, str) or not name or len(name) > 16:
+                    raise ValidationError(f"Invalid tag name. Must be between 1 and 16 characters. ({name})")
+            return _row_values(Project(slugs=slugs, **row)), tags
+
+        def build_social_link(row):
+            return _row_values(SocialLink(**row)), None
+
+        usernames, emails = self._users_in_use(data.get("users"))
+
+        def build_user(row):
+            row['is_admin'] = bool(row.get('is_admin', False))
+            values = _row_values(User(usernames=usernames, emails=emails, **row))
+            # Also rejects a username repeated later in the payload
+            usernames.add(values['username'])
+            return values, None
+
+        return {
+            "projects": self._validate("projects", data.get("projects"), build_project),
+            "social_links": self._validate("social_links", data.get("social_links"), build_social_link),
+            "users": self._validate("users", data.get("users"), build_user),
+        }
+
+    @staticmethod
+    def _users_in_use(rows):
+        """The taken usernames and confirmed emails among those of the payload's user rows."""
+        if not isinstance(rows, list):
+            return set(), set()
+        rows = [row for row in rows if isinstance(row, dict)]
+        names = {row['username'] for row in rows if isinstance(row.get('username'), str)}
+        addresses = {row['email'] for row in rows if isinstance(row.get('email'), str)}
+        if not names and not addresses:
+            return set(), set()
+        usernames, emails = set(), set()
+        for username, email, email_confirmed in db.session.query(User.username, User.email, User.email_confirmed) \
+                .filter(or_(User.username.in_(names), User.email.in_(addresses))):
+            usernames.add(username)
+            if email_confirmed:
+                emails.add(email)
+        return usernames, emails
+
+    def _write_projects(self, chunk):
+        db.session.execute(insert(Project), [values for _, values, _ in chunk])
+
+        slugs = [values["slug"] for _, values, _ in chunk]
+        ids = dict(db.session.query(Project.slug, Project.id).filter(Project.slug.in_(slugs)))
+        tags = {tag.name: tag.id for tag in Tag.get_or_create_many(
+            [tag for _, _, project_tags in chunk for tag in project_tags]
+        )}
+        folded = {name.lower(): tag_id for name, tag_id in tags.items()}
+        links = {
+            (ids[values["slug"]], tags.get(name) or folded[name.lower()])
+            for _, values, project_tags in chunk
+            for name, _ in project_tags
+        }
+        if links:
+            db.session.execute(projects_tags.insert(), [
+                {"project_id": project_id, "tag_id": tag_id} for project_id, tag_id in links
+            ])
+
+    def _write(self, section, model, rows):
+        for chunk in _chunks(rows, self.chunk_size):
+            try:
+                if section == "projects":
+                    self._write_projects(chunk)
+                else:
+                    db.session.execute(insert(model), [values for _, values, _ in chunk])
+                db.session.commit()
+                self.imported[section] += len(chunk)
+            except Exception as e:
+                db.session.rollback()
+                for index, _, _ in chunk:
+                    self._error(section, index, f"Chunk failed to import. ({e.__class__.__name__})")
+
+    def run(self, data, dry_run=False):
+        """Validates and imports the payload, returning a report with per-row errors and timings."""
+        started = time.perf_counter()
+        valid = {}
+        if isinstance(data, dict):
+            valid = self.validate(data)
+        else:
+            self._error(None, None, "Payload must be an object.")
+        validated = time.perf_counter()
+
+        if not dry_run:
+            self._write("projects", Project, valid.get("projects", []))
+            self._write("social_links", SocialLink, valid.get("social_links", []))
+            self._write("users", User, valid.get("users", []))
+            if any(self.imported.values()):
+                response_cache.bump()
+                # Rows were written with Core inserts, which the search index doesn't see
+                search_index.invalidate()
+
+        elapsed = time.perf_counter() - started
+        imported = sum(self.imported.values())
+        return {
+            "dry_run": dry_run,
+            "valid": {section: len(rows) for section, rows in valid.items()},
+            "imported": self.imported,
+            "errors": self.errors,
+            "validation_seconds": round(validated - started, 3),
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(imported / elapsed, 1) if imported else 0.0,
+        }
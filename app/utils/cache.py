@@ -0,0 +1,193 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request
+
+from app.utils.compression import compress, is_compressible, negotiate
+from app.utils.replicas import reads_own_writes, reads_replica
+
+
+class CacheEntry:
+    """A cached response body, tagged with the content version it was rendered for."""
+    __slots__ = ('body', 'mimetype', 'etag', 'version', 'created_at', 'encoded')
+
+    def __init__(self, body, mimetype, version):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.version = version
+        self.created_at = time.monotonic()
+        # Compressed variants of the body by content encoding, filled on first use
+        self.encoded = {}
+
+    def body_for(self, encoding):
+        if encoding is None:
+            return self.body
+        body = self.encoded.get(encoding)
+        if body is None:
+            body = self.encoded.setdefault(encoding, compress(self.body, encoding))
+        return body
+
+
+class _CacheState:
+    def __init__(self, max_entries, ttl, replica_lag):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.replica_lag = replica_lag
+        self.version = 0
+        self.bumped_at = float('-inf')
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+
+class ResponseCache:
+    """
+    In-process cache for public GET responses.
+
+    Entries are keyed by route and query string and tagged with a content version.
+    Write paths call `bump()` to invalidate everything rendered for an older version.
+    Entries also expire after `RESPONSE_CACHE_TTL` seconds, which bounds how long
+    other workers can serve data that was changed through a different process.
+
+    With read replicas, a body read from a replica within `REPLICA_STICKY_SECONDS` of a
+    bump may predate the write, so it is served but not stored. Clients kept on the
+    primary after a write bypass the cache altogether.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RESPONSE_CACHE_ENABLED', True)
+        app.config.setdefault('RESPONSE_CACHE_TTL', 30)
+        app.config.setdefault('RESPONSE_CACHE_MAX_ENTRIES', 512)
+        app.extensions['response_cache'] = _CacheState(
+            app.config['RESPONSE_CACHE_MAX_ENTRIES'],
+            app.config['RESPONSE_CACHE_TTL'],
+            app.config.get('REPLICA_STICKY_SECONDS', 5),
+        )
+
+    @staticmethod
+    def _state():
+        return current_app.extensions['response_cache']
+
+    @property
+    def version(self):
+        return self._state().version
+
+    def bump(self):
+        """Marks all cached content as stale. Call after committing a write to public data."""
+        state = self._state()
+        with state.lock:
+            state.version += 1
+            state.bumped_at = time.monotonic()
+            state.entries.clear()
+
+    def get(self, key):
+        state = self._state()
+        with state.lock:
+            entry = state.entries.get(key)
+            if entry is None:
+                return None
+            if entry.version != state.version or time.monotonic() - entry.created_at > state.ttl:
+                del state.entries[key]
+                return None
+            state.entries.move_to_end(key)
+            return entry
+
+    def set(self, key, body, mimetype, version, from_replica=False):
+        state = self._state()
+        entry = CacheEntry(body, mimetype, version)
+        with state.lock:
+            # Don't store a response that was rendered while a write bumped the version,
+            # or one read from a replica that may not have caught up with the last write yet
+            if version == state.version and not (
+                    from_replica and time.monotonic() - state.bumped_at < state.replica_lag):
+                state.entries[key] = entry
+                state.entries.move_to_end(key)
+                while len(state.entries) > state.max_entries:
+                    state.entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        state = self._state()
+        with state.lock:
+            state.entries.clear()
+
+
+def _cache_key():
+    return request.full_path
+
+
+def _uses_cache():
+    return current_app.config['RESPONSE_CACHE_ENABLED'] and not reads_own_writes()
+
+
+def response_for(entry):
+    """A 200 or 304 response for `entry`, in the encoding negotiated for the current request."""
+    encoding = negotiate(entry.mimetype, len(entry.body))
+    etag = f"{entry.etag}-{encoding}" if encoding else entry.etag
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.response_class(entry.body_for(encoding), status=200, mimetype=entry.mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    if is_compressible(entry.mimetype, len(entry.body)):
+        response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = 'public, no-cache'
+    return response
+
+
+def cached_response(fn):
+    """
+    Caches successful responses of a public GET view.
+
+    Responses carry a strong ETag, and a matching `If-None-Match` on a cached route
+    is answered with 304 without calling the view.
+    """
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        from app import response_cache
+        if not _uses_cache():
+            return fn(*args, **kwargs)
+
+        key = _cache_key()
+        entry = response_cache.get(key)
+        if entry is None:
+            version = response_cache.version
+            response = current_app.make_response(fn(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            entry = response_cache.set(key, response.get_data(), response.mimetype, version, reads_replica())
+        return response_for(entry)
+
+    return wrapper
+
+
+def async_cached_response(fn):
+    """`cached_response` for coroutine views. Entries are shared with the synchronous views of the same path."""
+
+    @wraps(fn)
+    async def wrapper(*args, **kwargs):
+        from app import response_cache
+        if not _uses_cache():
+            return await fn(*args, **kwargs)
+
+        key = _cache_key()
+        entry = response_cache.get(key)
+        if entry is None:
+            version = response_cache.version
+            response = current_app.make_response(await fn(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            entry = response_cache.set(key, response.get_data(), response.mimetype, version, reads_replica())
+        return response_for(entry)
+
+    return wrapper
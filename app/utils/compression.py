@@ -0,0 +1,93 @@
+import gzip
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional, gzip is always available
+    brotli = None
+
+
+class _CompressionState:
+    def __init__(self, min_size, gzip_level, brotli_quality, mimetypes):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.mimetypes = frozenset(mimetypes)
+        # In order of preference when the client accepts several equally
+        self.encodings = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    def compress(self, body, encoding):
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.brotli_quality)
+        # A fixed mtime keeps the output, and so the ETag, the same for the same body
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+
+def is_compressible(mimetype, size):
+    """Whether a body of `mimetype` and `size` bytes is sent compressed to clients that accept it."""
+    state = current_app.extensions.get('response_compressor')
+    return state is not None and size >= state.min_size and mimetype in state.mimetypes
+
+
+def negotiate(mimetype, size):
+    """The encoding for such a body in the current request: 'br', 'gzip', or None to send it as is."""
+    if not is_compressible(mimetype, size):
+        return None
+    return request.accept_encodings.best_match(current_app.extensions['response_compressor'].encodings)
+
+
+def compress(body, encoding):
+    return current_app.extensions['response_compressor'].compress(body, encoding)
+
+
+class ResponseCompressor:
+    """
+    Compresses responses with brotli or gzip, as negotiated through `Accept-Encoding`.
+
+    Bodies below `COMPRESSION_MIN_SIZE` bytes are sent as they are, as the encoding overhead
+    outweighs the saving. Cached responses are not compressed here: the response cache keeps
+    each encoding of an entry next to its raw body, so it is compressed once per content version.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESSION_ENABLED', True)
+        app.config.setdefault('COMPRESSION_MIN_SIZE', 500)
+        app.config.setdefault('COMPRESSION_GZIP_LEVEL', 6)
+        app.config.setdefault('COMPRESSION_BROTLI_QUALITY', 5)
+        app.config.setdefault('COMPRESSION_MIMETYPES', ['application/json', 'text/html', 'text/plain'])
+        if not app.config['COMPRESSION_ENABLED']:
+            return
+
+        app.extensions['response_compressor'] = _CompressionState(
+            app.config['COMPRESSION_MIN_SIZE'],
+            app.config['COMPRESSION_GZIP_LEVEL'],
+            app.config['COMPRESSION_BROTLI_QUALITY'],
+            app.config['COMPRESSION_MIMETYPES'],
+        )
+        app.after_request(self._compress_response)
+
+    @staticmethod
+    def _compress_response(response):
+        if response.status_code != 200 or response.direct_passthrough or response.is_streamed \
+                or 'Content-Encoding' in response.headers:
+            return response
+
+        body = response.get_data()
+        if not is_compressible(response.mimetype, len(body)):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate(response.mimetype, len(body))
+        if encoding is None:
+            return response
+        response.set_data(compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+        # The compressed representation needs its own strong validator
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(f"{etag}-{encoding}")
+        return response
@@ -0,0 +1,83 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from flask_bcrypt import generate_password_hash, check_password_hash
+
+from app.exception.service_busy_error import ServiceBusyError
+
+try:
+    from gevent import monkey
+    from gevent.threadpool import ThreadPoolExecutor as NativeThreadPoolExecutor
+except ImportError:  # pragma: no cover - gevent is only needed for the gevent worker class
+    monkey = None
+
+
+def _executor(workers):
+    # Under gevent, patched threads are greenlets, and bcrypt on one of them would block every
+    # other request in the worker. gevent's own pool runs on real threads and waits cooperatively.
+    if monkey is not None and monkey.is_module_patched('threading'):
+        return NativeThreadPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hasher")
+
+
+class _HasherState:
+    def __init__(self, rounds, workers, queue_size):
+        self.rounds = rounds
+        self.executor = _executor(workers)
+        # Bounds the work that may be running or waiting in the executor at once
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification on a dedicated, bounded thread pool.
+
+    bcrypt releases the GIL, so hashing on the pool keeps other request threads responsive.
+    At most `PASSWORD_HASH_WORKERS` hashes run at once, and at most `PASSWORD_HASH_QUEUE_SIZE`
+    more may wait. Anything beyond that is rejected immediately with `ServiceBusyError`
+    rather than piling up behind several seconds of CPU work.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('BCRYPT_LOG_ROUNDS', 16)
+        app.config.setdefault('PASSWORD_HASH_WORKERS', 2)
+        app.config.setdefault('PASSWORD_HASH_QUEUE_SIZE', 8)
+        app.extensions['password_hasher'] = _HasherState(
+            app.config['BCRYPT_LOG_ROUNDS'],
+            app.config['PASSWORD_HASH_WORKERS'],
+            app.config['PASSWORD_HASH_QUEUE_SIZE'],
+        )
+
+    @staticmethod
+    def _state():
+        return current_app.extensions['password_hasher']
+
+    def _run(self, fn, *args):
+        state = self._state()
+        if not state.slots.acquire(blocking=False):
+            raise ServiceBusyError("Too many password operations in progress. Try again shortly.")
+        try:
+            future = state.executor.submit(fn, *args)
+        except BaseException:
+            state.slots.release()
+            raise
+        future.add_done_callback(lambda _: state.slots.release())
+        return future.result()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self._state().rounds).decode("utf-8")
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """Returns whether the hash was made with a different cost factor than the configured one."""
+        try:
+            return int(password_hash.split("$")[2]) != self._state().rounds
+        except (AttributeError, IndexError, ValueError):
+            return False
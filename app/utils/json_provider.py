@@ -0,0 +1,52 @@
+from datetime import date, datetime, time
+
+from flask.json.provider import DefaultJSONProvider, _default
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _iso_default(o):
+    if isinstance(o, (date, datetime, time)):
+        return o.isoformat()
+    return _default(o)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that encodes with orjson when it is installed, falling back to the standard
+    library otherwise. Both paths write dates and datetimes as ISO 8601 strings and sort keys,
+    so responses decode to the same data whichever encoder is in use.
+    """
+    default = staticmethod(_iso_default)
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.use_orjson = orjson is not None and app.config.get('JSON_USE_ORJSON', True)
+
+    def _orjson_options(self, pretty=False):
+        options = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if self.use_orjson and not kwargs:
+            return orjson.dumps(obj, default=_iso_default, option=self._orjson_options()).decode()
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if not self.use_orjson:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=_iso_default, option=self._orjson_options(pretty) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
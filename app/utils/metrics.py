@@ -0,0 +1,353 @@
+import atexit
+import bisect
+import contextvars
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+import weakref
+
+from flask import current_app, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.pool import pool_snapshot
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Pool values that describe a worker's current state; only running workers contribute them
+POOL_GAUGES = ('size', 'checked_out', 'overflow')
+
+# Per request rather than per thread, so it also follows asyncio tasks and greenlets
+_current = contextvars.ContextVar('request_metrics', default=None)
+_states = weakref.WeakSet()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None and context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    current = _current.get()
+    if current is not None and context is not None:
+        started = getattr(context, '_metrics_started', None)
+        if started is not None:
+            current[1] += 1
+            current[2] += time.perf_counter() - started
+
+
+def _start_request():
+    _current.set([time.perf_counter(), 0, 0.0])
+
+
+class _Series:
+    __slots__ = ('count', 'seconds', 'buckets', 'sql_count', 'sql_seconds', 'response_bytes')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.response_bytes = 0
+
+    def merge(self, data):
+        self.count += data['count']
+        self.seconds += data['seconds']
+        self.buckets = [a + b for a, b in zip(self.buckets, data['buckets'])]
+        self.sql_count += data['sql_count']
+        self.sql_seconds += data['sql_seconds']
+        self.response_bytes += data['response_bytes']
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _MetricsState:
+    def __init__(self, directory, flush_interval):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.series = {}
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.path = self._worker_path()
+        self.last_flush = time.monotonic()
+        _states.add(self)
+
+    def _worker_path(self):
+        if not self.directory:
+            return None
+        return os.path.join(self.directory, f"metrics-{self.pid}-{uuid.uuid4().hex[:8]}.json")
+
+    def reset_after_fork(self):
+        """Starts a fresh series set in a forked worker, so it never reports its parent's counts."""
+        self.series = {}
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.path = self._worker_path()
+
+
+def _after_fork():
+    for state in list(_states):
+        state.reset_after_fork()
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+class RequestMetrics:
+    """
+    Per-endpoint request metrics: a latency histogram, SQL statement count and time and
+    response bytes, keyed by endpoint, method and status code.
+
+    SQL statements are attributed to the request running on the current thread through
+    engine-wide cursor events. With `METRICS_DIR` set, every worker periodically writes
+    its counters to its own file in that directory and `collect()` merges all of them,
+    so any worker can report totals for the whole server. Files of exited workers are
+    kept, so their counts stay in the totals, but their pool gauges are left out; clear the
+    directory when the server restarts.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('METRICS_ENABLED', True)
+        app.config.setdefault('METRICS_DIR', None)
+        app.config.setdefault('METRICS_FLUSH_INTERVAL', 5)
+        if not app.config['METRICS_ENABLED']:
+            return
+
+        directory = app.config['METRICS_DIR']
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        state = _MetricsState(directory, app.config['METRICS_FLUSH_INTERVAL'])
+        app.extensions['request_metrics'] = state
+
+        if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+        app.before_request(_start_request)
+        app.after_request(self._recorder(state))
+        if directory:
+            atexit.register(self._flush, state, False)
+
+    @staticmethod
+    def _state():
+        return current_app.extensions.get('request_metrics')
+
+    def _recorder(self, state):
+        # Bound to the app's state up front: every proxy lookup avoided here is saved on every request
+        def finish_request(response):
+            current = _current.get()
+            if current is None:
+                return response
+            _current.set(None)
+            elapsed = time.perf_counter() - current[0]
+
+            req = request._get_current_object()
+            key = (req.endpoint or 'unmatched', req.method, response.status_code)
+            size = int(response.headers.get('Content-Length') or 0)
+            with state.lock:
+                series = state.series.get(key)
+                if series is None:
+                    series = state.series[key] = _Series()
+                series.count += 1
+                series.seconds += elapsed
+                series.buckets[bisect.bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+                series.sql_count += current[1]
+                series.sql_seconds += current[2]
+                series.response_bytes += size
+
+            if state.directory and time.monotonic() - state.last_flush >= state.flush_interval:
+                self._flush(state)
+            return response
+
+        return finish_request
+
+    @staticmethod
+    def _flush(state, running=True):
+        with state.lock:
+            series = [
+                {'endpoint': key[0], 'method': key[1], 'status': key[2], **data.to_dict()}
+                for key, data in state.series.items()
+            ]
+            state.last_flush = time.monotonic()
+        snapshot = {'pid': state.pid, 'running': running, 'series': series, 'pool': pool_snapshot()}
+        temporary = f"{state.path}.tmp"
+        with open(temporary, 'w') as file:
+            json.dump(snapshot, file)
+        os.replace(temporary, state.path)
+
+    def collect(self):
+        """
+        Returns the merged request series of every worker, keyed by (endpoint, method, status),
+        and their connection pool values: counters summed over every worker, gauges over running ones.
+        """
+        state = self._state()
+        if state is None:
+            return {}, pool_snapshot()
+        merged = {}
+        pool = dict.fromkeys(pool_snapshot(), 0)
+        if state.directory:
+            self._flush(state)
+            snapshots = []
+            for path in glob.glob(os.path.join(state.directory, 'metrics-*.json')):
+                try:
+                    with open(path) as file:
+                        snapshots.append(json.load(file))
+                except (OSError, ValueError):
+                    continue
+        else:
+            with state.lock:
+                series = [
+                    {'endpoint': key[0], 'method': key[1], 'status': key[2], **data.to_dict()}
+                    for key, data in state.series.items()
+                ]
+            snapshots = [{'pid': state.pid, 'running': True, 'series': series, 'pool': pool_snapshot()}]
+
+        for snapshot in snapshots:
+            for data in snapshot['series']:
+                key = (data['endpoint'], data['method'], data['status'])
+                merged.setdefault(key, _Series()).merge(data)
+            running = snapshot.get('running', True) and _is_running(snapshot.get('pid'))
+            for name, value in snapshot['pool'].items():
+                if name == 'checkout_max_wait_seconds':
+                    pool[name] = max(pool[name], value)
+                elif name not in POOL_GAUGES or running:
+                    pool[name] += value
+        return merged, pool
+
+    def summary(self):
+        """A JSON-friendly summary with averages and latency percentiles estimated from the histogram."""
+        merged, pool = self.collect()
+        endpoints = []
+        for (endpoint, method, status), series in sorted(merged.items()):
+            count = series.count or 1
+            endpoints.append({
+                'endpoint': endpoint,
+                'method': method,
+                'status': status,
+                'requests': series.count,
+                'latency_ms': {
+                    'mean': round(series.seconds / count * 1000, 3),
+                    'p50': _quantile(series.buckets, series.count, 0.5),
+                    'p90': _quantile(series.buckets, series.count, 0.9),
+                    'p99': _quantile(series.buckets, series.count, 0.99),
+                },
+                'sql_queries': {
+                    'total': series.sql_count,
+                    'mean': round(series.sql_count / count, 2),
+                },
+                'sql_ms': {
+                    'total': round(series.sql_seconds * 1000, 3),
+                    'mean': round(series.sql_seconds / count * 1000, 3),
+                },
+                'response_bytes': {
+                    'total': series.response_bytes,
+                    'mean': series.response_bytes // count,
+                },
+            })
+        checkouts = pool['checkouts'] or 1
+        return {
+            'endpoints': endpoints,
+            'pool': {
+                'checkouts': pool['checkouts'],
+                'checkout_wait_ms': {
+                    'mean': round(pool['checkout_wait_seconds'] / checkouts * 1000, 3),
+                    'max': round(pool['checkout_max_wait_seconds'] * 1000, 3),
+                },
+                'checkout_timeouts': pool['checkout_timeouts'],
+                'connects': pool['connects'],
+                'invalidations': pool['invalidations'],
+                'size': pool['size'],
+                'checked_out': pool['checked_out'],
+                'overflow': pool['overflow'],
+            },
+        }
+
+    def prometheus(self):
+        """Renders the merged series in the Prometheus text exposition format."""
+        merged, pool = self.collect()
+        series = sorted(merged.items())
+        lines = [
+            '# HELP http_request_duration_seconds Request latency by endpoint, method and status.',
+            '# TYPE http_request_duration_seconds histogram',
+        ]
+        for key, data in series:
+            labels = _labels(key)
+            cumulative = 0
+            for bound, bucket in zip(LATENCY_BUCKETS, data.buckets):
+                cumulative += bucket
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {data.count}')
+            lines.append(f'http_request_duration_seconds_sum{{{labels}}} {data.seconds}')
+            lines.append(f'http_request_duration_seconds_count{{{labels}}} {data.count}')
+
+        for name, attribute, description in (
+                ('http_request_sql_queries_total', 'sql_count', 'SQL statements executed while handling requests.'),
+                ('http_request_sql_duration_seconds_total', 'sql_seconds', 'Time spent executing SQL statements.'),
+                ('http_response_size_bytes_total', 'response_bytes', 'Response body bytes sent.'),
+        ):
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} counter')
+            for key, data in series:
+                lines.append(f'{name}{{{_labels(key)}}} {getattr(data, attribute)}')
+
+        for name, kind, key, description in (
+                ('db_pool_checkouts_total', 'counter', 'checkouts', 'Connections checked out of the pool.'),
+                ('db_pool_checkout_wait_seconds_total', 'counter', 'checkout_wait_seconds',
+                 'Time spent waiting to check out a usable connection.'),
+                ('db_pool_checkout_timeouts_total', 'counter', 'checkout_timeouts',
+                 'Checkouts that timed out because the pool was exhausted.'),
+                ('db_pool_connects_total', 'counter', 'connects', 'Database connections opened.'),
+                ('db_pool_invalidations_total', 'counter', 'invalidations',
+                 'Connections discarded as dead, including by pre-ping.'),
+                ('db_pool_size', 'gauge', 'size', 'Configured pool size.'),
+                ('db_pool_checked_out', 'gauge', 'checked_out', 'Connections currently checked out.'),
+                ('db_pool_overflow', 'gauge', 'overflow', 'Overflow connections currently open.'),
+        ):
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.append(f'{name} {pool[key]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _is_running(pid):
+    """Whether the process `pid` still exists. Workers killed without running atexit handlers are caught here."""
+    if pid is None:
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _labels(key):
+    endpoint, method, status = key
+    return f'endpoint="{endpoint}",method="{method}",status="{status}"'
+
+
+def _quantile(buckets, count, q):
+    """Estimates a quantile in milliseconds by interpolating inside the histogram bucket that holds it."""
+    if not count:
+        return None
+    rank = q * count
+    cumulative = 0
+    lower = 0.0
+    for index, bucket in enumerate(buckets):
+        upper = LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else LATENCY_BUCKETS[-1]
+        if bucket and cumulative + bucket >= rank:
+            return round((lower + (upper - lower) * (rank - cumulative) / bucket) * 1000, 3)
+        cumulative += bucket
+        lower = upper
+    return round(LATENCY_BUCKETS[-1] * 1000, 3)
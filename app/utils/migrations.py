@@ -0,0 +1,137 @@
+import ast
+import contextlib
+import os
+import re
+import time
+
+from sqlalchemy import inspect, text
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock; single process development only
+    fcntl = None
+
+LOCK_NAME = 'personal_backend_migrations'
+_REVISION = re.compile(r"^(down_revision|revision)\s*(?::[^=\n]+)?=\s*(.+)$", re.M)
+
+
+def init_migrate(app):
+    """Registers Flask-Migrate and the `flask db` commands. Alembic is slow to import, so only done on demand."""
+    from flask_migrate import Migrate
+
+    from app import db
+
+    Migrate(app, db, directory=app.config['MIGRATIONS_DIRECTORY'])
+
+
+def script_heads(directory):
+    """
+    The head revisions of a migrations directory, read from the revision files without importing alembic.
+
+    Returns None when a file does not declare its revisions as plain literals.
+    """
+    revisions, parents = set(), set()
+    versions = os.path.join(directory, 'versions')
+    for name in os.listdir(versions):
+        if not name.endswith('.py'):
+            continue
+        with open(os.path.join(versions, name), encoding='utf-8') as f:
+            found = dict((key, value) for key, value in _REVISION.findall(f.read()))
+        try:
+            revision = ast.literal_eval(found['revision'])
+            down_revision = ast.literal_eval(found.get('down_revision', 'None'))
+        except (KeyError, ValueError, SyntaxError):
+            return None
+        revisions.add(revision)
+        if isinstance(down_revision, str):
+            parents.add(down_revision)
+        elif down_revision:
+            parents.update(down_revision)
+    return revisions - parents
+
+
+def schema_is_current(app, engine):
+    """
+    Whether the database needs no migration: the alembic version table holds the script heads,
+    or, without a migrations directory, every model table exists. Costs one or two queries.
+    """
+    directory = app.config['MIGRATIONS_DIRECTORY']
+    with engine.connect() as connection:
+        inspector = inspect(connection)
+        if not os.path.isdir(directory):
+            from app import db
+            return set(db.metadata.tables) <= set(inspector.get_table_names())
+
+        heads = script_heads(directory)
+        if not heads or not inspector.has_table('alembic_version'):
+            return False
+        current = connection.execute(text('SELECT version_num FROM alembic_version')).scalars()
+        return set(current) == heads
+
+
+@contextlib.contextmanager
+def migration_lock(engine, timeout):
+    """
+    Holds a lock shared by every process migrating this database: a named lock on MariaDB,
+    or a lock file next to an SQLite database. Raises TimeoutError after `timeout` seconds.
+    """
+    if engine.dialect.name in ('mysql', 'mariadb'):
+        with engine.connect() as connection:
+            acquired = connection.execute(
+                text('SELECT GET_LOCK(:name, :timeout)'), {'name': LOCK_NAME, 'timeout': timeout}
+            ).scalar()
+            if acquired != 1:
+                raise TimeoutError(f"Migration lock not acquired within {timeout}s")
+            try:
+                yield
+            finally:
+                connection.execute(text('SELECT RELEASE_LOCK(:name)'), {'name': LOCK_NAME})
+        return
+
+    database = engine.url.database
+    if fcntl is None or not database or database == ':memory:':
+        yield
+        return
+    with open(f"{database}.migrate-lock", 'w') as lock_file:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Migration lock not acquired within {timeout}s")
+                time.sleep(0.1)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def ensure_schema(app):
+    """
+    Brings the database schema up to date, returning whether anything had to be done.
+
+    The cheap `schema_is_current` check runs first, so a start against a current schema never
+    imports alembic. Otherwise the migration runs behind `migration_lock`, and the check is
+    repeated once the lock is held, so of several workers starting together only one migrates.
+    Without a migrations directory the tables are created from the models instead.
+    """
+    from app import db
+
+    with app.app_context():
+        engine = db.engine
+        if schema_is_current(app, engine):
+            return False
+        with migration_lock(engine, app.config['MIGRATION_LOCK_TIMEOUT']):
+            if schema_is_current(app, engine):
+                return False
+            directory = app.config['MIGRATIONS_DIRECTORY']
+            if not os.path.isdir(directory):
+                db.create_all()
+                return True
+            if 'migrate' not in app.extensions:
+                init_migrate(app)
+            from flask_migrate import upgrade
+            upgrade(directory=directory)
+        return True
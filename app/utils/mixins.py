@@ -1,4 +1,5 @@
 from datetime import datetime
+from operator import attrgetter, itemgetter
 
 from app import db
 
@@ -11,21 +12,67 @@ class TimestampMixin:
 
 
 class SerializerMixin:
-    """Adds `dump` & `to_dict` method for serializing models."""
+    """
+    Adds `dump` & `to_dict` method for serializing models.
+
+    Relationships named in `__serialized_relationships__` are included as lists of partial
+    dicts unless `partial` is set. The field accessors for each model class and
+    exclude/partial combination are compiled once and reused for every row.
+    """
+    __serialized_relationships__ = ()
 
     def dump(self):
         return self.to_dict()
 
-    def to_dict(self, exclude=None):
-        exclude = exclude or []
-        if hasattr(self, '__table__'):
-            serialized_data = {
-                column.name: getattr(self, column.name)
-                for column in self.__table__.columns
-                if column.name not in exclude
-            }
+    def to_dict(self, exclude=None, partial=False):
+        return _serializer(type(self), frozenset(exclude or ()), partial)(self)
+
+
+_serializers = {}
+
+
+def _serializer(cls, exclude, partial):
+    key = (cls, exclude, partial)
+    serializer = _serializers.get(key)
+    if serializer is None:
+        serializer = _serializers[key] = _compile_serializer(cls, exclude, partial)
+    return serializer
+
+
+def _compile_serializer(cls, exclude, partial):
+    if not hasattr(cls, '__table__'):
+        raise AttributeError(f"{cls.__name__} does not have a __table__ attribute.")
+
+    names = tuple(column.name for column in cls.__table__.columns if column.name not in exclude)
+    relationships = () if partial else tuple(
+        name for name in cls.__serialized_relationships__ if name not in exclude
+    )
+    # Loaded column values live in the instance __dict__. Reading them from there skips the
+    # instrumented descriptors, and getattr is only needed for expired or deferred attributes.
+    get_loaded = itemgetter(*names) if names else None
+    get_attributes = attrgetter(*names) if names else None
+    single = len(names) == 1
+
+    def values(obj):
+        if not names:
+            return ()
+        try:
+            result = get_loaded(obj.__dict__)
+        except KeyError:
+            result = get_attributes(obj)
+        return (result,) if single else result
+
+    if not relationships:
+        def serialize(obj):
+            return dict(zip(names, values(obj)))
+    else:
+        def serialize(obj):
+            serialized_data = dict(zip(names, values(obj)))
+            for name in relationships:
+                serialized_data[name] = [item.to_dict(partial=True) for item in getattr(obj, name)]
             return serialized_data
-        raise AttributeError(f"{self.__class__.__name__} does not have a __table__ attribute.")
+
+    return serialize
 
 
 class CRUDMixin(object):
@@ -0,0 +1,113 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
+from flask import request, url_for, current_app
+from sqlalchemy import and_, or_
+
+from app.exception.validation_error import ValidationError
+
+
+def _encode_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(column, value):
+    python_type = column.type.python_type
+    if python_type in (date, datetime):
+        return python_type.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(sort, value, row_id):
+    payload = json.dumps([sort, _encode_value(value), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, sort, column, id_column):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if cursor_sort != sort:
+            raise ValueError(cursor_sort)
+        return _decode_value(column, value), _decode_value(id_column, row_id)
+    except (binascii.Error, json.JSONDecodeError, TypeError, ValueError):
+        raise ValidationError("Invalid cursor.")
+
+
+class PageRequest:
+    """
+    Keyset pagination arguments parsed from `?limit=&after=&sort=`.
+
+    Pages are ordered by the sort column and then by id, so a cursor only has to remember
+    the last row's key and the next page is an index range scan whatever its depth.
+    A leading '-' on the sort key orders descending.
+    """
+
+    def __init__(self, sort_columns, id_column, default_sort="id"):
+        args = request.args
+        self.enabled = "limit" in args or "after" in args
+        self.sort = args.get("sort", default_sort)
+        descending = self.sort.startswith("-")
+        name = self.sort.lstrip("-")
+        if name not in sort_columns:
+            raise ValidationError(f"Invalid sort. Must be one of {', '.join(sort_columns)}.")
+        self.descending = descending
+        self.column = sort_columns[name]
+        self.id_column = id_column
+        self.key = name
+
+        max_limit = current_app.config["PAGINATION_MAX_LIMIT"]
+        try:
+            self.limit = int(args.get("limit", current_app.config["PAGINATION_DEFAULT_LIMIT"]))
+        except ValueError:
+            raise ValidationError("Invalid limit. Must be an integer.")
+        if self.limit < 1 or self.limit > max_limit:
+            raise ValidationError(f"Invalid limit. Must be between 1 and {max_limit}.")
+
+        self.after = None
+        if args.get("after"):
+            self.after = decode_cursor(args["after"], self.sort, self.column, id_column)
+
+    def order(self, query):
+        if self.descending:
+            return query.order_by(self.column.desc(), self.id_column.desc())
+        return query.order_by(self.column, self.id_column)
+
+    def apply(self, query):
+        """Orders the query and restricts it to the requested page, plus one row to detect a next page."""
+        query = self.order(query)
+        if not self.enabled:
+            return query
+        if self.after is not None:
+            value, row_id = self.after
+            if self.column is self.id_column:
+                condition = self.id_column < row_id if self.descending else self.id_column > row_id
+            elif self.descending:
+                condition = or_(self.column < value, and_(self.column == value, self.id_column < row_id))
+            else:
+                condition = or_(self.column > value, and_(self.column == value, self.id_column > row_id))
+            query = query.filter(condition)
+        return query.limit(self.limit + 1)
+
+    def page(self, rows, key=lambda row: row):
+        """Splits the fetched rows into this page's rows and the cursor of the next page, if any."""
+        if not self.enabled or len(rows) <= self.limit:
+            return rows, None
+        rows = rows[:self.limit]
+        last = key(rows[-1])
+        return rows, encode_cursor(self.sort, getattr(last, self.key), getattr(last, self.id_column.key))
+
+    def response(self, items, next_cursor):
+        """Wraps a page of serialized items, or returns them bare when pagination wasn't requested."""
+        if not self.enabled:
+            return items
+        next_url = None
+        if next_cursor:
+            args = request.args.to_dict()
+            args.update(after=next_cursor, limit=self.limit)
+            next_url = url_for(request.endpoint, **(request.view_args or {}), **args)
+        return {"items": items, "next": next_url}
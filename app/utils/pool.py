@@ -0,0 +1,105 @@
+import os
+import threading
+import time
+import weakref
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+
+class _PoolStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+
+    def record_wait(self, seconds, timed_out=False):
+        with self.lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds += seconds
+            if seconds > self.max_wait_seconds:
+                self.max_wait_seconds = seconds
+
+
+pool_stats = _PoolStats()
+_pools = weakref.WeakSet()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    A QueuePool that records how long checkouts take to get a usable connection and how
+    often they time out because the pool and its overflow are exhausted. Counters are
+    process-wide and reported through `pool_snapshot()`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        _pools.add(self)
+
+    def connect(self):
+        # Covers waiting on the queue, opening overflow connections and the pre-ping
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_stats.record_wait(time.perf_counter() - started)
+        return connection
+
+
+@event.listens_for(InstrumentedQueuePool, 'connect')
+def _on_connect(dbapi_connection, connection_record):
+    connection_record.info['pid'] = os.getpid()
+    with pool_stats.lock:
+        pool_stats.connects += 1
+
+
+@event.listens_for(InstrumentedQueuePool, 'checkout')
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    # A worker forked from a process that already held connections (gunicorn --preload) must
+    # not use them: the socket is shared with the parent. Detach it unclosed and reconnect.
+    if connection_record.info.get('pid', os.getpid()) != os.getpid():
+        connection_record.dbapi_connection = connection_proxy.dbapi_connection = None
+        raise exc.DisconnectionError("Connection belongs to another process")
+
+
+@event.listens_for(InstrumentedQueuePool, 'invalidate')
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    # Fires for connections found dead by pre-ping as well as ones lost mid-query
+    with pool_stats.lock:
+        pool_stats.invalidations += 1
+
+
+def pool_snapshot():
+    """Counters since the process started, plus gauges summed over this process's live pools."""
+    pools = list(_pools)
+    with pool_stats.lock:
+        return {
+            'checkouts': pool_stats.checkouts,
+            'checkout_wait_seconds': pool_stats.wait_seconds,
+            'checkout_max_wait_seconds': pool_stats.max_wait_seconds,
+            'checkout_timeouts': pool_stats.timeouts,
+            'connects': pool_stats.connects,
+            'invalidations': pool_stats.invalidations,
+            'size': sum(pool.size() for pool in pools),
+            'checked_out': sum(pool.checkedout() for pool in pools),
+            'overflow': sum(max(pool.overflow(), 0) for pool in pools),
+        }
+
+
+def _after_fork():
+    pool_stats.__init__()
+
+
+os.register_at_fork(after_in_child=_after_fork)
@@ -0,0 +1,101 @@
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import event, inspect
+
+
+class _PrincipalState:
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.entries = {}
+        # Bumped by every invalidation, so a lookup that raced one doesn't store what it read
+        self.generation = 0
+        self.lock = threading.Lock()
+
+
+class PrincipalCache:
+    """
+    Per-worker cache of each user's `is_admin` flag, keyed by user id.
+
+    Entries expire after `PRINCIPAL_CACHE_TTL` seconds and are invalidated once a commit in
+    this worker deletes a user or changes its `is_admin` flag. The TTL bounds how long a change
+    made through another worker can go unnoticed.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        from flask_sqlalchemy.session import Session
+
+        app.config.setdefault('PRINCIPAL_CACHE_TTL', 60)
+        app.extensions['principal_cache'] = _PrincipalState(app.config['PRINCIPAL_CACHE_TTL'])
+        if not event.contains(Session, 'after_flush', _after_flush):
+            event.listen(Session, 'after_flush', _after_flush)
+            event.listen(Session, 'after_commit', _after_commit)
+            event.listen(Session, 'after_soft_rollback', _after_soft_rollback)
+
+    @staticmethod
+    def _state():
+        return current_app.extensions['principal_cache']
+
+    def is_admin(self, user_id):
+        """Returns whether the user exists and is an admin, loading it on a cache miss."""
+        from app.models.user import User
+
+        state = self._state()
+        key = str(user_id)
+        now = time.monotonic()
+        with state.lock:
+            entry = state.entries.get(key)
+            if entry is not None and entry[1] > now:
+                return entry[0]
+            generation = state.generation
+
+        row = User.query.with_entities(User.is_admin).filter_by(id=user_id).first()
+        is_admin = bool(row and row.is_admin)
+        with state.lock:
+            if state.generation == generation:
+                state.entries[key] = (is_admin, now + state.ttl)
+        return is_admin
+
+    def invalidate(self, user_id):
+        state = self._state()
+        with state.lock:
+            state.generation += 1
+            state.entries.pop(str(user_id), None)
+
+    def clear(self):
+        state = self._state()
+        with state.lock:
+            state.generation += 1
+            state.entries.clear()
+
+
+def _after_flush(session, flush_context):
+    from app.models.user import User
+
+    if 'principal_cache' not in current_app.extensions:
+        return
+    changed = {
+        instance.id for instance in session.dirty
+        if isinstance(instance, User) and inspect(instance).attrs.is_admin.history.has_changes()
+    }
+    changed.update(instance.id for instance in session.deleted if isinstance(instance, User))
+    if changed:
+        session.info.setdefault('principal_cache_pending', set()).update(changed)
+
+
+def _after_commit(session):
+    # Only now can a lookup read the new row; invalidating earlier lets it cache the old one
+    pending = session.info.pop('principal_cache_pending', None)
+    if pending and 'principal_cache' in current_app.extensions:
+        from app import principal_cache
+        for user_id in pending:
+            principal_cache.invalidate(user_id)
+
+
+def _after_soft_rollback(session, previous_transaction):
+    session.info.pop('principal_cache_pending', None)
@@ -0,0 +1,206 @@
+import contextvars
+import os
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_recorders = contextvars.ContextVar('query_recorders', default=())
+
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|:\w+|\?")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement):
+    """Reduces a statement to its shape, so statements differing only in parameters compare equal."""
+    statement = _PLACEHOLDER.sub('?', statement)
+    statement = _LITERAL.sub('?', statement)
+    statement = _PLACEHOLDER_LIST.sub('?', statement)
+    return _WHITESPACE.sub(' ', statement).strip()
+
+
+def call_site():
+    """The innermost project frame outside this module, as `path:line in function`."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_PROJECT_DIR) and filename != __file__ and 'site-packages' not in filename:
+            return f"{os.path.relpath(filename, _PROJECT_DIR)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+class QueryRecorder:
+    """Statements executed while the recorder is active, with their durations in seconds."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __len__(self):
+        return len(self.statements)
+
+    def repeated(self, threshold=2):
+        """Statement shapes executed at least `threshold` times, most frequent first."""
+        counts = Counter(normalize_statement(statement) for statement, _ in self.statements)
+        return [(shape, count) for shape, count in counts.most_common() if count >= threshold]
+
+    def describe(self):
+        lines = [f"{len(self.statements)} statements:"]
+        lines.extend(f"  {seconds * 1000:8.2f} ms  {statement}" for statement, seconds in self.statements)
+        for shape, count in self.repeated():
+            lines.append(f"  repeated {count}x: {shape}")
+        return '\n'.join(lines)
+
+
+class _RequestQueries(QueryRecorder):
+    def __init__(self, tracker):
+        super().__init__()
+        self.tracker = tracker
+        self.shapes = Counter()
+        self.token = None
+
+
+def _request_queries():
+    return next((r for r in reversed(_recorders.get()) if isinstance(r, _RequestQueries)), None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised by `query_budget` when a block executes more statements than it was allowed."""
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _recorders.get() and context is not None:
+        context._query_tracker_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    recorders = _recorders.get()
+    if not recorders or context is None:
+        return
+    started = getattr(context, '_query_tracker_started', None)
+    if started is None:
+        return
+    seconds = time.perf_counter() - started
+    for recorder in recorders:
+        recorder.statements.append((statement, seconds))
+        if isinstance(recorder, _RequestQueries):
+            recorder.tracker.check(recorder, statement, seconds)
+
+
+def _install_listeners():
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+@contextmanager
+def record_queries():
+    """Records every statement executed in the current context (thread or task) while the block runs."""
+    _install_listeners()
+    recorder = QueryRecorder()
+    token = _recorders.set((*_recorders.get(), recorder))
+    try:
+        yield recorder
+    finally:
+        _recorders.reset(token)
+
+
+@contextmanager
+def query_budget(limit):
+    """
+    Fails with `QueryBudgetExceeded` when the block executes more than `limit` statements.
+
+        with query_budget(3):
+            client.get("/v1/projects")
+    """
+    with record_queries() as recorder:
+        yield recorder
+    if len(recorder) > limit:
+        raise QueryBudgetExceeded(f"Query budget of {limit} exceeded by {recorder.describe()}")
+
+
+class _TrackerState:
+    def __init__(self, logger, repeat_threshold, slow_query_seconds):
+        self.logger = logger
+        self.repeat_threshold = repeat_threshold
+        self.slow_query_seconds = slow_query_seconds
+
+    def start_request(self):
+        queries = _RequestQueries(self)
+        queries.token = _recorders.set((*_recorders.get(), queries))
+
+    @staticmethod
+    def finish_request(response):
+        queries = _request_queries()
+        if queries is not None:
+            response.headers['X-Query-Count'] = str(len(queries))
+        return response
+
+    @staticmethod
+    def teardown_request(error=None):
+        # Runs even when the view raised and after_request was skipped
+        queries = _request_queries()
+        if queries is None:
+            return
+        try:
+            _recorders.reset(queries.token)
+        except ValueError:
+            # Set in another context, so that context's value is not ours to restore
+            _recorders.set(tuple(r for r in _recorders.get() if r is not queries))
+
+    def check(self, queries, statement, seconds):
+        shape = normalize_statement(statement)
+        queries.shapes[shape] += 1
+        if queries.shapes[shape] == self.repeat_threshold:
+            self.logger.warning(
+                "Possible N+1 in %s %s: statement repeated %d times, last from %s: %s",
+                request.method, request.path, self.repeat_threshold, call_site(), shape,
+            )
+        if seconds >= self.slow_query_seconds:
+            self.logger.warning(
+                "Slow query in %s %s (%.1f ms) from %s: %s",
+                request.method, request.path, seconds * 1000, call_site(), statement,
+            )
+
+
+class QueryTracker:
+    """
+    Development and test aid that watches the SQL executed by each request.
+
+    A statement shape (the statement with its parameters stripped) executed
+    `QUERY_TRACKER_REPEAT_THRESHOLD` times within one request is logged as a likely N+1,
+    and any statement slower than `QUERY_TRACKER_SLOW_QUERY_MS` is logged as slow, both
+    with the route and the application frame that issued them. Responses carry the
+    statement count in an `X-Query-Count` header.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('QUERY_TRACKER_ENABLED', app.config.get('FLASK_ENV') in ('development', 'testing'))
+        app.config.setdefault('QUERY_TRACKER_REPEAT_THRESHOLD', 5)
+        app.config.setdefault('QUERY_TRACKER_SLOW_QUERY_MS', 100)
+        if not app.config['QUERY_TRACKER_ENABLED']:
+            return
+
+        _install_listeners()
+        tracker = _TrackerState(
+            app.logger,
+            app.config['QUERY_TRACKER_REPEAT_THRESHOLD'],
+            app.config['QUERY_TRACKER_SLOW_QUERY_MS'] / 1000,
+        )
+        app.extensions['query_tracker'] = tracker
+        app.before_request(tracker.start_request)
+        app.after_request(tracker.finish_request)
+        app.teardown_request(tracker.teardown_request)
@@ -0,0 +1,179 @@
+import contextvars
+import itertools
+import threading
+import time
+
+from flask import current_app, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event, exc, text
+
+_replica = contextvars.ContextVar('read_replica', default=None)
+_wrote = contextvars.ContextVar('wrote_to_primary', default=False)
+
+STICKY_COOKIE = 'db_read_primary'
+# Set in the WSGI environ of requests whose reads must not be routed, such as the ASGI coroutine views
+PRIMARY_ONLY_ENVIRON_KEY = 'replicas.primary_only'
+
+
+def reads_replica():
+    """Whether reads of the current request are being routed to a replica."""
+    return _replica.get() is not None
+
+
+def reads_own_writes():
+    """Whether the current request comes from a client kept on the primary after its last write."""
+    return 'replica_router' in current_app.extensions and STICKY_COOKIE in request.cookies
+
+
+class RoutingSession(Session):
+    """
+    Session that sends plain SELECTs to the read replica chosen for the current request.
+
+    Flushes, DML and locking reads go to the primary, and once a request has written
+    anything, the rest of it reads from the primary too.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica = _replica.get()
+        if replica is not None and bind is None:
+            if not self._flushing and clause is not None and clause.is_select \
+                    and getattr(clause, '_for_update_arg', None) is None:
+                return replica
+            _replica.set(None)
+        if bind is None and (self._flushing or (clause is not None and clause.is_dml)):
+            _wrote.set(True)
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class _Replica:
+    def __init__(self, engine):
+        self.engine = engine
+        self.healthy = True
+        self.retry_at = 0.0
+        self.reads = 0
+        self.failures = 0
+
+
+class _RouterState:
+    def __init__(self, replicas, blueprints, sticky_seconds, retry_interval):
+        self.replicas = replicas
+        self.blueprints = blueprints
+        self.sticky_seconds = sticky_seconds
+        self.retry_interval = retry_interval
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+    def pick(self):
+        """Round-robin over healthy replicas. Down replicas are probed again once their retry time passes."""
+        count = len(self.replicas)
+        for _ in range(count):
+            replica = self.replicas[next(self.counter) % count]
+            if replica.healthy or (time.monotonic() >= replica.retry_at and self.probe(replica)):
+                replica.reads += 1
+                return replica
+        return None
+
+    def probe(self, replica):
+        with self.lock:
+            if replica.healthy:
+                return True
+            if time.monotonic() < replica.retry_at:
+                return False
+            try:
+                with replica.engine.connect() as connection:
+                    connection.execute(text('SELECT 1'))
+            except exc.DBAPIError:
+                self.mark_down(replica)
+                return False
+            replica.healthy = True
+            return True
+
+    def mark_down(self, replica):
+        replica.healthy = False
+        replica.failures += 1
+        replica.retry_at = time.monotonic() + self.retry_interval
+
+
+class ReplicaRouter:
+    """
+    Routes safe GET requests of the configured blueprints to read replicas.
+
+    Replicas come from `SQLALCHEMY_REPLICA_URIS` and are picked round-robin, skipping any
+    whose connections failed in the last `REPLICA_RETRY_INTERVAL` seconds; with none
+    healthy, reads fall back to the primary. A request that writes sets a short-lived
+    cookie that keeps that client on the primary for `REPLICA_STICKY_SECONDS`, so admins
+    read their own writes while the replicas catch up.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('SQLALCHEMY_REPLICA_URIS', [])
+        app.config.setdefault('REPLICA_READ_BLUEPRINTS', ['project_routes', 'tag_routes', 'social_link_routes'])
+        app.config.setdefault('REPLICA_STICKY_SECONDS', 5)
+        app.config.setdefault('REPLICA_RETRY_INTERVAL', 30)
+        uris = [uri for uri in app.config['SQLALCHEMY_REPLICA_URIS'] if uri]
+        if not uris:
+            return
+
+        options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}
+        state = _RouterState(
+            [],
+            frozenset(app.config['REPLICA_READ_BLUEPRINTS']),
+            app.config['REPLICA_STICKY_SECONDS'],
+            app.config['REPLICA_RETRY_INTERVAL'],
+        )
+        for uri in uris:
+            replica = _Replica(create_engine(uri, **options))
+            event.listen(replica.engine, 'handle_error', self._error_handler(state, replica))
+            state.replicas.append(replica)
+        app.extensions['replica_router'] = state
+
+        app.before_request(lambda: self._start_request(state))
+        app.after_request(self._finish_request)
+        app.teardown_request(self._teardown_request)
+
+    @staticmethod
+    def _error_handler(state, replica):
+        def handle_error(context):
+            if context.is_disconnect or isinstance(context.sqlalchemy_exception, exc.OperationalError):
+                state.mark_down(replica)
+
+        return handle_error
+
+    @staticmethod
+    def _start_request(state):
+        _wrote.set(False)
+        _replica.set(None)
+        if request.method in ('GET', 'HEAD') and request.blueprint in state.blueprints \
+                and STICKY_COOKIE not in request.cookies and not request.environ.get(PRIMARY_ONLY_ENVIRON_KEY):
+            replica = state.pick()
+            if replica is not None:
+                _replica.set(replica.engine)
+
+    @staticmethod
+    def _finish_request(response):
+        if _wrote.get():
+            state = current_app.extensions['replica_router']
+            response.set_cookie(STICKY_COOKIE, '1', max_age=state.sticky_seconds, httponly=True, samesite='Strict')
+        return response
+
+    @staticmethod
+    def _teardown_request(error=None):
+        _replica.set(None)
+        _wrote.set(False)
+
+    def stats(self):
+        state = current_app.extensions.get('replica_router')
+        if state is None:
+            return {'replicas': []}
+        now = time.monotonic()
+        return {'replicas': [{
+            'engine': replica.engine.url.render_as_string(hide_password=True),
+            'healthy': replica.healthy,
+            'retry_in': None if replica.healthy else max(round(replica.retry_at - now, 1), 0),
+            'reads': replica.reads,
+            'failures': replica.failures,
+        } for replica in state.replicas]}
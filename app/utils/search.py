@@ -0,0 +1,273 @@
+import heapq
+import math
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from itertools import chain
+
+from flask import current_app
+from sqlalchemy import event, or_, select
+from sqlalchemy.orm import Session, selectinload
+
+token_regex = re.compile(r"[^\W_]+")
+
+# Term frequency multipliers, so a match in the name outranks one in the description
+FIELD_WEIGHTS = (("name", 3), ("tags", 2), ("description", 1))
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text):
+    return token_regex.findall(text.lower()) if text else []
+
+
+def _document_terms(project):
+    terms = Counter()
+    for field, weight in FIELD_WEIGHTS:
+        if field == "tags":
+            text = " ".join(tag["name"] for tag in project.get("tags", ()))
+        else:
+            text = project.get(field)
+        for token in tokenize(text):
+            terms[token] += weight
+    return terms
+
+
+class _IndexState:
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.built_at = None
+        self.documents = {}
+        self.postings = {}
+        self.total_length = 0
+        self.sorted_terms = []
+        self.terms_dirty = False
+        self.norms = None
+
+    def add(self, project_id, project):
+        self.remove(project_id)
+        self.norms = None
+        terms = _document_terms(project)
+        length = sum(terms.values())
+        self.documents[project_id] = (project, terms, length)
+        self.total_length += length
+        for term, frequency in terms.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                self.terms_dirty = True
+            postings[project_id] = frequency
+
+    def remove(self, project_id):
+        document = self.documents.pop(project_id, None)
+        if document is None:
+            return
+        _, terms, length = document
+        self.total_length -= length
+        self.norms = None
+        for term in terms:
+            postings = self.postings[term]
+            del postings[project_id]
+            if not postings:
+                del self.postings[term]
+                self.terms_dirty = True
+
+    def length_norms(self):
+        """BM25's per-document length normalization, recomputed only after the index changes."""
+        if self.norms is None:
+            average_length = self.total_length / len(self.documents)
+            self.norms = {
+                project_id: K1 * (1 - B + B * length / average_length)
+                for project_id, (_, _, length) in self.documents.items()
+            }
+        return self.norms
+
+    def expand(self, token):
+        """Returns every indexed term starting with `token`."""
+        if self.terms_dirty:
+            self.sorted_terms = sorted(self.postings)
+            self.terms_dirty = False
+        start = bisect_left(self.sorted_terms, token)
+        matches = []
+        for term in self.sorted_terms[start:]:
+            if not term.startswith(token):
+                break
+            matches.append(term)
+        return matches
+
+
+class SearchIndex:
+    """
+    In-memory inverted index over project names, descriptions and tag names.
+
+    Query tokens match indexed terms by prefix, and every token must match for a project to be
+    returned. Results are ranked with BM25 and carry the serialized project, so a search never
+    touches the database. The index is built on the first search and, from then on, kept up to
+    date as projects are committed through the ORM: flushes only note the ids of changed projects
+    and renamed tags, which are read back once committed. Writes that bypass the ORM, such as bulk imports, call
+    `invalidate()`. A full rebuild also happens every `SEARCH_INDEX_TTL` seconds, to pick up
+    writes made through other workers.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        from flask_sqlalchemy.session import Session
+
+        app.config.setdefault('SEARCH_INDEX_TTL', 300)
+        app.extensions['search_index'] = _IndexState(app.config['SEARCH_INDEX_TTL'])
+        if not event.contains(Session, 'after_flush', _after_flush):
+            event.listen(Session, 'after_flush', _after_flush)
+            event.listen(Session, 'after_commit', _after_commit)
+            event.listen(Session, 'after_soft_rollback', _after_soft_rollback)
+
+    @staticmethod
+    def _state():
+        return current_app.extensions['search_index']
+
+    def rebuild(self):
+        from app.models import Project
+
+        projects = [
+            (project.id, project.dump())
+            for project in Project.query.options(selectinload(Project.tags)).all()
+        ]
+        fresh = _IndexState(self._state().ttl)
+        for project_id, project in projects:
+            fresh.add(project_id, project)
+        fresh.built_at = time.monotonic()
+        current_app.extensions['search_index'] = fresh
+
+    def invalidate(self):
+        self._state().built_at = None
+
+    def _ensure_built(self):
+        state = self._state()
+        if state.built_at is None or time.monotonic() - state.built_at > state.ttl:
+            with state.lock:
+                if self._state() is state:
+                    self.rebuild()
+        return self._state()
+
+    def update(self, project_ids, tag_ids, removed_ids):
+        """Re-reads the given committed projects and those carrying one of the given tags, and drops `removed_ids`."""
+        from app import db
+        from app.models import Project, Tag
+
+        state = self._state()
+        if state.built_at is None:
+            return
+        conditions = []
+        if project_ids:
+            conditions.append(Project.id.in_(project_ids))
+        if tag_ids:
+            conditions.append(Project.tags.any(Tag.id.in_(tag_ids)))
+        projects = {}
+        if conditions:
+            # The committing session cannot run queries from its after_commit hook
+            with Session(db.engine) as session:
+                statement = select(Project).options(selectinload(Project.tags)).where(or_(*conditions))
+                projects = {project.id: project.dump() for project in session.scalars(statement)}
+        # Changed projects that are gone were deleted by a later commit
+        removed_ids = removed_ids | (project_ids - projects.keys())
+
+        with state.lock:
+            if self._state() is not state:
+                # Rebuilt while this thread waited for the lock, possibly from a read taken before
+                # this commit. Applying the change to the discarded index would lose it.
+                self.invalidate()
+                return
+            for project_id in removed_ids:
+                state.remove(project_id)
+            for project_id, project in projects.items():
+                state.add(project_id, project)
+
+    def search(self, query, limit=20):
+        """Returns up to `limit` `(score, project)` pairs, best match first."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        state = self._ensure_built()
+        with state.lock:
+            count = len(state.documents)
+            if not count:
+                return []
+            norms = state.length_norms()
+
+            expanded = [
+                [(state.postings[term], math.log(1 + (count - len(state.postings[term]) + 0.5)
+                                                 / (len(state.postings[term]) + 0.5)))
+                 for term in state.expand(token)]
+                for token in dict.fromkeys(tokens)
+            ]
+            # Every token must match, so start from the rarest and only score its candidates after that
+            expanded.sort(key=lambda matches: sum(len(postings) for postings, _ in matches))
+
+            scores = None
+            for matches in expanded:
+                token_scores = {}
+                for postings, idf in matches:
+                    project_ids = postings if scores is None or len(scores) > len(postings) else scores
+                    for project_id in project_ids:
+                        frequency = postings.get(project_id)
+                        if frequency is None or (scores is not None and project_id not in scores):
+                            continue
+                        score = idf * frequency * (K1 + 1) / (frequency + norms[project_id])
+                        # A prefix can expand to several terms in one project; count its best match
+                        if score > token_scores.get(project_id, 0):
+                            token_scores[project_id] = score
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {project_id: scores[project_id] + score for project_id, score in token_scores.items()}
+                if not scores:
+                    return []
+
+            ranked = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+            return [(score, state.documents[project_id][0]) for project_id, score in ranked]
+
+
+def _pending(session):
+    return session.info.setdefault('search_index_pending', (set(), set(), set()))
+
+
+def _after_flush(session, flush_context):
+    from app.models import Project, Tag
+
+    state = current_app.extensions.get('search_index')
+    # Until a search builds the index there is nothing to keep up to date
+    if state is None or state.built_at is None:
+        return
+    changed, tags, removed = _pending(session)
+    for instance in session.deleted:
+        if isinstance(instance, Project):
+            removed.add(instance.id)
+    changed.update(
+        instance.id for instance in chain(session.new, session.dirty)
+        if isinstance(instance, Project) and instance.id is not None
+    )
+    # A renamed tag changes every project it is attached to
+    tags.update(
+        instance.id for instance in session.dirty
+        if isinstance(instance, Tag) and session.is_modified(instance)
+    )
+
+
+def _after_commit(session):
+    pending = session.info.pop('search_index_pending', None)
+    if pending and 'search_index' in current_app.extensions:
+        from app import search_index
+        changed, tags, removed = pending
+        search_index.update(changed - removed, tags, removed)
+
+
+def _after_soft_rollback(session, previous_transaction):
+    session.info.pop('search_index_pending', None)
@@ -0,0 +1,83 @@
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy.orm import selectinload
+
+from app.utils.cache import CacheEntry
+
+
+class Snapshot(CacheEntry):
+    """A prebuilt JSON body with its strong ETag, compressed once per encoding like cached responses."""
+    __slots__ = ()
+
+    def __init__(self, body, version):
+        super().__init__(body, 'application/json', version)
+
+
+class _SnapshotState:
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.snapshot = None
+        self.lock = threading.Lock()
+
+
+def build_portfolio():
+    """Collects every public project, tag and social link into one document."""
+    from app.models import Project, Tag, SocialLink
+
+    projects = Project.query.options(selectinload(Project.tags)).order_by(Project.id).all()
+    tags = Tag.with_project_counts().order_by(Tag.id).all()
+    social_links = SocialLink.query.order_by(SocialLink.id).all()
+    return {
+        "projects": [project.dump() for project in projects],
+        "tags": [{**tag.to_dict(partial=True), "project_count": count} for tag, count in tags],
+        "social_links": [social_link.dump() for social_link in social_links],
+    }
+
+
+class PortfolioSnapshot:
+    """
+    Serves all public data as one prebuilt JSON document, compressed once per encoding.
+
+    The snapshot is tied to the response cache's content version. It is rebuilt once, by the
+    first request after a write bumps that version, and every other request is served from
+    memory. Like cached responses, it also expires after `RESPONSE_CACHE_TTL` seconds to pick
+    up writes made through other workers.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['portfolio_snapshot'] = _SnapshotState(app.config.get('RESPONSE_CACHE_TTL', 30))
+
+    @staticmethod
+    def _state():
+        return current_app.extensions['portfolio_snapshot']
+
+    @staticmethod
+    def _is_current(snapshot, state, version):
+        return (
+            snapshot is not None
+            and snapshot.version == version
+            and time.monotonic() - snapshot.created_at <= state.ttl
+        )
+
+    def get(self):
+        from app import response_cache
+
+        state = self._state()
+        version = response_cache.version
+        snapshot = state.snapshot
+        if self._is_current(snapshot, state, version):
+            return snapshot
+
+        with state.lock:
+            # Another thread may have rebuilt it while this one waited for the lock
+            snapshot = state.snapshot
+            if not self._is_current(snapshot, state, version):
+                body = current_app.json.dumps(build_portfolio()).encode()
+                snapshot = state.snapshot = Snapshot(body, version)
+            return snapshot
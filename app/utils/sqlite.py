@@ -0,0 +1,69 @@
+from sqlalchemy import event
+
+_JOURNAL_MODES = {'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'}
+_SYNCHRONOUS = {'OFF', 'NORMAL', 'FULL', 'EXTRA'}
+
+
+def apply_sqlite_profile(engine, config):
+    """
+    Tunes every connection `engine` opens from the `SQLITE_*` settings in `config`.
+
+    The statement cache is a connect argument of sqlite3, so it is set on `do_connect`;
+    the pragmas run on `connect`, once per new connection rather than per checkout.
+    """
+    journal_mode = config['SQLITE_JOURNAL_MODE'].upper()
+    synchronous = config['SQLITE_SYNCHRONOUS'].upper()
+    if journal_mode not in _JOURNAL_MODES:
+        raise ValueError(f"Invalid SQLITE_JOURNAL_MODE {journal_mode!r}")
+    if synchronous not in _SYNCHRONOUS:
+        raise ValueError(f"Invalid SQLITE_SYNCHRONOUS {synchronous!r}")
+    pragmas = (
+        f"PRAGMA busy_timeout = {int(config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        f"PRAGMA journal_mode = {journal_mode}",
+        f"PRAGMA synchronous = {synchronous}",
+        f"PRAGMA mmap_size = {int(config['SQLITE_MMAP_SIZE'])}",
+    )
+    statement_cache_size = int(config['SQLITE_STATEMENT_CACHE_SIZE'])
+
+    @event.listens_for(engine, 'do_connect')
+    def set_statement_cache(dialect, connection_record, cargs, cparams):
+        cparams.setdefault('cached_statements', statement_cache_size)
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+class SQLiteProfile:
+    """
+    Applies the SQLite profile (WAL journal, `synchronous=NORMAL`, memory-mapped reads, a busy
+    timeout and a larger statement cache) to the app's SQLite engines. MariaDB engines are
+    left alone, so the same config serves either backend.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('SQLITE_PROFILE_ENABLED', True)
+        app.config.setdefault('SQLITE_JOURNAL_MODE', 'WAL')
+        app.config.setdefault('SQLITE_SYNCHRONOUS', 'NORMAL')
+        app.config.setdefault('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)
+        app.config.setdefault('SQLITE_BUSY_TIMEOUT_MS', 5000)
+        app.config.setdefault('SQLITE_STATEMENT_CACHE_SIZE', 256)
+        if not app.config['SQLITE_PROFILE_ENABLED']:
+            return
+
+        from app import db
+
+        with app.app_context():
+            engines = list(db.engines.values())
+        for engine in engines:
+            if engine.dialect.name == 'sqlite':
+                apply_sqlite_profile(engine, app.config)
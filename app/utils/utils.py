@@ -1,10 +1,14 @@
 import re
 
-from flask_bcrypt import generate_password_hash
-
 
 def hash_password(plain_text_password):
-    return generate_password_hash(plain_text_password, 16)
+    from app import password_hasher
+    return password_hasher.hash(plain_text_password)
+
+
+def check_password(password_hash, plain_text_password):
+    from app import password_hasher
+    return password_hasher.verify(password_hash, plain_text_password)
 
 
 # Regex for YYYY-MM-DD format
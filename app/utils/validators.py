@@ -1,7 +1,7 @@
 from functools import wraps
 
-from flask import jsonify
-from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from flask import jsonify, current_app
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity, get_jwt
 
 
 def validate_user_id(user_id):
@@ -23,9 +23,13 @@ def admin_required(fn):
         current_user = get_jwt_identity()
         if not current_user:
             return jsonify({"error": "Invalid user"}), 401
-        from app.models import User
-        user = User.query.filter_by(id=current_user).first()
-        if not user or not user.is_admin:
+        is_admin = None
+        if current_app.config['JWT_TRUST_ADMIN_CLAIM']:
+            is_admin = get_jwt().get("is_admin")
+        if is_admin is None:
+            from app import principal_cache
+            is_admin = principal_cache.is_admin(current_user)
+        if not is_admin:
             return jsonify({"error": "Unauthorized"}), 401
         return fn(*args, **kwargs)
 
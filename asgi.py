@@ -0,0 +1,4 @@
+from app.asgi import AsyncReadApp
+from main import app
+
+asgi_app = AsyncReadApp(app)
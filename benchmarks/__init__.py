@@ -0,0 +1,2 @@
+# Benchmarks for the API. Run them as modules from the project root, e.g.
+# `python -m benchmarks.bench_serializers`.
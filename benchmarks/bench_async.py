@@ -0,0 +1,106 @@
+"""
+Async read path against gthread workers under many concurrent clients.
+
+Seeds an SQLite file, then serves the app once with gunicorn gthread workers and once with
+uvicorn running asgi.py, where the project, tag and social link reads are coroutines on
+SQLAlchemy's asyncio engine. Both get the same read-only load from concurrent keep-alive
+clients; requests per second, latency percentiles and errors are reported for each.
+
+    python -m benchmarks.bench_async
+    python -m benchmarks.bench_async --clients 256 --duration 20
+    BENCHMARK_DATABASE_URI=mysql+pymysql://... python -m benchmarks.bench_async
+
+The gains come from waiting on the database without holding a thread, so they show most
+against MariaDB over the network; with a local SQLite file the queries barely wait at all.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.bench_workers import ROOT, drive, percentile, seed, wait_until_listening
+
+READS = ("/v1/projects?limit=20", "/v1/projects/1", "/v1/tags?include=count", "/v1/tags?include=project_ids",
+         "/v1/sociallinks")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--servers", nargs="+", default=["gthread", "asgi"], choices=["gthread", "asgi"])
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=8, help="threads per gthread worker")
+    parser.add_argument("--clients", type=int, default=128)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--warmup", type=float, default=3, help="seconds of load discarded before measuring")
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+    args.login_every = 0
+    return args
+
+
+def start_server(name, args, env):
+    if name == "asgi":
+        command = [sys.executable, "-m", "uvicorn", "asgi:asgi_app", "--host", "127.0.0.1",
+                   "--port", str(args.port), "--workers", str(args.workers), "--no-access-log",
+                   "--log-level", "warning"]
+    else:
+        command = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"]
+    server = subprocess.Popen(
+        command,
+        cwd=ROOT,
+        env={
+            **env,
+            "GUNICORN_WORKER_CLASS": "gthread",
+            "WEB_CONCURRENCY": str(args.workers),
+            "GUNICORN_THREADS": str(args.threads),
+            "DB_POOL_SIZE": str(args.threads),
+            "PORT": str(args.port),
+        },
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return wait_until_listening(server, args.port, name)
+
+
+def main():
+    args = parse_args()
+    database_uri = os.getenv("BENCHMARK_DATABASE_URI")
+    path = None
+    if not database_uri or database_uri == "sqlite://":
+        handle, path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        database_uri = f"sqlite:///{path}"
+        seed(path, args.projects, 4)
+    env = {
+        **os.environ,
+        "APP_CONFIG": "benchmarks.common.BenchmarkConfig",
+        "BENCHMARK_DATABASE_URI": database_uri,
+        "PYTHONPATH": ROOT,
+    }
+
+    print(f"{args.workers} workers, {args.threads} threads (gthread), {args.clients} clients "
+          f"for {args.duration:.0f}s, {database_uri.split('://')[0]}")
+    print(f"{'server':<10}{'req/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'errors':>8}")
+    for name in args.servers:
+        server = start_server(name, args, env)
+        try:
+            drive(args, args.warmup, READS)
+            latencies, errors, elapsed = drive(args, args.duration, READS)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+        if not latencies:
+            print(f"{name:<10} no requests completed")
+            continue
+        print(f"{name:<10}{len(latencies) / elapsed:10.1f}{percentile(latencies, 0.5) * 1000:10.2f}"
+              f"{percentile(latencies, 0.9) * 1000:10.2f}{percentile(latencies, 0.99) * 1000:10.2f}"
+              f"{statistics.fmean(latencies) * 1000:10.2f}{len(errors):8}")
+    if path:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Bytes on the wire and CPU per request for each response encoding.
+
+Seeds an SQLite database and requests the list endpoints through the Flask test client
+with no Accept-Encoding, with gzip and with brotli, first with the response cache off (every
+response compressed as it is sent) and then on (each cached entry compressed once).
+
+    python -m benchmarks.bench_compression
+    python -m benchmarks.bench_compression --projects 1000 --requests 500
+"""
+import argparse
+import time
+
+from app import db
+from app.models import SocialLink
+from benchmarks.common import BenchmarkConfig, create_benchmark_app, seed_projects
+
+PATHS = ("/v1/projects?limit=100", "/v1/tags?include=project_slugs&limit=100", "/v1/sociallinks", "/v1/portfolio")
+ENCODINGS = ("identity", "gzip", "br")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint and encoding")
+    return parser.parse_args()
+
+
+def measure(client, path, encoding, requests):
+    """(response bytes, CPU ms per request) for `requests` requests of `path`."""
+    headers = {"Accept-Encoding": encoding}
+    size = len(client.get(path, headers=headers).data)
+    started = time.process_time()
+    for _ in range(requests):
+        client.get(path, headers=headers)
+    return size, (time.process_time() - started) / requests * 1000
+
+
+def main():
+    args = parse_args()
+    app = create_benchmark_app(BenchmarkConfig)
+    with app.app_context():
+        seed_projects(args.projects)
+        for i in range(10):
+            SocialLink(name=f"link{i}", description="Benchmark link", url=f"https://example.com/{i}",
+                       icon="link").save()
+        db.session.remove()
+
+    client = app.test_client()
+    print(f"{args.projects} projects, {args.requests} requests per row")
+    print(f"{'endpoint':<46}{'cache':>6}{'encoding':>10}{'bytes':>10}{'ratio':>8}{'cpu ms':>9}")
+    for cached in (False, True):
+        app.config["RESPONSE_CACHE_ENABLED"] = cached
+        for path in PATHS:
+            raw = None
+            for encoding in ENCODINGS:
+                size, cpu = measure(client, path, encoding, args.requests)
+                raw = raw or size
+                print(f"{path:<46}{'on' if cached else 'off':>6}{encoding:>10}{size:10}{size / raw:8.2f}{cpu:9.3f}")
+
+
+if __name__ == "__main__":
+    main()
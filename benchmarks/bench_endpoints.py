@@ -0,0 +1,273 @@
+"""
+Endpoint benchmark suite.
+
+Builds the app through `create_app()` on SQLite, seeds a dataset of the requested size and
+drives every blueprint through the Flask test client. For each endpoint it reports latency
+percentiles, SQL statements per request and peak memory allocated per request. Results can
+be saved as a baseline and later runs compared against it.
+
+    python -m benchmarks.bench_endpoints --projects 100
+    python -m benchmarks.bench_endpoints --projects 10000 --database /tmp/bench.db
+    python -m benchmarks.bench_endpoints --projects 100 --runs 5 --save-baseline
+    python -m benchmarks.bench_endpoints --projects 100 --runs 3 --compare
+
+With `--runs`, every figure is the median over the runs, and the spread of each endpoint's p50
+between the runs is kept as its noise band. Comparison fails (exit code 1) when an endpoint's
+p50 latency regresses by more than `--threshold` percent plus the noise bands of the baseline
+and of the current run, or when it issues more queries than in the baseline.
+
+Latencies depend on the machine, so the committed baseline only describes the machine it was
+recorded on, which is saved with it. Record a baseline on the machine you compare on before
+relying on `--compare`.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from flask_bcrypt import generate_password_hash
+from flask_jwt_extended import create_access_token, get_csrf_token
+from sqlalchemy import event, insert
+
+from app import db
+from app.models import SocialLink, User
+from benchmarks.common import BenchmarkConfig, create_benchmark_app, seed_projects
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+PASSWORD = "benchmark-password-1234"
+
+
+class EndpointBenchmarkConfig(BenchmarkConfig):
+    # Also registers the test blueprint, so every blueprint is driven
+    FLASK_ENV = "development"
+
+
+def endpoints(projects):
+    """(name, method, path, json body, needs admin) for every endpoint being measured."""
+    middle = max(projects // 2, 1)
+    return [
+        ("test.ping", "GET", "/v1/test/ping", None, False),
+        ("projects.list", "GET", "/v1/projects", None, False),
+        ("projects.page", "GET", "/v1/projects?limit=20", None, False),
+        ("projects.deep_page", "GET", "/v1/projects?limit=20&sort=-begin_date", None, False),
+        ("projects.filtered", "GET", "/v1/projects?status=completed&featured=true&limit=20", None, False),
+        ("projects.by_tag", "GET", "/v1/projects?tag=tag1&limit=20", None, False),
+        ("projects.detail", "GET", f"/v1/projects/{middle}", None, False),
+        ("projects.search", "GET", "/v1/projects/search?q=bench proj 4", None, False),
+        ("tags.counts", "GET", "/v1/tags", None, False),
+        ("tags.slugs", "GET", "/v1/tags?include=project_slugs", None, False),
+        ("sociallinks.list", "GET", "/v1/sociallinks", None, False),
+        ("sociallinks.detail", "GET", "/v1/sociallinks/1", None, False),
+        ("portfolio", "GET", "/v1/portfolio", None, False),
+        ("users.list", "GET", "/v1/users", None, True),
+        ("users.login", "POST", "/v1/users/login", {"username": "benchmark", "password": PASSWORD}, False),
+        ("admin.blocklist_stats", "GET", "/v1/admin/blocklist/stats", None, True),
+        ("social_links.update", "PATCH", "/v1/sociallinks/1", {
+            "name": "github", "description": "Updated during the benchmark", "url": "https://github.com",
+            "icon": "github",
+        }, True),
+    ]
+
+
+def seed(projects, tags):
+    seed_projects(projects, tags=tags)
+    for i in range(10):
+        SocialLink(name=f"link{i}", description="Benchmark link", url=f"https://example.com/{i}",
+                   icon="link").save()
+    db.session.execute(insert(User).values(
+        email="benchmark@example.com",
+        username="benchmark",
+        password=generate_password_hash(PASSWORD, 4).decode("utf-8"),
+        email_confirmed=True,
+        is_admin=True,
+    ))
+    db.session.commit()
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def measure(app, client, csrf, method, path, body, needs_admin, iterations, warmup):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    headers = {"X-CSRF-TOKEN": csrf} if needs_admin else {}
+    # Admin requests authenticate with the cookie; public ones go out without it
+    client.delete_cookie("access_token_cookie")
+    if needs_admin:
+        client.set_cookie("access_token_cookie", app.config["_BENCHMARK_TOKEN"])
+
+    def call():
+        response = client.open(path, method=method, json=body, headers=headers)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method} {path} returned {response.status_code}: {response.get_data(as_text=True)}")
+        return response
+
+    for _ in range(warmup):
+        call()
+
+    latencies = []
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", count)
+    statements.clear()
+    for _ in range(iterations):
+        started = time.perf_counter()
+        response = call()
+        latencies.append(time.perf_counter() - started)
+    with app.app_context():
+        event.remove(db.engine, "before_cursor_execute", count)
+    queries = len(statements) / iterations
+
+    # Allocations are measured in a separate pass, since tracing slows every request down
+    tracemalloc.start()
+    peaks = []
+    for _ in range(min(iterations, 20)):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        call()
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    return {
+        "p50_ms": round(percentile(latencies, 0.50) * 1e3, 3),
+        "p90_ms": round(percentile(latencies, 0.90) * 1e3, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1e3, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1e3, 3),
+        "queries": round(queries, 2),
+        "peak_alloc_kib": round(statistics.median(peaks) / 1024, 1),
+        "response_kib": round(len(response.get_data()) / 1024, 1),
+    }
+
+
+def run(projects, tags, database, iterations, warmup, cache):
+    class Config(EndpointBenchmarkConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{database}" if database else "sqlite://"
+        RESPONSE_CACHE_ENABLED = cache
+
+    if database and os.path.exists(database):
+        os.remove(database)
+    app = create_benchmark_app(Config)
+    with app.app_context():
+        started = time.perf_counter()
+        seed(projects, tags)
+        print(f"Seeded {projects} projects and {tags} tags in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        user_id = User.query.filter_by(username="benchmark").one().id
+        token = create_access_token(identity=str(user_id), additional_claims={"is_admin": True})
+        app.config["_BENCHMARK_TOKEN"] = token
+        csrf = get_csrf_token(token)
+
+    client = app.test_client()
+    results = {}
+    for name, method, path, body, needs_admin in endpoints(projects):
+        # Full listings of very large datasets are slow by design; measure them less often
+        count = max(3, iterations // 10) if projects > 5000 and name in ("projects.list", "tags.slugs", "portfolio") \
+            else iterations
+        results[name] = measure(app, client, csrf, method, path, body, needs_admin, count, warmup)
+    return results
+
+
+def combine(runs):
+    """Medians over several runs' results, with the spread of p50 between them as a percentage of its median."""
+    results = {}
+    for name in runs[0]:
+        samples = [run[name] for run in runs]
+        combined = {metric: round(statistics.median(sample[metric] for sample in samples), 3) for metric in samples[0]}
+        p50s = [sample["p50_ms"] for sample in samples]
+        combined["p50_noise_pct"] = round((max(p50s) - min(p50s)) / combined["p50_ms"] * 100, 1) \
+            if combined["p50_ms"] else 0.0
+        results[name] = combined
+    return results
+
+
+def machine():
+    return f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs, Python {platform.python_version()}"
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"  {name:<24} (new)")
+            continue
+        change = (current["p50_ms"] - previous["p50_ms"]) / previous["p50_ms"] * 100 if previous["p50_ms"] else 0.0
+        allowed = threshold + previous.get("p50_noise_pct", 0.0) + current["p50_noise_pct"]
+        flags = []
+        if change > allowed:
+            flags.append(f"p50 +{change:.0f}% (allowed {allowed:.0f}%)")
+        if current["queries"] > previous["queries"]:
+            flags.append(f"queries {previous['queries']} -> {current['queries']}")
+        if flags:
+            regressions.append(name)
+        print(f"  {name:<24} p50 {previous['p50_ms']:>9.3f} -> {current['p50_ms']:>9.3f} ms ({change:+6.1f}%)"
+              f"{'  REGRESSION: ' + ', '.join(flags) if flags else ''}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=100, help="Projects to seed (e.g. 100, 10000, 100000).")
+    parser.add_argument("--tags", type=int, default=None, help="Distinct tags to seed. Defaults to projects / 10.")
+    parser.add_argument("--database", default=None, help="SQLite file to use instead of an in-memory database.")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--cache", action="store_true", help="Enable the response cache.")
+    parser.add_argument("--runs", type=int, default=1,
+                        help="Repeat the whole benchmark and report medians; the spread is the noise band.")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--threshold", type=float, default=25.0, help="Allowed p50 regression, in percent.")
+    args = parser.parse_args(argv)
+
+    tags = args.tags or max(args.projects // 10, 10)
+    results = combine([
+        run(args.projects, tags, args.database, args.iterations, args.warmup, args.cache)
+        for _ in range(max(args.runs, 1))
+    ])
+
+    print(f"{'endpoint':<24} {'p50 ms':>9} {'noise %':>8} {'p90 ms':>9} {'p99 ms':>9} {'queries':>8} "
+          f"{'alloc KiB':>10} {'size KiB':>9}")
+    for name, result in results.items():
+        print(f"{name:<24} {result['p50_ms']:>9.3f} {result['p50_noise_pct']:>8} {result['p90_ms']:>9.3f} "
+              f"{result['p99_ms']:>9.3f} {result['queries']:>8} {result['peak_alloc_kib']:>10} "
+              f"{result['response_kib']:>9}")
+
+    key = f"{args.projects}{'-cached' if args.cache else ''}"
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baselines = json.load(file)
+
+    exit_code = 0
+    if args.compare:
+        if key not in baselines:
+            print(f"No baseline for {key} in {args.baseline}", file=sys.stderr)
+            return 1
+        baseline = baselines[key]
+        if baseline["machine"] != machine():
+            print(f"Baseline {key} was recorded on {baseline['machine']}, not on this machine ({machine()}). "
+                  f"Latencies are not comparable; record a local baseline with --save-baseline.", file=sys.stderr)
+        print(f"Compared to baseline {key} ({baseline['runs']} runs):")
+        regressions = compare(results, baseline["endpoints"], args.threshold)
+        exit_code = 1 if regressions else 0
+
+    if args.save_baseline:
+        baselines[key] = {"machine": machine(), "runs": max(args.runs, 1), "endpoints": results}
+        with open(args.baseline, "w") as file:
+            json.dump(baselines, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print(f"Saved baseline {key} to {args.baseline}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
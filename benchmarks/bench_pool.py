@@ -0,0 +1,147 @@
+"""
+Connection pool load test across an idle period.
+
+Drives concurrent reads through the Flask test client, leaves the pool idle while the
+database closes its connections, then drives the same load again and reports request
+errors and pool counters for both phases. With pre-ping the second phase should show
+invalidated connections but no errors.
+
+On SQLite the server side disconnect is simulated by closing the pooled connections behind
+the pool's back. Against MariaDB, set BENCHMARK_DATABASE_URI to a mysql+pymysql URI; the
+session wait_timeout is lowered below the idle period so the server really drops them.
+
+    python -m benchmarks.bench_pool
+    python -m benchmarks.bench_pool --no-pre-ping
+    BENCHMARK_DATABASE_URI=mysql+pymysql://... python -m benchmarks.bench_pool --idle 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import event
+
+from app import db
+from app.utils.pool import InstrumentedQueuePool, pool_snapshot
+from benchmarks.common import BenchmarkConfig, create_benchmark_app, seed_projects
+
+PATHS = ("/v1/projects?limit=20", "/v1/tags?include=count", "/v1/sociallinks", "/v1/projects/1")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=400, help="requests per phase")
+    parser.add_argument("--idle", type=float, default=3.0, help="seconds to stay idle between phases")
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--max-overflow", type=int, default=2)
+    parser.add_argument("--pool-timeout", type=float, default=10)
+    parser.add_argument("--no-pre-ping", action="store_true")
+    return parser.parse_args()
+
+
+def make_config(args, database_uri):
+    class PoolBenchmarkConfig(BenchmarkConfig):
+        SQLALCHEMY_DATABASE_URI = database_uri
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            **(BenchmarkConfig.SQLALCHEMY_ENGINE_OPTIONS or {}),
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": args.pool_size,
+            "max_overflow": args.max_overflow,
+            "pool_timeout": args.pool_timeout,
+            "pool_pre_ping": not args.no_pre_ping,
+        }
+
+    return PoolBenchmarkConfig
+
+
+def run_phase(app, args):
+    def request(index):
+        try:
+            with app.test_client() as client:
+                return client.get(PATHS[index % len(PATHS)]).status_code
+        except Exception as e:
+            return type(e).__name__
+
+    before = pool_snapshot()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.threads) as executor:
+        results = list(executor.map(request, range(args.requests)))
+    elapsed = time.perf_counter() - started
+    after = pool_snapshot()
+
+    errors = [result for result in results if result != 200]
+    checkouts = after["checkouts"] - before["checkouts"]
+    return {
+        "requests": len(results),
+        "errors": len(errors),
+        "error_kinds": sorted(set(map(str, errors))),
+        "throughput": len(results) / elapsed,
+        "checkouts": checkouts,
+        "mean_wait_ms": (after["checkout_wait_seconds"] - before["checkout_wait_seconds"]) / (checkouts or 1) * 1000,
+        "timeouts": after["checkout_timeouts"] - before["checkout_timeouts"],
+        "connects": after["connects"] - before["connects"],
+        "invalidations": after["invalidations"] - before["invalidations"],
+    }
+
+
+def drop_pooled_connections(engine):
+    """Closes every idle pooled DBAPI connection without telling the pool, as a server restart would."""
+    dropped = 0
+    for record in list(engine.pool._pool.queue):
+        if record.dbapi_connection is not None:
+            record.dbapi_connection.close()
+            dropped += 1
+    return dropped
+
+
+def report(name, phase):
+    print(f"{name:<10} {phase['requests']:>5} requests  {phase['errors']:>4} errors {phase['error_kinds'] or ''}  "
+          f"{phase['throughput']:8.1f} req/s  wait {phase['mean_wait_ms']:.3f} ms  timeouts {phase['timeouts']}  "
+          f"connects {phase['connects']}  invalidated {phase['invalidations']}")
+
+
+def main():
+    args = parse_args()
+    database_uri = os.getenv("BENCHMARK_DATABASE_URI")
+    if not database_uri or database_uri == "sqlite://":
+        handle, path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        database_uri = f"sqlite:///{path}"
+    mysql = database_uri.startswith("mysql")
+
+    app = create_benchmark_app(make_config(args, database_uri))
+    with app.app_context():
+        engine = db.engine
+        if mysql:
+            wait_timeout = max(int(args.idle) - 1, 1)
+
+            @event.listens_for(engine, "connect")
+            def lower_wait_timeout(dbapi_connection, connection_record):
+                with dbapi_connection.cursor() as cursor:
+                    cursor.execute(f"SET SESSION wait_timeout = {wait_timeout}")
+
+            engine.dispose()
+        seed_projects(100)
+        db.session.remove()
+
+    print(f"Pool size {args.pool_size} + overflow {args.max_overflow}, {args.threads} threads, "
+          f"pre-ping {'off' if args.no_pre_ping else 'on'}, {database_uri.split('://')[0]}")
+    first = run_phase(app, args)
+    report("before", first)
+
+    time.sleep(args.idle)
+    if not mysql:
+        print(f"Idle {args.idle}s, dropped {drop_pooled_connections(engine)} pooled connections")
+    else:
+        print(f"Idle {args.idle}s past the session wait_timeout")
+
+    second = run_phase(app, args)
+    report("after", second)
+    return 1 if first["errors"] or second["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
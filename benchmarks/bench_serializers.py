@@ -0,0 +1,66 @@
+"""
+Per-row cost of serializing and JSON-encoding a large project list.
+
+Compares the per-row `to_dict` the models used before serializers were compiled, and
+Flask's default JSON provider, against the compiled serializers and `FastJSONProvider`.
+
+    python -m benchmarks.bench_serializers [rows]
+"""
+import sys
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy.orm import selectinload
+
+from app.models import Project
+from benchmarks.common import create_benchmark_app, seed_projects, timed
+
+
+def legacy_to_dict(obj, exclude=None, partial=False):
+    """The serializer as it was before it was compiled per model class."""
+    exclude = exclude or []
+    if hasattr(obj, '__table__'):
+        serialized_data = {
+            column.name: getattr(obj, column.name)
+            for column in obj.__table__.columns
+            if column.name not in exclude
+        }
+        if not partial:
+            if hasattr(obj, 'tags'):
+                serialized_data['tags'] = [legacy_to_dict(tag, partial=True) for tag in obj.tags]
+        return serialized_data
+    raise AttributeError(f"{obj.__class__.__name__} does not have a __table__ attribute.")
+
+
+def main(rows=10_000, repeat=5):
+    app = create_benchmark_app()
+    with app.app_context():
+        seed_projects(rows)
+        projects = Project.query.options(selectinload(Project.tags)).all()
+        legacy_json = DefaultJSONProvider(app)
+        fast_json = app.json
+
+        legacy_data = [legacy_to_dict(project) for project in projects]
+        compiled_data = [project.dump() for project in projects]
+        assert legacy_data == compiled_data
+
+        results = {
+            "to_dict (legacy)": timed(lambda: [legacy_to_dict(project) for project in projects], repeat),
+            "to_dict (compiled)": timed(lambda: [project.dump() for project in projects], repeat),
+            "json (flask default)": timed(lambda: legacy_json.dumps(compiled_data), repeat),
+            "json (fast provider)": timed(lambda: fast_json.dumps(compiled_data), repeat),
+        }
+        with app.test_request_context():
+            results["end to end (before)"] = timed(
+                lambda: legacy_json.response([legacy_to_dict(project) for project in projects]), repeat
+            )
+            results["end to end (after)"] = timed(
+                lambda: fast_json.response([project.dump() for project in projects]), repeat
+            )
+
+    print(f"{rows} projects, best of {repeat}, orjson={'on' if fast_json.use_orjson else 'off'}")
+    for name, seconds in results.items():
+        print(f"  {name:<22} {seconds * 1e6 / rows:8.2f} us/row  {seconds * 1e3:9.2f} ms total")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
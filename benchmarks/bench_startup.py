@@ -0,0 +1,95 @@
+"""
+Cold start time, from launching gunicorn to the first request served.
+
+Starts gunicorn with gunicorn.conf.py against an SQLite file and polls until a request
+succeeds, a few times per scenario:
+- fresh: empty database, MIGRATE_ON_START creates the schema (one worker migrates, under the lock)
+- current: schema up to date, MIGRATE_ON_START only runs its version check
+- no-check: MIGRATE_ON_START off
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 10 --workers 4
+"""
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_workers import ROOT
+
+SCENARIOS = ("fresh", "current", "no-check")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=SCENARIOS)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--path", default="/v1/sociallinks", help="request that must succeed")
+    parser.add_argument("--port", type=int, default=8767)
+    return parser.parse_args()
+
+
+def time_to_first_request(args, database, migrate_on_start):
+    """Seconds from starting gunicorn until `args.path` answers 200."""
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"],
+        cwd=ROOT,
+        env={
+            **os.environ,
+            "APP_CONFIG": "benchmarks.common.BenchmarkConfig",
+            "BENCHMARK_DATABASE_URI": f"sqlite:///{database}",
+            "MIGRATE_ON_START": str(migrate_on_start).lower(),
+            "WEB_CONCURRENCY": str(args.workers),
+            "PORT": str(args.port),
+            "PYTHONPATH": ROOT,
+        },
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = started + 60
+        while time.perf_counter() < deadline:
+            connection = http.client.HTTPConnection("127.0.0.1", args.port, timeout=5)
+            try:
+                connection.request("GET", args.path)
+                if connection.getresponse().status == 200:
+                    return time.perf_counter() - started
+            except (OSError, http.client.HTTPException):
+                pass
+            finally:
+                connection.close()
+            if server.poll() is not None:
+                raise RuntimeError(f"gunicorn exited with {server.returncode}")
+            time.sleep(0.005)
+        raise RuntimeError("no successful request within 60s")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    args = parse_args()
+    directory = tempfile.mkdtemp()
+    current = os.path.join(directory, "current.db")
+    # Creates the schema the "current" and "no-check" scenarios start from
+    time_to_first_request(args, current, True)
+
+    print(f"{args.workers} workers, first successful GET {args.path}, {args.runs} runs")
+    print(f"{'scenario':<10}{'median ms':>12}{'min ms':>10}{'max ms':>10}")
+    for scenario in args.scenarios:
+        samples = []
+        for run in range(args.runs):
+            database = os.path.join(directory, f"fresh-{run}.db") if scenario == "fresh" else current
+            samples.append(time_to_first_request(args, database, scenario != "no-check"))
+        print(f"{scenario:<10}{statistics.median(samples) * 1000:12.1f}{min(samples) * 1000:10.1f}"
+              f"{max(samples) * 1000:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
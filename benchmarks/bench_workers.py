@@ -0,0 +1,191 @@
+"""
+Worker class comparison under concurrent load.
+
+Seeds an SQLite file, then starts gunicorn with gunicorn.conf.py once per worker class and
+drives the same mix of reads and logins at it from concurrent keep-alive clients. Reports
+requests per second, latency percentiles and errors for each worker class.
+
+    python -m benchmarks.bench_workers
+    python -m benchmarks.bench_workers --classes gthread gevent --clients 64 --duration 20
+    python -m benchmarks.bench_workers --bcrypt-rounds 12
+
+Logins hash with `--bcrypt-rounds`, so raising it shows how a slow login holds up the
+requests queued behind it under each model.
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from flask_bcrypt import generate_password_hash
+from sqlalchemy import insert
+
+from app import db
+from app.models import SocialLink, User
+from benchmarks.common import BenchmarkConfig, create_benchmark_app, seed_projects
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = "benchmark-password-1234"
+READS = ("/v1/projects?limit=20", "/v1/projects/1", "/v1/tags?include=count", "/v1/sociallinks",
+         "/v1/portfolio", "/v1/projects/search?q=benchmark")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classes", nargs="+", default=["sync", "gthread", "gevent"])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=4, help="threads per gthread worker")
+    parser.add_argument("--connections", type=int, default=100, help="greenlets per gevent worker")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--warmup", type=float, default=3, help="seconds of load discarded before measuring")
+    parser.add_argument("--login-every", type=int, default=20, help="one request in N is a login; 0 disables")
+    parser.add_argument("--bcrypt-rounds", type=int, default=10)
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--port", type=int, default=8765)
+    return parser.parse_args()
+
+
+def seed(path, projects, rounds):
+    class SeedConfig(BenchmarkConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+
+    app = create_benchmark_app(SeedConfig)
+    with app.app_context():
+        seed_projects(projects)
+        for i in range(10):
+            SocialLink(name=f"link{i}", description="Benchmark link", url=f"https://example.com/{i}",
+                       icon="link").save()
+        db.session.execute(insert(User).values(
+            email="benchmark@example.com",
+            username="benchmark",
+            password=generate_password_hash(PASSWORD, rounds).decode("utf-8"),
+            email_confirmed=True,
+        ))
+        db.session.commit()
+
+
+def start_server(worker_class, args, env):
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"],
+        cwd=ROOT,
+        env={
+            **env,
+            "GUNICORN_WORKER_CLASS": worker_class,
+            "WEB_CONCURRENCY": str(args.workers),
+            "GUNICORN_THREADS": str(args.threads),
+            "GUNICORN_WORKER_CONNECTIONS": str(args.connections),
+            "PORT": str(args.port),
+        },
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return wait_until_listening(server, args.port, f"gunicorn {worker_class}")
+
+
+def wait_until_listening(server, port, name):
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return server
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError(f"{name} exited with {server.returncode}")
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"{name} did not start")
+
+
+def drive(args, duration, paths=READS):
+    latencies, errors = [], []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    login = json.dumps({"username": "benchmark", "password": PASSWORD})
+
+    def client(index):
+        connection = http.client.HTTPConnection("127.0.0.1", args.port, timeout=60)
+        local_latencies, local_errors, sent = [], [], index
+        while time.monotonic() < deadline:
+            sent += 1
+            is_login = args.login_every and sent % args.login_every == 0
+            started = time.perf_counter()
+            try:
+                if is_login:
+                    connection.request("POST", "/v1/users/login", body=login,
+                                       headers={"Content-Type": "application/json"})
+                else:
+                    connection.request("GET", paths[sent % len(paths)])
+                response = connection.getresponse()
+                response.read()
+                if response.status >= 500:
+                    local_errors.append(response.status)
+            except (OSError, http.client.HTTPException) as e:
+                local_errors.append(type(e).__name__)
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", args.port, timeout=60)
+            local_latencies.append(time.perf_counter() - started)
+        connection.close()
+        with lock:
+            latencies.extend(local_latencies)
+            errors.extend(local_errors)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(args.clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - started
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def main():
+    args = parse_args()
+    handle, path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+    seed(path, args.projects, args.bcrypt_rounds)
+    env = {
+        **os.environ,
+        "APP_CONFIG": "benchmarks.common.BenchmarkConfig",
+        "BENCHMARK_DATABASE_URI": f"sqlite:///{path}",
+        "BENCHMARK_BCRYPT_ROUNDS": str(args.bcrypt_rounds),
+        "PYTHONPATH": ROOT,
+    }
+
+    print(f"{args.workers} workers, {args.threads} threads (gthread), {args.connections} connections (gevent), "
+          f"{args.clients} clients for {args.duration:.0f}s, 1 in {args.login_every} requests a login "
+          f"at {args.bcrypt_rounds} rounds")
+    print(f"{'class':<10}{'req/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'errors':>8}")
+    for worker_class in args.classes:
+        server = start_server(worker_class, args, env)
+        try:
+            # Lets every worker build its search index and portfolio snapshot first
+            drive(args, args.warmup)
+            latencies, errors, elapsed = drive(args, args.duration)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+        if not latencies:
+            print(f"{worker_class:<10} no requests completed")
+            continue
+        print(f"{worker_class:<10}{len(latencies) / elapsed:10.1f}{percentile(latencies, 0.5) * 1000:10.2f}"
+              f"{percentile(latencies, 0.9) * 1000:10.2f}{percentile(latencies, 0.99) * 1000:10.2f}"
+              f"{statistics.fmean(latencies) * 1000:10.2f}{len(errors):8}")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
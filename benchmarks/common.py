@@ -0,0 +1,57 @@
+import os
+import random
+import time
+
+from app import create_app, db
+from app.config import Config
+
+
+class BenchmarkConfig(Config):
+    FLASK_ENV = "benchmark"
+    SQLALCHEMY_DATABASE_URI = os.getenv("BENCHMARK_DATABASE_URI", "sqlite://")
+    # The pool and PyMySQL timeouts in Config only apply to MariaDB
+    SQLALCHEMY_ENGINE_OPTIONS = Config.MARIADB_ENGINE_OPTIONS if SQLALCHEMY_DATABASE_URI.startswith("mysql") else {}
+    SECRET_KEY = "benchmark-secret-key"
+    JWT_SECRET_KEY = "benchmark-jwt-secret-key-that-is-long-enough"
+    JWT_COOKIE_SECURE = False
+    BCRYPT_LOG_ROUNDS = int(os.getenv("BENCHMARK_BCRYPT_ROUNDS", 4))
+    RESPONSE_CACHE_ENABLED = False
+
+
+def create_benchmark_app(config=BenchmarkConfig):
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def seed_projects(count, tags=50, tags_per_project=3, seed=0):
+    """Inserts `count` projects drawing tags from a pool of `tags` names. Needs an app context."""
+    from app.utils.bulk_import import BulkImport
+
+    rng = random.Random(seed)
+    statuses = ("completed", "maintained", "developing")
+    types = ("personal", "commission", "other")
+    rows = [{
+        "name": f"Benchmark project {i}",
+        "description": f"Benchmark project number {i}, seeded for performance measurements.",
+        "url": f"https://example.com/projects/{i}",
+        "type": types[i % len(types)],
+        "status": statuses[i % len(statuses)],
+        "featured": i % 10 == 0,
+        "begin_date": f"{2015 + i % 10}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+        "tags": [f"tag{rng.randrange(tags)}" for _ in range(tags_per_project)],
+    } for i in range(count)]
+    report = BulkImport().run({"projects": rows})
+    if report["errors"]:
+        raise RuntimeError(f"Seeding failed: {report['errors'][:3]}")
+
+
+def timed(fn, repeat):
+    """Returns the best wall time of `repeat` calls to `fn`, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
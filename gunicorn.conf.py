@@ -0,0 +1,32 @@
+"""
+Gunicorn settings, read automatically from the working directory.
+
+GUNICORN_WORKER_CLASS selects the concurrency model:
+- gthread (default): each worker serves GUNICORN_THREADS requests at once on OS threads.
+- gevent: each worker multiplexes up to GUNICORN_WORKER_CONNECTIONS requests on greenlets.
+  Raise DB_POOL_SIZE with it, as every in-flight query holds a pooled connection.
+- sync: one request at a time per worker.
+"""
+import os
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+
+if worker_class == "gevent":
+    # Patch before the app is imported, so the locks and thread-locals it creates at import
+    # time are gevent-aware even when the app is preloaded in the master
+    from gevent import monkey
+
+    monkey.patch_all()
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 100))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+# Recycle workers now and then, with jitter so they do not all restart together
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = max_requests // 10
+preload_app = os.getenv("GUNICORN_PRELOAD", "false").lower() == "true"
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
@@ -1,18 +1,12 @@
 import os
-from datetime import datetime, timedelta
 
-from flask_migrate import upgrade
-
-from app import create_app, db
+from app import create_app
+from app.utils.migrations import ensure_schema
 
 app = create_app()
 
-
-def clean_revoked_tokens():
-    expiration = datetime.now() - timedelta(days=30)  # Example: 30-day expiration
-    from app.models.revoked_token import RevokedToken
-    RevokedToken.query.filter(RevokedToken.revoked_at < expiration).delete(commit=False)
-    db.session.commit()
+if app.config["MIGRATE_ON_START"]:
+    ensure_schema(app)
 
 
 @app.after_request
@@ -24,11 +18,6 @@ def after_request(response):
 
 
 if __name__ == "__main__":
-    with app.app_context():
-        db.create_all()
-
-    upgrade()
+    ensure_schema(app)
 
     app.run(debug=True, port=os.getenv("PORT", default=8080))
-
-    clean_revoked_tokens()
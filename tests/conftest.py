@@ -0,0 +1,105 @@
+import pytest
+from flask_jwt_extended import create_access_token, get_csrf_token
+from sqlalchemy import event, insert
+
+from app import create_app, db
+from app.config import Config
+from app.models.project import Project, Tag
+from app.models.user import User
+
+
+class TestConfig(Config):
+    FLASK_ENV = "testing"
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    # The pool and PyMySQL timeouts in Config only apply to MariaDB
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    SECRET_KEY = "test-secret-key"
+    JWT_SECRET_KEY = "test-jwt-secret-key-that-is-long-enough"
+    JWT_COOKIE_SECURE = False
+    BCRYPT_LOG_ROUNDS = 4
+    # Tests write straight to the database, so responses are only cached where a test opts in
+    RESPONSE_CACHE_ENABLED = False
+    QUERY_TRACKER_ENABLED = True
+
+
+@pytest.fixture
+def app():
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def count_queries(app):
+    """Counts the SQL statements executed while the returned list is being recorded."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def make_projects(app):
+    """Creates `count` projects with `tags_per_project` tags each. Tags are shared when `shared_tags` is set."""
+
+    def make(count, tags_per_project=3, shared_tags=False, start=0, **fields):
+        for i in range(start, start + count):
+            project = Project(**{
+                "name": f"Project {i}",
+                "description": "A sample project",
+                "type": "personal",
+                "status": "completed",
+                "begin_date": "2020-01-01",
+                **fields,
+            })
+            db.session.add(project)
+            for j in range(tags_per_project):
+                name = f"tag{j}" if shared_tags else f"tag{i}x{j}"
+                project.add_tag(Tag.get_or_create(name=name, commit=False))
+        db.session.commit()
+        db.session.expunge_all()
+
+    return make
+
+
+@pytest.fixture
+def make_user(app):
+    """Inserts a user without going through password hashing, returning its id."""
+
+    def make(username="admin", is_admin=True):
+        result = db.session.execute(insert(User).values(
+            email=f"{username}@example.com",
+            username=username,
+            password="not-a-real-hash",
+            email_confirmed=True,
+            is_admin=is_admin,
+        ))
+        db.session.commit()
+        return result.inserted_primary_key[0]
+
+    return make
+
+
+@pytest.fixture
+def login(app, client):
+    """Authenticates the test client as the given user, returning the CSRF header for writes."""
+
+    def login_as(user_id, **claims):
+        token = create_access_token(identity=str(user_id), additional_claims=claims)
+        client.set_cookie("access_token_cookie", token)
+        return {"X-CSRF-TOKEN": get_csrf_token(token)}
+
+    return login_as
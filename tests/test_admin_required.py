@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.models.user import User
+
+
+@pytest.fixture
+def user_queries(count_queries):
+    return lambda: [statement for statement in count_queries if "FROM users" in statement]
+
+
+def test_principal_is_cached_between_admin_requests(client, make_user, login, user_queries):
+    login(make_user())
+    assert client.get("/v1/admin/blocklist/stats").status_code == 200
+    assert client.get("/v1/admin/blocklist/stats").status_code == 200
+    assert len(user_queries()) == 1
+
+
+def test_non_admin_is_rejected(client, make_user, login):
+    login(make_user(username="visitor", is_admin=False))
+    assert client.get("/v1/admin/blocklist/stats").status_code == 401
+
+
+def test_demoted_admin_is_rejected_immediately(client, make_user, login):
+    user_id = make_user()
+    login(user_id)
+    assert client.get("/v1/admin/blocklist/stats").status_code == 200
+
+    user = db.session.get(User, user_id)
+    user.is_admin = False
+    user.save()
+    assert client.get("/v1/admin/blocklist/stats").status_code == 401
+
+
+def test_deleted_admin_is_rejected_immediately(client, make_user, login):
+    user_id = make_user()
+    victim_id = make_user(username="other")
+    login(victim_id)
+    assert client.get("/v1/admin/blocklist/stats").status_code == 200
+
+    headers = login(user_id)
+    assert client.delete(f"/v1/users/delete/id/{victim_id}", headers=headers).status_code == 204
+    login(victim_id)
+    assert client.get("/v1/admin/blocklist/stats").status_code == 401
+
+
+def test_trusted_admin_claim_skips_the_lookup(app, client, make_user, login, user_queries):
+    app.config['JWT_TRUST_ADMIN_CLAIM'] = True
+    login(make_user(), is_admin=True)
+    assert client.get("/v1/admin/blocklist/stats").status_code == 200
+    assert user_queries() == []
+
+
+def test_demotion_is_invalidated_on_commit(app, make_user):
+    from app import principal_cache
+
+    user_id = make_user()
+    assert principal_cache.is_admin(user_id)
+    user = db.session.get(User, user_id)
+    user.is_admin = False
+    db.session.flush()
+    # Uncommitted: other requests still read the old row, so the entry must stay until the commit
+    assert str(user_id) in app.extensions["principal_cache"].entries
+    db.session.commit()
+    assert str(user_id) not in app.extensions["principal_cache"].entries
+    assert not principal_cache.is_admin(user_id)
+
+
+def test_lookup_racing_an_invalidation_is_not_cached(app, make_user):
+    from app import principal_cache
+
+    user_id = make_user()
+
+    def demoted_meanwhile(conn, cursor, statement, parameters, context, executemany):
+        # Another request commits a demotion after this lookup has read the old row
+        if "FROM users" in statement:
+            principal_cache.invalidate(user_id)
+
+    event.listen(db.engine, "after_cursor_execute", demoted_meanwhile)
+    try:
+        assert principal_cache.is_admin(user_id)
+    finally:
+        event.remove(db.engine, "after_cursor_execute", demoted_meanwhile)
+    assert str(user_id) not in app.extensions["principal_cache"].entries
@@ -0,0 +1,139 @@
+import asyncio
+import json
+
+import pytest
+
+from app import create_app, db
+from app.asgi import AsyncReadApp, async_database_uri
+from app.models import SocialLink
+from tests.conftest import TestConfig
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Overrides the in-memory app, so the asyncio engine sees the same database file."""
+    class AsyncConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'app.db'}"
+
+    app = create_app(AsyncConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def asgi(app):
+    asgi_app = AsyncReadApp(app)
+    yield asgi_app
+    asyncio.run(asgi_app.engine.dispose())
+
+
+def call(asgi_app, path, method="GET"):
+    """Runs one request through the ASGI app, returning the status, headers and body."""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": query.encode(), "headers": [(b"host", b"localhost")],
+        "server": ("localhost", 80), "client": ("127.0.0.1", 5000),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(asgi_app(scope, receive, send))
+    start = messages[0]
+    headers = {name.decode(): value.decode() for name, value in start["headers"]}
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return start["status"], headers, body
+
+
+@pytest.mark.parametrize("path", [
+    "/v1/projects?limit=2",
+    "/v1/projects?tags=tag1&sort=-id",
+    "/v1/projects/3",
+    "/v1/tags",
+    "/v1/tags?include=project_ids",
+    "/v1/tags?include=project_slugs&limit=2",
+    "/v1/tags?include=projects",
+    "/v1/sociallinks",
+    "/v1/sociallinks/1",
+])
+def test_async_reads_match_flask_views(asgi, client, make_projects, path):
+    make_projects(5, shared_tags=True)
+    SocialLink(name="site", description="A link", url="https://example.com", icon="link").save()
+
+    status, headers, body = call(asgi, path)
+    expected = client.get(path)
+    assert status == expected.status_code == 200
+    assert json.loads(body) == expected.get_json()
+    assert headers["content-type"] == "application/json"
+
+
+def test_async_pagination_follows_next_link(asgi, make_projects):
+    make_projects(5)
+    _, _, body = call(asgi, "/v1/projects?limit=3")
+    first = json.loads(body)
+    _, _, body = call(asgi, first["next"].removeprefix("http://localhost"))
+    assert [project["id"] for project in first["items"] + json.loads(body)["items"]] == [1, 2, 3, 4, 5]
+
+
+def test_async_errors_use_flask_handlers(asgi, client):
+    status, _, body = call(asgi, "/v1/projects/99")
+    assert status == 404
+    assert body == client.get("/v1/projects/99").data
+
+    status, _, body = call(asgi, "/v1/tags?include=everything")
+    assert status == 400
+    assert json.loads(body)["error"] == "Bad request"
+
+
+def test_head_and_other_routes(asgi, make_projects):
+    make_projects(1)
+    status, headers, body = call(asgi, "/v1/projects/1", method="HEAD")
+    assert (status, body) == (200, b"")
+    assert int(headers["content-length"]) > 0
+
+    # Writes and unported reads fall through to the Flask app
+    status, _, _ = call(asgi, "/v1/projects/delete/id/1", method="DELETE")
+    assert status == 401
+    status, _, body = call(asgi, "/v1/portfolio")
+    assert status == 200 and "projects" in json.loads(body)
+
+
+def test_async_database_uri():
+    assert str(async_database_uri({"SQLALCHEMY_DATABASE_URI": "mysql+pymysql://u:p@db/app"})) \
+        == "mysql+aiomysql://u:***@db/app"
+    assert async_database_uri({"SQLALCHEMY_DATABASE_URI": "sqlite://"}).drivername == "sqlite+aiosqlite"
+    assert async_database_uri({"ASYNC_SQLALCHEMY_DATABASE_URI": "sqlite+aiosqlite://"}) == "sqlite+aiosqlite://"
+
+
+def test_async_reads_skip_the_replica_router(tmp_path):
+    class ReplicaConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'primary.db'}"
+        SQLALCHEMY_REPLICA_URIS = [f"sqlite:///{tmp_path / 'replica.db'}"]
+
+    app = create_app(ReplicaConfig)
+    replica = app.extensions["replica_router"].replicas[0]
+    # A replica that is down and due for a probe, which would block the event loop
+    app.extensions["replica_router"].mark_down(replica)
+    replica.retry_at = 0
+    with app.app_context():
+        db.create_all()
+        SocialLink(name="primary", description="A link", url="https://example.com", icon="link").save()
+        db.session.remove()
+
+    asgi_app = AsyncReadApp(app)
+    try:
+        status, _, body = call(asgi_app, "/v1/sociallinks")
+    finally:
+        asyncio.run(asgi_app.engine.dispose())
+        replica.engine.dispose()
+    assert status == 200
+    assert [link["name"] for link in json.loads(body)] == ["primary"]
+    assert (replica.reads, replica.failures, replica.healthy) == (0, 1, False)
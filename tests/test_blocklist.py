@@ -0,0 +1,57 @@
+import uuid
+
+from app import token_blocklist
+from app.models.revoked_token import RevokedToken
+from app.utils.blocklist import BloomFilter
+
+
+def revoke(jti):
+    RevokedToken(jti=jti, user_id=1).save()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [str(uuid.uuid4()) for _ in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_positives = sum(str(uuid.uuid4()) in bloom for _ in range(10_000))
+    assert false_positives < 300
+
+
+def test_unknown_token_is_accepted_without_a_query(app, count_queries):
+    revoke("revoked-at-startup")
+    token_blocklist.sync(force=True)
+    count_queries.clear()
+    assert not token_blocklist.is_revoked(str(uuid.uuid4()))
+    assert count_queries == []
+    assert token_blocklist.is_revoked("revoked-at-startup")
+    assert count_queries == []
+
+
+def test_revocations_from_other_workers_are_seen_after_sync(app):
+    app.extensions['token_blocklist'].sync_interval = 0
+    assert not token_blocklist.is_revoked("revoked-elsewhere")
+    revoke("revoked-elsewhere")
+    assert token_blocklist.is_revoked("revoked-elsewhere")
+
+
+def test_filter_is_rebuilt_when_capacity_is_exceeded(app):
+    app.extensions['token_blocklist'].capacity = 4
+    for i in range(10):
+        revoke(f"jti-{i}")
+    token_blocklist.sync(force=True)
+    stats = token_blocklist.stats()
+    assert stats["filter_capacity"] >= 20
+    assert stats["filter_items"] == 10
+    assert all(token_blocklist.is_revoked(f"jti-{i}") for i in range(10))
+
+
+def test_revocation_committed_out_of_id_order_is_seen(app):
+    app.extensions['token_blocklist'].sync_interval = 0
+    # The row with id 1 commits after the row with id 2 was already synced
+    RevokedToken(id=2, jti="committed-first", user_id=1).save()
+    assert token_blocklist.is_revoked("committed-first")
+    RevokedToken(id=1, jti="committed-late", user_id=1).save()
+    assert token_blocklist.is_revoked("committed-late")
+    assert token_blocklist.stats()["filter_items"] == 2
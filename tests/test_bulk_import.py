@@ -0,0 +1,103 @@
+import json
+
+import email_validator
+
+from app import db
+from app.models import Project, Tag, SocialLink
+from app.utils.bulk_import import BulkImport
+
+
+def project_row(i, **fields):
+    return {
+        "name": f"Imported {i}",
+        "description": "An imported project",
+        "type": "personal",
+        "status": "completed",
+        "begin_date": "2021-01-01",
+        "tags": [f"tag{i % 5}"],
+        "tech": ["python"],
+        **fields,
+    }
+
+
+def test_import_writes_valid_rows_and_reports_errors(app):
+    Project(**{k: v for k, v in project_row(0).items() if k not in ("tags", "tech")}).save()
+    payload = {
+        "projects": [project_row(i) for i in range(25)] + [project_row(99, status="abandoned")],
+        "social_links": [{"name": "github", "description": "Code", "url": "https://github.com", "icon": "gh"}],
+    }
+    report = BulkImport(chunk_size=10).run(payload)
+
+    assert report["imported"] == {"projects": 25, "social_links": 1, "users": 0}
+    assert report["errors"] == [{
+        "section": "projects",
+        "index": 25,
+        "error": "Invalid status. Must be one of 'completed', 'maintained', or 'developing'. (Imported 99)",
+    }]
+    assert Project.query.count() == 26
+    assert Tag.query.count() == 6
+    assert SocialLink.query.count() == 1
+    # The pre-existing project keeps its slug; the imported one with the same name gets a suffix
+    assert Project.query.filter_by(name="Imported 0").count() == 2
+    assert db.session.get(Project, 2).slug == "imported-0-1"
+    assert sorted(tag.name for tag in db.session.get(Project, 2).tags) == ["python", "tag0"]
+    assert db.session.get(Project, 2).featured is False
+
+
+def test_dry_run_writes_nothing(app):
+    report = BulkImport().run({"projects": [project_row(i) for i in range(3)]}, dry_run=True)
+    assert report["valid"]["projects"] == 3
+    assert report["imported"]["projects"] == 0
+    assert Project.query.count() == 0
+
+
+def test_duplicate_explicit_slugs_are_rejected(app):
+    report = BulkImport().run({"projects": [project_row(1, slug="same"), project_row(2, slug="same")]})
+    assert report["imported"]["projects"] == 1
+    assert report["errors"][0]["index"] == 1
+
+
+def test_tags_must_be_lists(app):
+    report = BulkImport().run({"projects": [project_row(1, tags="python"), project_row(2, tech={"name": "x"})]})
+    assert report["imported"]["projects"] == 0
+    assert [error["error"] for error in report["errors"]] == [
+        "'tags' must be a list of tag names.", "'tech' must be a list of tag names.",
+    ]
+    assert Tag.query.count() == 0
+
+
+def test_import_is_chunked(app, count_queries):
+    BulkImport(chunk_size=50).run({"projects": [project_row(i) for i in range(200)]})
+    assert Project.query.count() == 200
+    assert len([statement for statement in count_queries if statement.startswith("INSERT INTO projects ")]) <= 4
+
+
+def test_import_command(app, tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"projects": [project_row(i) for i in range(3)]}))
+    result = app.test_cli_runner().invoke(args=["import-data", str(path)])
+    assert result.exit_code == 0
+    assert "projects: 3 imported, 0 errors" in result.output
+    assert "users: 0 imported, 0 errors" in result.output
+    assert "Imported 3 rows in" in result.output
+    assert Project.query.count() == 3
+
+
+def test_user_uniqueness_is_checked_with_one_query(app, make_user, count_queries, monkeypatch):
+    monkeypatch.setattr(email_validator, "CHECK_DELIVERABILITY", False)
+    make_user(username="taken")
+    count_queries.clear()
+    report = BulkImport().run({"users": [
+        {"username": f"user{i}", "email": f"user{i}@example.com", "password": "a-long-enough-password"}
+        for i in range(20)
+    ] + [
+        {"username": "taken", "email": "new@example.com", "password": "a-long-enough-password"},
+        {"username": "fresh", "email": "taken@example.com", "password": "a-long-enough-password"},
+        {"username": "user0", "email": "again@example.com", "password": "a-long-enough-password"},
+    ]})
+
+    assert report["imported"]["users"] == 20
+    assert [(error["index"], error["error"]) for error in report["errors"]] == [
+        (20, "Username already in use."), (21, "Email already in use."), (22, "Username already in use."),
+    ]
+    assert len([statement for statement in count_queries if statement.startswith("SELECT users.")]) == 1
@@ -0,0 +1,90 @@
+import gzip
+import json
+
+import brotli
+import pytest
+
+from app import response_cache
+
+
+@pytest.fixture
+def cached_client(app, client):
+    app.config['RESPONSE_CACHE_ENABLED'] = True
+    return client
+
+
+def test_uncompressed_without_accept_encoding(client, make_projects):
+    make_projects(10)
+    response = client.get("/v1/projects")
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert len(response.json) == 10
+
+
+@pytest.mark.parametrize("accept, encoding", [
+    ("gzip", "gzip"),
+    ("gzip, deflate, br", "br"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("*", "br"),
+    ("gzip;q=0, identity", None),
+])
+def test_encoding_is_negotiated(client, make_projects, accept, encoding):
+    make_projects(10)
+    plain = client.get("/v1/projects").data
+    response = client.get("/v1/projects", headers={"Accept-Encoding": accept})
+
+    assert response.headers.get("Content-Encoding") == encoding
+    assert int(response.headers["Content-Length"]) == len(response.data)
+    decompress = {"gzip": gzip.decompress, "br": brotli.decompress, None: bytes}[encoding]
+    assert decompress(response.data) == plain
+    if encoding:
+        assert len(response.data) < len(plain) / 3
+
+
+def test_small_and_error_responses_are_not_compressed(client, make_projects):
+    make_projects(1, tags_per_project=0)
+    small = client.get("/v1/sociallinks", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+    assert "Vary" not in small.headers
+
+    missing = client.get("/v1/projects/99", headers={"Accept-Encoding": "gzip"})
+    assert missing.status_code == 404
+    assert "Content-Encoding" not in missing.headers
+
+
+def test_cached_entries_are_compressed_once_per_version(app, cached_client, make_projects, monkeypatch):
+    calls = []
+    state = app.extensions["response_compressor"]
+
+    def compress(body, encoding):
+        calls.append(encoding)
+        return state.compress(body, encoding)
+
+    monkeypatch.setattr("app.utils.cache.compress", compress)
+    make_projects(10)
+
+    for accept in ("gzip", "gzip", "br", "br", "gzip", None):
+        headers = {"Accept-Encoding": accept} if accept else {}
+        response = cached_client.get("/v1/projects", headers=headers)
+        assert response.headers.get("Content-Encoding") == accept
+        assert response.headers["Vary"] == "Accept-Encoding"
+    assert calls == ["gzip", "br"]
+
+    response_cache.bump()
+    cached_client.get("/v1/projects", headers={"Accept-Encoding": "gzip"})
+    assert calls == ["gzip", "br", "gzip"]
+
+
+def test_each_encoding_has_its_own_etag(cached_client, make_projects):
+    make_projects(10)
+    plain = cached_client.get("/v1/tags?include=project_slugs")
+    gzipped = cached_client.get("/v1/tags?include=project_slugs", headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers["ETag"] != plain.headers["ETag"]
+    assert json.loads(gzip.decompress(gzipped.data)) == plain.json
+
+    revalidated = cached_client.get("/v1/tags?include=project_slugs",
+                                    headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["ETag"]})
+    assert revalidated.status_code == 304
+    stale = cached_client.get("/v1/tags?include=project_slugs",
+                              headers={"Accept-Encoding": "gzip", "If-None-Match": plain.headers["ETag"]})
+    assert stale.status_code == 200
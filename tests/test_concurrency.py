@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+from flask_jwt_extended import create_access_token, get_csrf_token
+
+from app import create_app, db
+from tests.conftest import TestConfig
+
+READS = ("/v1/projects", "/v1/projects/search?q=project", "/v1/portfolio", "/v1/tags?include=count")
+
+
+@pytest.fixture
+def app(tmp_path):
+    """A file database with the response cache on, as gthread and gevent workers would share it."""
+    class ConcurrentConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'app.db'}"
+        RESPONSE_CACHE_ENABLED = True
+
+    app = create_app(ConcurrentConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+def test_concurrent_reads_and_writes_stay_consistent(app, make_projects, make_user):
+    make_projects(20, shared_tags=True)
+    token = create_access_token(identity=str(make_user()))
+    headers = {"X-CSRF-TOKEN": get_csrf_token(token)}
+    failures = []
+
+    def reader():
+        client = app.test_client()
+        for _ in range(15):
+            for path in READS:
+                response = client.get(path)
+                if response.status_code != 200:
+                    failures.append((path, response.status_code))
+
+    def writer():
+        client = app.test_client()
+        client.set_cookie("access_token_cookie", token)
+        for i in range(10):
+            response = client.post("/v1/projects", headers=headers, json={
+                "name": f"Concurrent Project {i}",
+                "description": "Written while others read",
+                "type": "personal",
+                "status": "completed",
+                "begin_date": "2021-01-01",
+                "tags": ["tag0", f"concurrent{i}"],
+            })
+            if response.status_code != 201:
+                failures.append(("POST", response.status_code))
+
+    threads = [threading.Thread(target=reader) for _ in range(6)] + [threading.Thread(target=writer)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert failures == []
+    client = app.test_client()
+    assert len(client.get("/v1/projects/search?q=concurrent").get_json()) == 10
+    assert len(client.get("/v1/projects?limit=100").get_json()["items"]) == 30
+    portfolio = client.get("/v1/portfolio").get_json()
+    assert len(portfolio["projects"]) == 30
@@ -0,0 +1,91 @@
+import json
+
+from app import create_app, db, request_metrics
+from app.utils.pool import pool_snapshot
+from tests.conftest import TestConfig
+
+
+def endpoint(summary, name, status=200):
+    return next(e for e in summary["endpoints"] if e["endpoint"] == name and e["status"] == status)
+
+
+def test_requests_are_recorded_per_endpoint_and_status(app, client, make_projects):
+    make_projects(3)
+    client.get("/v1/projects")
+    client.get("/v1/projects")
+    client.get("/v1/projects/9999")
+    client.get("/v1/no-such-route")
+
+    summary = request_metrics.summary()
+    listing = endpoint(summary, "project_routes.get_projects")
+    assert listing["requests"] == 2
+    assert listing["sql_queries"]["mean"] >= 1
+    assert listing["response_bytes"]["mean"] > 0
+    assert listing["latency_ms"]["p50"] is not None
+    assert endpoint(summary, "project_routes.get_project", status=404)["requests"] == 1
+    assert endpoint(summary, "unmatched", status=404)["requests"] == 1
+
+
+def test_metrics_endpoint_requires_admin_and_renders_prometheus(client, make_user, login):
+    assert client.get("/v1/admin/metrics").status_code == 401
+
+    login(make_user())
+    client.get("/v1/projects")
+    assert client.get("/v1/admin/metrics").get_json()["endpoints"]
+
+    response = client.get("/v1/admin/metrics?format=prometheus")
+    assert response.mimetype == "text/plain"
+    text = response.get_data(as_text=True)
+    assert '# TYPE http_request_duration_seconds histogram' in text
+    assert 'http_request_duration_seconds_count{endpoint="project_routes.get_projects",method="GET",status="200"} 1' in text
+    assert 'http_request_sql_queries_total{endpoint="project_routes.get_projects"' in text
+
+
+def test_worker_files_are_merged(tmp_path):
+    class SharedConfig(TestConfig):
+        METRICS_DIR = str(tmp_path)
+        METRICS_FLUSH_INTERVAL = 0
+
+    workers = [create_app(SharedConfig), create_app(SharedConfig)]
+    for worker in workers:
+        with worker.app_context():
+            db.create_all()
+        worker.test_client().get("/v1/projects")
+
+    with workers[0].app_context():
+        listing = endpoint(request_metrics.summary(), "project_routes.get_projects")
+    assert listing["requests"] == 2
+    assert len(list(tmp_path.glob("metrics-*.json"))) == 2
+
+
+def test_metrics_can_be_disabled():
+    class DisabledConfig(TestConfig):
+        METRICS_ENABLED = False
+
+    app = create_app(DisabledConfig)
+    with app.app_context():
+        assert request_metrics.summary()["endpoints"] == []
+
+
+def test_pool_gauges_only_count_running_workers(tmp_path):
+    class SharedConfig(TestConfig):
+        METRICS_DIR = str(tmp_path)
+        METRICS_FLUSH_INTERVAL = 0
+
+    app = create_app(SharedConfig)
+    with app.app_context():
+        db.create_all()
+    app.test_client().get("/v1/projects")
+    pool = {"checkouts": 5, "checkout_wait_seconds": 0.5, "checkout_max_wait_seconds": 0.1, "checkout_timeouts": 1,
+            "connects": 2, "invalidations": 0, "size": 5, "checked_out": 3, "overflow": 1}
+    # A worker that exited cleanly, and one that was killed before it could say so
+    for name, running in (("metrics-exited.json", False), ("metrics-killed.json", True)):
+        (tmp_path / name).write_text(json.dumps({"pid": 2 ** 22 + 1, "running": running, "series": [], "pool": pool}))
+
+    with app.app_context():
+        own = pool_snapshot()
+        summary = request_metrics.summary()["pool"]
+    assert summary["checkouts"] == own["checkouts"] + 10
+    assert summary["checkout_timeouts"] == own["checkout_timeouts"] + 2
+    assert (summary["size"], summary["checked_out"], summary["overflow"]) == \
+        (own["size"], own["checked_out"], own["overflow"])
@@ -0,0 +1,107 @@
+import threading
+
+import pytest
+from sqlalchemy import inspect, text
+
+from app import create_app, db
+from app.utils.migrations import ensure_schema, script_heads
+from tests.conftest import TestConfig
+
+ENV = '''
+from alembic import context
+from flask import current_app
+
+with current_app.extensions["migrate"].db.engine.connect() as connection:
+    context.configure(connection=connection)
+    with context.begin_transaction():
+        context.run_migrations()
+'''
+
+REVISION = '''
+from alembic import op
+
+revision = {revision!r}
+down_revision = {down_revision!r}
+
+
+def upgrade():
+    from app import db
+    db.metadata.create_all(op.get_bind())
+'''
+
+
+def write_migrations(directory, revisions):
+    (directory / "versions").mkdir(parents=True)
+    (directory / "env.py").write_text(ENV)
+    for revision, down_revision in revisions:
+        (directory / "versions" / f"{revision}.py").write_text(
+            REVISION.format(revision=revision, down_revision=down_revision))
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    def make(migrations=None):
+        class MigrationConfig(TestConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'app.db'}"
+            MIGRATIONS_DIRECTORY = str(migrations or tmp_path / "no-migrations")
+
+        return create_app(MigrationConfig)
+
+    return make
+
+
+def test_script_heads(tmp_path):
+    write_migrations(tmp_path, [("a1", None), ("b2", "a1"), ("c3", "a1")])
+    assert script_heads(tmp_path) == {"b2", "c3"}
+
+    (tmp_path / "versions" / "d4.py").write_text("revision = 'd4'\ndown_revision = ('b2', 'c3')\n")
+    assert script_heads(tmp_path) == {"d4"}
+
+    (tmp_path / "versions" / "e5.py").write_text("revision = make_revision()\n")
+    assert script_heads(tmp_path) is None
+
+
+def test_creates_tables_without_migrations(make_app):
+    app = make_app()
+    assert ensure_schema(app) is True
+    assert ensure_schema(app) is False
+    with app.app_context():
+        assert set(db.metadata.tables) <= set(inspect(db.engine).get_table_names())
+
+
+def test_concurrent_starts_migrate_once(make_app, tmp_path):
+    write_migrations(tmp_path / "migrations", [("a1", None), ("b2", "a1")])
+    app = make_app(tmp_path / "migrations")
+    results = []
+
+    def start():
+        results.append(ensure_schema(app))
+
+    threads = [threading.Thread(target=start) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == [False, False, False, True]
+    with app.app_context():
+        assert db.session.execute(text("SELECT version_num FROM alembic_version")).scalars().all() == ["b2"]
+
+    # A new head makes the schema stale again
+    write_migrations(tmp_path / "more", [("c3", "b2")])
+    (tmp_path / "more" / "versions" / "c3.py").rename(tmp_path / "migrations" / "versions" / "c3.py")
+    assert ensure_schema(app) is True
+    assert ensure_schema(app) is False
+
+
+def test_ensure_schema_command(make_app):
+    runner = make_app().test_cli_runner()
+    assert runner.invoke(args=["ensure-schema"]).output == "Schema migrated\n"
+    assert runner.invoke(args=["ensure-schema"]).output == "Schema already current\n"
+
+
+def test_app_config_can_come_from_the_dotenv_file(monkeypatch):
+    monkeypatch.delenv("APP_CONFIG", raising=False)
+    # Stands in for a .env file that names the config class
+    monkeypatch.setattr("app.load_dotenv", lambda: monkeypatch.setenv("APP_CONFIG", "tests.conftest.TestConfig"))
+    assert create_app().config["SQLALCHEMY_DATABASE_URI"] == "sqlite://"
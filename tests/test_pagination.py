@@ -0,0 +1,53 @@
+def collect_pages(client, url):
+    items, pages = [], 0
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        items.extend(response.json["items"])
+        url = response.json["next"]
+        pages += 1
+    return items, pages
+
+
+def test_unpaginated_listing_is_unchanged(client, make_projects):
+    make_projects(5)
+    response = client.get("/v1/projects")
+    assert isinstance(response.json, list)
+    assert len(response.json) == 5
+
+
+def test_projects_are_paged_by_id(client, make_projects):
+    make_projects(7)
+    items, pages = collect_pages(client, "/v1/projects?limit=3")
+    assert pages == 3
+    assert [item["id"] for item in items] == list(range(1, 8))
+
+
+def test_projects_are_paged_by_descending_begin_date(client, make_projects):
+    make_projects(5)
+    make_projects(5, start=5)
+    items, _ = collect_pages(client, "/v1/projects?limit=4&sort=-begin_date")
+    assert [item["id"] for item in items] == list(range(10, 0, -1))
+
+
+def test_page_query_count_is_constant(client, count_queries, make_projects):
+    make_projects(30)
+    first = client.get("/v1/projects?limit=5").json
+    count_queries.clear()
+    client.get(first["next"])
+    assert len(count_queries) == 2
+
+
+def test_tags_are_paged(client, make_projects):
+    make_projects(5, tags_per_project=2)
+    items, pages = collect_pages(client, "/v1/tags?limit=4&include=project_ids")
+    assert pages == 3
+    assert len(items) == 10
+    assert all(len(item["project_ids"]) == 1 for item in items)
+
+
+def test_invalid_arguments_are_rejected(client):
+    assert client.get("/v1/projects?limit=0").status_code == 400
+    assert client.get("/v1/projects?limit=ten").status_code == 400
+    assert client.get("/v1/projects?after=garbage").status_code == 400
+    assert client.get("/v1/projects?sort=name").status_code == 400
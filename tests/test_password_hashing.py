@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+from flask_bcrypt import check_password_hash, generate_password_hash
+
+from app import db, password_hasher
+from app.exception.service_busy_error import ServiceBusyError
+from app.models.user import User
+
+PASSWORD = "correct horse battery staple"
+
+
+def create_user(rounds):
+    # Inserted directly to simulate a hash stored before the cost factor was changed
+    result = db.session.execute(db.insert(User).values(
+        email="someone@example.com",
+        username="someone",
+        password=generate_password_hash(PASSWORD, rounds).decode("utf-8"),
+    ))
+    db.session.commit()
+    return result.inserted_primary_key[0]
+
+
+def test_hash_uses_configured_cost(app):
+    password_hash = password_hasher.hash(PASSWORD)
+    assert password_hash.startswith("$2b$04$")
+    assert password_hasher.verify(password_hash, PASSWORD)
+    assert not password_hasher.verify(password_hash, PASSWORD + "!")
+
+
+def test_login_rehashes_when_cost_differs(client):
+    user_id = create_user(5)
+    response = client.post("/v1/users/login", json={"username": "someone", "password": PASSWORD})
+    assert response.status_code == 200
+    db.session.expire_all()
+    assert db.session.get(User, user_id).password.startswith("$2b$04$")
+
+
+def test_saturated_hasher_rejects_with_503(app, client):
+    create_user(4)
+    state = app.extensions['password_hasher']
+    acquired = 0
+    while state.slots.acquire(blocking=False):
+        acquired += 1
+    try:
+        with pytest.raises(ServiceBusyError):
+            password_hasher.hash(PASSWORD)
+        response = client.post("/v1/users/login", json={"username": "someone", "password": PASSWORD})
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+    finally:
+        for _ in range(acquired):
+            state.slots.release()
+    assert password_hasher.hash(PASSWORD)
+
+
+def test_hashing_runs_off_the_request_thread(app, monkeypatch):
+    threads = []
+
+    def recorded(fn):
+        def wrapper(*args):
+            threads.append(threading.current_thread().name)
+            return fn(*args)
+        return wrapper
+
+    monkeypatch.setattr("app.utils.hashing.generate_password_hash", recorded(generate_password_hash))
+    monkeypatch.setattr("app.utils.hashing.check_password_hash", recorded(check_password_hash))
+    assert password_hasher.verify(password_hasher.hash(PASSWORD), PASSWORD)
+    assert len(threads) == 2
+    assert all(name.startswith("password-hasher") for name in threads)
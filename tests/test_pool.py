@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.utils.pool import InstrumentedQueuePool, pool_snapshot
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+        pool_pre_ping=True,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_checkouts_and_exhaustion_are_counted(engine):
+    before = pool_snapshot()
+    with engine.connect():
+        assert pool_snapshot()["checked_out"] - before["checked_out"] == 1
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    after = pool_snapshot()
+    assert after["checkouts"] - before["checkouts"] == 1
+    assert after["checkout_timeouts"] - before["checkout_timeouts"] == 1
+    assert after["checked_out"] == before["checked_out"]
+
+
+def test_pre_ping_replaces_connections_closed_while_idle(engine):
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    for record in list(engine.pool._pool.queue):
+        record.dbapi_connection.close()
+
+    before = pool_snapshot()
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT 1")).scalar() == 1
+
+    after = pool_snapshot()
+    assert after["invalidations"] - before["invalidations"] == 1
+    assert after["connects"] - before["connects"] == 1
+
+
+def test_pool_counters_are_exposed_with_request_metrics(client, make_user, login):
+    login(make_user())
+    pool = client.get("/v1/admin/metrics").get_json()["pool"]
+    assert {"checkouts", "checkout_wait_ms", "checkout_timeouts", "invalidations", "checked_out"} <= pool.keys()
+    assert "db_pool_checkout_timeouts_total" in client.get("/v1/admin/metrics?format=prometheus").get_data(as_text=True)
+
+
+def test_connections_inherited_from_another_process_are_replaced(engine):
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    inherited = engine.pool._pool.queue[0]
+    inherited.info["pid"] = -1  # as if opened by the process this worker was forked from
+    original = inherited.dbapi_connection
+
+    before = pool_snapshot()
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT 1")).scalar() == 1
+        assert connection.connection.dbapi_connection is not original
+    assert pool_snapshot()["connects"] - before["connects"] == 1
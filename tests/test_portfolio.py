@@ -0,0 +1,55 @@
+import gzip
+import json
+
+from app import response_cache
+from app.models import SocialLink
+
+
+def test_portfolio_contains_all_public_data(client, make_projects):
+    make_projects(3, tags_per_project=2, shared_tags=True)
+    SocialLink(name="github", description="Code", url="https://github.com", icon="gh").save()
+    response = client.get("/v1/portfolio")
+    assert response.status_code == 200
+    assert [project["id"] for project in response.json["projects"]] == [1, 2, 3]
+    assert [(tag["name"], tag["project_count"]) for tag in response.json["tags"]] == [("tag0", 3), ("tag1", 3)]
+    assert response.json["social_links"][0]["name"] == "github"
+
+
+def test_portfolio_is_built_once_per_version(client, count_queries, make_projects):
+    make_projects(2)
+    first = client.get("/v1/portfolio")
+    count_queries.clear()
+    assert client.get("/v1/portfolio").data == first.data
+    assert count_queries == []
+
+    make_projects(1, start=2)
+    response_cache.bump()
+    second = client.get("/v1/portfolio")
+    assert len(second.json["projects"]) == 3
+    assert second.headers["ETag"] != first.headers["ETag"]
+
+
+def test_portfolio_supports_etags_and_gzip(client, make_projects):
+    make_projects(1)
+    plain = client.get("/v1/portfolio")
+    assert client.get("/v1/portfolio", headers={"If-None-Match": plain.headers["ETag"]}).status_code == 304
+
+    compressed = client.get("/v1/portfolio", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert json.loads(gzip.decompress(compressed.data)) == plain.json
+
+
+def test_portfolio_encodings_have_their_own_etags(client, make_projects):
+    make_projects(1)
+    plain = client.get("/v1/portfolio")
+    compressed = client.get("/v1/portfolio", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["ETag"] == plain.headers["ETag"][:-1] + '-gzip"'
+
+    revalidated = client.get("/v1/portfolio",
+                             headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["ETag"]})
+    assert revalidated.status_code == 304
+    # A gzip validator must not revalidate the identity body, nor the other way around
+    assert client.get("/v1/portfolio", headers={"If-None-Match": compressed.headers["ETag"]}).status_code == 200
+    assert client.get("/v1/portfolio",
+                      headers={"Accept-Encoding": "gzip", "If-None-Match": plain.headers["ETag"]}).status_code == 200
@@ -0,0 +1,54 @@
+def test_get_projects_query_count_is_constant(client, count_queries, make_projects):
+    make_projects(2)
+    count_queries.clear()
+    response = client.get("/v1/projects")
+    assert response.status_code == 200
+    assert len(response.json) == 2
+    small = len(count_queries)
+
+    make_projects(20, start=2)
+    count_queries.clear()
+    response = client.get("/v1/projects")
+    assert response.status_code == 200
+    assert len(response.json) == 22
+    assert all(len(project["tags"]) == 3 for project in response.json)
+    assert len(count_queries) == small <= 2
+
+
+def test_get_project_loads_tags_eagerly(client, count_queries, make_projects):
+    make_projects(1, tags_per_project=5)
+    count_queries.clear()
+    response = client.get("/v1/projects/1")
+    assert response.status_code == 200
+    assert len(response.json["tags"]) == 5
+    assert len(count_queries) <= 2
+
+
+def test_get_project_not_found(client):
+    assert client.get("/v1/projects/42").status_code == 404
+
+
+def test_get_projects_filters(client, make_projects):
+    make_projects(2, status="developing", begin_date="2021-06-01")
+    make_projects(3, start=2, type="commission", featured=True, begin_date="2022-03-15")
+    make_projects(1, start=5, tags_per_project=1, shared_tags=True, begin_date="2023-01-01")
+
+    def ids(query):
+        response = client.get(f"/v1/projects?{query}")
+        assert response.status_code == 200
+        projects = response.json["items"] if "limit=" in query else response.json
+        return [project["id"] for project in projects]
+
+    assert ids("status=developing") == [1, 2]
+    assert ids("type=commission&featured=true") == [3, 4, 5]
+    assert ids("featured=false&status=completed") == [6]
+    assert ids("begin_date_from=2021-01-01&begin_date_to=2022-12-31") == [1, 2, 3, 4, 5]
+    assert ids("tag=tag0") == [6]
+    assert ids("tag=tag0&tag=tag1x0") == [2, 6]
+    assert ids("type=commission&limit=2&sort=-begin_date") == [5, 4]
+
+
+def test_get_projects_rejects_invalid_filters(client):
+    assert client.get("/v1/projects?status=abandoned").status_code == 400
+    assert client.get("/v1/projects?featured=maybe").status_code == 400
+    assert client.get("/v1/projects?begin_date_from=yesterday").status_code == 400
@@ -0,0 +1,65 @@
+import logging
+
+import pytest
+from flask import jsonify
+
+from app.models.project import Project
+from app.utils.query_tracker import QueryBudgetExceeded, normalize_statement, query_budget
+
+
+@pytest.mark.parametrize("path, budget", [
+    ("/v1/projects", 3),
+    ("/v1/projects?limit=5", 3),
+    ("/v1/projects/1", 2),
+    ("/v1/tags?include=count", 1),
+    ("/v1/tags?include=projects", 3),
+    ("/v1/sociallinks", 1),
+    ("/v1/portfolio", 4),
+])
+def test_endpoint_query_budgets(client, make_projects, path, budget):
+    make_projects(10, shared_tags=True)
+    with query_budget(budget):
+        assert client.get(path).status_code == 200
+
+
+def test_budget_failure_lists_statements(client, make_projects):
+    make_projects(2)
+    with pytest.raises(QueryBudgetExceeded, match="FROM projects"):
+        with query_budget(0):
+            client.get("/v1/projects")
+
+
+def test_normalize_statement_ignores_parameters():
+    assert normalize_statement("SELECT * FROM tags WHERE id IN (?, ?, ?)") == \
+        normalize_statement("SELECT * FROM tags\n WHERE id IN (%s)")
+    assert normalize_statement("SELECT 1 FROM t WHERE name = 'a'") == "SELECT ? FROM t WHERE name = ?"
+
+
+def test_lazy_loads_are_reported_as_n_plus_one(app, client, make_projects, caplog):
+    def lazy_tags():
+        return jsonify([len(project.tags) for project in Project.query.all()])
+
+    app.add_url_rule("/lazy-tags", view_func=lazy_tags)
+    make_projects(6)
+
+    with caplog.at_level(logging.WARNING, logger=app.logger.name):
+        response = client.get("/lazy-tags")
+
+    assert response.headers["X-Query-Count"] == "7"
+    message = next(record.getMessage() for record in caplog.records if "N+1" in record.getMessage())
+    assert "GET /lazy-tags" in message
+    assert "from tests/test_query_tracker.py:" in message
+
+
+def test_failed_request_stops_tracking(app, client, make_projects):
+    def broken():
+        raise RuntimeError("view failed")
+
+    app.add_url_rule("/broken", view_func=broken)
+    make_projects(1)
+    with pytest.raises(RuntimeError, match="view failed"):
+        client.get("/broken")
+
+    # Outside any request, repeated statements must not reach the request's N+1 check
+    for _ in range(app.config["QUERY_TRACKER_REPEAT_THRESHOLD"] + 1):
+        Project.query.all()
@@ -0,0 +1,87 @@
+import pytest
+from sqlalchemy import insert
+
+from app import create_app, db
+from app.models import SocialLink
+from app.utils.replicas import STICKY_COOKIE
+from tests.conftest import TestConfig
+
+LINK = {"description": "A link", "url": "https://example.com", "icon": "link"}
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Overrides the in-memory app, so the shared fixtures run against the primary file."""
+    class ReplicaConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'primary.db'}"
+        SQLALCHEMY_REPLICA_URIS = [f"sqlite:///{tmp_path / 'replica.db'}"]
+
+    app = create_app(ReplicaConfig)
+    with app.app_context():
+        db.create_all()
+        replica = app.extensions["replica_router"].replicas[0]
+        db.metadata.create_all(replica.engine)
+        # The two files stand in for a primary and a replica that has not caught up yet
+        db.session.execute(insert(SocialLink).values(name="primary", **LINK))
+        db.session.commit()
+        with replica.engine.begin() as connection:
+            connection.execute(insert(SocialLink).values(name="replica", **LINK))
+        yield app
+        db.session.remove()
+        replica.engine.dispose()
+
+
+def link_names(client):
+    return [link["name"] for link in client.get("/v1/sociallinks").get_json()]
+
+
+def test_safe_reads_go_to_the_replica(app, client):
+    assert link_names(client) == ["replica"]
+    assert app.extensions["replica_router"].replicas[0].reads == 1
+
+
+def test_writes_go_to_the_primary_and_stick(client, make_user, login):
+    headers = login(make_user())
+
+    response = client.post("/v1/sociallinks", json={"name": "written", **LINK}, headers=headers)
+    assert response.status_code == 201
+    assert client.get_cookie(STICKY_COOKIE) is not None
+    assert link_names(client) == ["primary", "written"]
+
+    client.delete_cookie(STICKY_COOKIE)
+    assert link_names(client) == ["replica"]
+
+
+def test_failed_replica_is_skipped_until_retry(app, client):
+    state = app.extensions["replica_router"]
+    state.mark_down(state.replicas[0])
+    assert link_names(client) == ["primary"]
+
+    state.replicas[0].retry_at = 0
+    assert link_names(client) == ["replica"]
+    assert state.replicas[0].healthy
+
+
+def test_cached_reads_keep_read_your_writes(app, client, make_user, login):
+    app.config["RESPONSE_CACHE_ENABLED"] = True
+    anonymous = app.test_client()
+    assert link_names(anonymous) == ["replica"]
+
+    headers = login(make_user())
+    response = client.post("/v1/sociallinks", json={"name": "written", **LINK}, headers=headers)
+    assert response.status_code == 201
+
+    # Read from the lagging replica right after the write: served, but not cached
+    assert link_names(anonymous) == ["replica"]
+    assert link_names(client) == ["primary", "written"]
+    state = app.extensions["replica_router"]
+    with state.replicas[0].engine.begin() as connection:
+        connection.execute(insert(SocialLink).values(name="caught up", **LINK))
+    assert link_names(anonymous) == ["replica", "caught up"]
+
+    # Once the replicas have had time to catch up, replica reads are cached again
+    app.extensions["response_cache"].bumped_at -= app.config["REPLICA_STICKY_SECONDS"]
+    assert link_names(anonymous) == ["replica", "caught up"]
+    with state.replicas[0].engine.begin() as connection:
+        connection.execute(insert(SocialLink).values(name="later", **LINK))
+    assert link_names(anonymous) == ["replica", "caught up"]
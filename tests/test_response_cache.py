@@ -0,0 +1,56 @@
+import pytest
+
+from app import response_cache
+
+
+@pytest.fixture
+def cached_client(app, client):
+    app.config['RESPONSE_CACHE_ENABLED'] = True
+    return client
+
+
+def test_repeated_get_is_served_from_cache(cached_client, count_queries, make_projects):
+    make_projects(3)
+    first = cached_client.get("/v1/projects")
+    count_queries.clear()
+    second = cached_client.get("/v1/projects")
+    assert second.status_code == 200
+    assert second.data == first.data
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert count_queries == []
+
+
+def test_if_none_match_returns_304_without_queries(cached_client, count_queries, make_projects):
+    make_projects(1)
+    etag = cached_client.get("/v1/tags").headers["ETag"]
+    count_queries.clear()
+    response = cached_client.get("/v1/tags", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+    assert count_queries == []
+
+
+def test_query_string_is_part_of_the_key(cached_client, make_projects):
+    make_projects(1, tags_per_project=1)
+    counts = cached_client.get("/v1/tags").json
+    slugs = cached_client.get("/v1/tags?include=project_slugs").json
+    assert "project_slugs" not in counts[0]
+    assert slugs[0]["project_slugs"] == ["project-0"]
+
+
+def test_bump_invalidates_cached_responses(app, cached_client, make_projects):
+    make_projects(1)
+    first = cached_client.get("/v1/projects")
+    make_projects(1, start=1)
+    assert cached_client.get("/v1/projects").data == first.data
+
+    response_cache.bump()
+    second = cached_client.get("/v1/projects")
+    assert len(second.json) == 2
+    assert second.headers["ETag"] != first.headers["ETag"]
+
+
+def test_errors_are_not_cached(cached_client, make_projects):
+    assert cached_client.get("/v1/projects/1").status_code == 404
+    make_projects(1)
+    assert cached_client.get("/v1/projects/1").status_code == 200
@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+
+from app import db
+from app.models.revoked_token import RevokedToken
+
+
+def revoke(jti, days_ago):
+    RevokedToken(jti=jti, user_id=1, revoked_at=datetime.now() - timedelta(days=days_ago)).save()
+
+
+def test_revoked_at_defaults_per_row(app):
+    RevokedToken(jti="first", user_id=1).save()
+    first = RevokedToken.query.filter_by(jti="first").one().revoked_at
+    RevokedToken(jti="second", user_id=1).save()
+    assert RevokedToken.query.filter_by(jti="second").one().revoked_at > first
+
+
+def test_purge_deletes_only_expired_rows_in_batches(app):
+    for i in range(7):
+        revoke(f"old-{i}", days_ago=31)
+    revoke("recent", days_ago=29)
+
+    deleted, batches, _ = RevokedToken.purge_expired(batch_size=3)
+    assert (deleted, batches) == (7, 3)
+    assert [token.jti for token in RevokedToken.query.all()] == ["recent"]
+
+
+def test_retention_follows_refresh_token_lifetime(app):
+    app.config['JWT_REFRESH_TOKEN_EXPIRES'] = timedelta(days=7)
+    revoke("eight-days", days_ago=8)
+    revoke("six-days", days_ago=6)
+    assert RevokedToken.purge_expired()[0] == 1
+
+    app.config['JWT_REFRESH_TOKEN_EXPIRES'] = False
+    revoke("ancient", days_ago=1000)
+    assert RevokedToken.purge_expired()[0] == 0
+
+
+def test_purge_command(app):
+    revoke("old", days_ago=60)
+    result = app.test_cli_runner().invoke(args=["purge-revoked-tokens"])
+    assert result.exit_code == 0
+    assert "Purged 1 revoked tokens in 1 batches" in result.output
+    assert db.session.query(RevokedToken).count() == 0
@@ -0,0 +1,98 @@
+import time
+
+from app import db, search_index
+from app.models import Project, Tag
+from app.utils.bulk_import import BulkImport
+
+
+def create_project(name, description, tags=()):
+    project = Project(name=name, description=description, type="personal", status="completed",
+                      begin_date="2020-01-01")
+    db.session.add(project)
+    for tag in Tag.get_or_create_many([(tag, False) for tag in tags]):
+        project.add_tag(tag)
+    project.save()
+    return project
+
+
+def names(client, query):
+    response = client.get(f"/v1/projects/search?q={query}")
+    assert response.status_code == 200
+    return [project["name"] for project in response.json]
+
+
+def test_search_ranks_by_relevance_and_matches_prefixes(client):
+    create_project("Personal Website", "Frontend for my site", tags=["react"])
+    create_project("Discord Bot", "A bot written with react style hooks", tags=["python"])
+    create_project("Website Backend", "Flask backend for the website", tags=["python", "flask"])
+
+    assert names(client, "website") == ["Website Backend", "Personal Website"]
+    assert names(client, "web") == ["Website Backend", "Personal Website"]
+    assert names(client, "react") == ["Personal Website", "Discord Bot"]
+    assert names(client, "pyth fla") == ["Website Backend"]
+    assert names(client, "nothing") == []
+    assert names(client, "") == []
+
+
+def test_index_follows_commits_without_queries(client, count_queries):
+    project = create_project("Old Name", "Something")
+    assert names(client, "old") == ["Old Name"]
+
+    project.name = "New Name"
+    project.save()
+    count_queries.clear()
+    assert names(client, "old") == []
+    assert names(client, "new") == ["New Name"]
+    assert count_queries == []
+
+    project.delete()
+    assert names(client, "new") == []
+
+
+def test_rolled_back_changes_are_not_indexed(client):
+    project = create_project("Stable Name", "Something")
+    names(client, "stable")
+    project.name = "Unstable Name"
+    db.session.flush()
+    db.session.rollback()
+    assert names(client, "unstable") == []
+    assert names(client, "stable") == ["Stable Name"]
+
+
+def test_bulk_import_invalidates_the_index(client):
+    names(client, "anything")
+    BulkImport().run({"projects": [{
+        "name": "Imported Thing", "description": "Bulk", "type": "other", "status": "developing",
+        "begin_date": "2022-02-02", "tags": ["rust"],
+    }]})
+    assert names(client, "rust") == ["Imported Thing"]
+
+
+def test_search_is_fast(app):
+    BulkImport().run({"projects": [{
+        "name": f"Project number {i}", "description": f"Description with word{i % 100} in it",
+        "type": "other", "status": "developing", "begin_date": "2022-02-02", "tags": [f"t{i % 30}"],
+    } for i in range(2000)]})
+    search_index.search("warmup")
+    started = time.perf_counter()
+    for _ in range(100):
+        search_index.search("word42 proj", limit=10)
+    assert (time.perf_counter() - started) / 100 < 0.01
+
+
+def test_writes_do_not_serialize_projects_until_the_index_is_built(client, count_queries):
+    project = create_project("Lazy Name", "Something", tags=["lazy"])
+    project.name = "Renamed"
+    tag = project.tags[0]
+    count_queries.clear()
+    tag.name = "idle"
+    tag.save()
+    # No loading of the tag's projects for an index nobody has built
+    assert not [statement for statement in count_queries if "FROM projects" in statement]
+    assert db.session.info.get("search_index_pending") is None
+
+    assert names(client, "idle") == ["Renamed"]
+    tag.name = "busy"
+    tag.save()
+    assert names(client, "busy") == ["Renamed"]
+    assert names(client, "idle") == []
@@ -0,0 +1,57 @@
+from datetime import date, datetime
+
+import pytest
+
+from app.models import Project, SocialLink
+from app.utils.mixins import _serializers
+
+
+def test_dump_matches_table_columns_and_tags(app, make_projects):
+    make_projects(1, tags_per_project=2)
+    project = Project.query.one()
+    data = project.dump()
+    assert set(data) == {column.name for column in Project.__table__.columns} | {"tags"}
+    assert data["begin_date"] == date(2020, 1, 1)
+    assert [tag["name"] for tag in data["tags"]] == ["tag0x0", "tag0x1"]
+    assert "projects" not in data["tags"][0]
+    assert "tags" not in project.to_dict(partial=True)
+    assert "slug" not in project.to_dict(exclude=["slug"])
+
+
+def test_serializers_are_compiled_once(app, make_projects):
+    make_projects(3)
+    _serializers.clear()
+    for project in Project.query.all():
+        project.dump()
+    assert set(_serializers) == {
+        (Project, frozenset(), False),
+        (type(Project.query.first().tags[0]), frozenset(), True),
+    }
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_provider_writes_iso_dates(app, use_orjson):
+    app.json.use_orjson = use_orjson
+    payload = {"day": date(2020, 1, 2), "moment": datetime(2020, 1, 2, 3, 4, 5, 6), "name": "é"}
+    assert app.json.loads(app.json.dumps(payload)) == {
+        "day": "2020-01-02",
+        "moment": "2020-01-02T03:04:05.000006",
+        "name": "é",
+    }
+    with app.test_request_context():
+        response = app.json.response(payload)
+    assert response.mimetype == "application/json"
+    assert response.json["day"] == "2020-01-02"
+
+
+def test_social_links_listing_uses_iso_dates(client):
+    SocialLink(name="github", description="Code", url="https://github.com", icon="gh").save()
+    created_at = client.get("/v1/sociallinks").json[0]["created_at"]
+    assert datetime.fromisoformat(created_at)
+
+
+def test_dump_reloads_expired_attributes(app):
+    link = SocialLink(name="github", description="Code", url="https://github.com", icon="gh")
+    link.save()
+    assert "name" not in link.__dict__
+    assert link.dump()["name"] == "github"
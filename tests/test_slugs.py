@@ -0,0 +1,52 @@
+from app import db
+from app.models.project import Project, generate_unique_slug
+
+
+def create_project(name, slug=None):
+    project = Project(
+        name=name,
+        slug=slug,
+        description="A sample project",
+        type="personal",
+        status="completed",
+        begin_date="2020-01-01",
+    )
+    project.save()
+    return project
+
+
+def test_slug_is_derived_from_name(app):
+    assert create_project("My Project").slug == "my-project"
+    assert create_project("My Project").slug == "my-project-1"
+    assert create_project("My Project").slug == "my-project-2"
+
+
+def test_long_names_keep_suffixes_within_the_limit(app):
+    slugs = [create_project("An Extremely Long Project Name").slug for _ in range(12)]
+    assert slugs[0] == "an-extremely-lon"
+    assert slugs[1] == "an-extremely-l-1"
+    assert slugs[11] == "an-extremely-11"
+    assert len(set(slugs)) == 12
+    assert all(len(slug) <= 16 for slug in slugs)
+
+
+def test_slug_generation_is_a_single_query(app, count_queries):
+    for _ in range(20):
+        create_project("Crowded Name")
+    count_queries.clear()
+    assert generate_unique_slug("Crowded Name") == "crowded-name-20"
+    assert len(count_queries) == 1
+
+
+def test_generated_slug_is_not_looked_up_again(app, count_queries):
+    count_queries.clear()
+    project = Project(
+        name="Fresh Project",
+        description="A sample project",
+        type="personal",
+        status="completed",
+        begin_date="2020-01-01",
+    )
+    db.session.add(project)
+    assert project.slug == "fresh-project"
+    assert len([statement for statement in count_queries if "projects.slug" in statement]) == 1
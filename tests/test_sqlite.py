@@ -0,0 +1,92 @@
+import asyncio
+import importlib
+
+import pytest
+from sqlalchemy import text
+
+import app.config
+from app import create_app, db
+from app.asgi import AsyncReadApp
+from tests.conftest import TestConfig
+
+
+def make_config(tmp_path, **settings):
+    return type("SQLiteConfig", (TestConfig,), {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'app.db'}",
+        **settings,
+    })
+
+
+def pragmas(connection):
+    return {name: connection.execute(text(f"PRAGMA {name}")).scalar()
+            for name in ("journal_mode", "synchronous", "busy_timeout", "mmap_size")}
+
+
+def test_profile_applies_to_new_connections(tmp_path):
+    app = create_app(make_config(tmp_path, SQLITE_MMAP_SIZE=1 << 20))
+    with app.app_context(), db.engine.connect() as connection:
+        assert pragmas(connection) == {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 5000,
+                                       "mmap_size": 1 << 20}
+
+
+def test_profile_can_be_disabled(tmp_path):
+    app = create_app(make_config(tmp_path, SQLITE_PROFILE_ENABLED=False))
+    with app.app_context(), db.engine.connect() as connection:
+        assert pragmas(connection)["journal_mode"] == "delete"
+
+
+def test_invalid_setting_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="SQLITE_SYNCHRONOUS"):
+        create_app(make_config(tmp_path, SQLITE_SYNCHRONOUS="SOMETIMES"))
+
+
+def test_async_engine_gets_the_profile(tmp_path):
+    app = create_app(make_config(tmp_path))
+    asgi_app = AsyncReadApp(app)
+
+    async def read_pragmas():
+        async with asgi_app.engine.connect() as connection:
+            return await connection.run_sync(pragmas)
+
+    try:
+        assert asyncio.run(read_pragmas())["journal_mode"] == "wal"
+    finally:
+        asyncio.run(asgi_app.engine.dispose())
+
+
+@pytest.fixture
+def reload_config(monkeypatch):
+    """Re-evaluates Config under a patched environment, restoring the original afterwards."""
+    def reload(**env):
+        for name in ("DATABASE_URL", "DATABASE_BACKEND", "SQLITE_PATH"):
+            monkeypatch.delenv(name, raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        return importlib.reload(app.config).Config
+
+    yield reload
+    monkeypatch.undo()
+    importlib.reload(app.config)
+
+
+def test_backend_selection(reload_config):
+    config = reload_config(DATABASE_BACKEND="sqlite", SQLITE_PATH="site.db")
+    assert config.SQLALCHEMY_DATABASE_URI == "sqlite:///site.db"
+    assert "connect_args" not in config.SQLALCHEMY_ENGINE_OPTIONS
+
+    config = reload_config(MARIADB_HOST="db", MARIADB_PORT="3306")
+    assert config.SQLALCHEMY_DATABASE_URI.startswith("mysql+pymysql://")
+    assert config.SQLALCHEMY_ENGINE_OPTIONS["pool_pre_ping"] is True
+
+    config = reload_config(DATABASE_BACKEND="sqlite", DATABASE_URL="sqlite:////srv/site.db")
+    assert config.SQLALCHEMY_DATABASE_URI == "sqlite:////srv/site.db"
+    assert config.SQLALCHEMY_ENGINE_OPTIONS["pool_size"] == config.DB_POOL_SIZE
+
+    for uri in ("sqlite://", "sqlite:///:memory:"):
+        config = reload_config(DATABASE_BACKEND="sqlite", DATABASE_URL=uri)
+        assert config.SQLALCHEMY_ENGINE_OPTIONS == {}
+        with create_app(config).app_context():
+            assert db.session.execute(text("SELECT 1")).scalar() == 1
+
+    with pytest.raises(ValueError, match="DATABASE_BACKEND"):
+        reload_config(DATABASE_BACKEND="postgres")
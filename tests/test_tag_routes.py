@@ -0,0 +1,30 @@
+def test_get_tags_returns_project_counts(client, count_queries, make_projects):
+    make_projects(4, tags_per_project=2, shared_tags=True)
+    count_queries.clear()
+    response = client.get("/v1/tags")
+    assert response.status_code == 200
+    assert {tag["name"]: tag["project_count"] for tag in response.json} == {"tag0": 4, "tag1": 4}
+    assert "projects" not in response.json[0]
+    assert len(count_queries) == 1
+
+
+def test_get_tags_with_project_slugs(client, count_queries, make_projects):
+    make_projects(3, tags_per_project=1, shared_tags=True)
+    count_queries.clear()
+    response = client.get("/v1/tags?include=project_slugs")
+    assert response.status_code == 200
+    assert response.json[0]["project_slugs"] == ["project-0", "project-1", "project-2"]
+    assert len(count_queries) == 2
+
+
+def test_get_tags_with_full_projects(client, count_queries, make_projects):
+    make_projects(10, tags_per_project=2, shared_tags=True)
+    count_queries.clear()
+    response = client.get("/v1/tags?include=projects")
+    assert response.status_code == 200
+    assert all(len(tag["projects"]) == 10 for tag in response.json)
+    assert len(count_queries) <= 2
+
+
+def test_get_tags_rejects_unknown_include(client):
+    assert client.get("/v1/tags?include=everything").status_code == 400
@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.dialects import mysql
+from sqlalchemy.schema import CreateTable
+
+from app import db
+from app.exception.validation_error import ValidationError
+from app.models.project import Tag
+
+
+def test_get_or_create_many_resolves_existing_and_new_tags(app, count_queries):
+    Tag.get_or_create(name="python")
+    count_queries.clear()
+    tags = Tag.get_or_create_many([("python", True), ("flask", False), ("react", True), ("flask", True)])
+    assert [tag.name for tag in tags] == ["python", "flask", "react"]
+    assert [tag.is_tech for tag in tags] == [False, False, True]
+    assert all(tag.id for tag in tags)
+    # Existing lookup, multi-row upsert, and lookup of the inserted rows
+    assert len(count_queries) == 3
+    db.session.commit()
+    assert Tag.query.count() == 3
+
+
+def test_get_or_create_many_tolerates_concurrently_created_tags(app):
+    tags = Tag.get_or_create_many([("python", False)])
+    db.session.execute(Tag._upsert_statement(), [{"name": "python", "is_tech": True}])
+    assert Tag.get_or_create_many([("python", True)]) == tags
+
+
+def test_get_or_create_many_keeps_existing_spelling_under_case_insensitive_collation(app, count_queries):
+    # Rebuilds the table with a case-insensitive name column, as MariaDB's default collation has
+    ddl = str(CreateTable(Tag.__table__).compile(db.engine))
+    db.session.execute(text("DROP TABLE tags"))
+    db.session.execute(text(ddl.replace("name VARCHAR(16) NOT NULL", "name VARCHAR(16) COLLATE NOCASE NOT NULL")))
+    existing = Tag.get_or_create(name="Python")
+    count_queries.clear()
+
+    assert Tag.get_or_create_many([("python", True)]) == [existing]
+    assert existing.name == "Python" and existing.is_tech is False
+    # Resolved by the lookup alone, without an upsert
+    assert len(count_queries) == 1
+
+
+def test_mysql_upsert_never_updates_existing_tags():
+    statement = str(Tag._upsert_statement("mysql").compile(dialect=mysql.dialect()))
+    assert statement.endswith("ON DUPLICATE KEY UPDATE id = tags.id")
+
+
+def test_get_or_create_many_validates_names(app):
+    with pytest.raises(ValidationError):
+        Tag.get_or_create_many([("a-name-that-is-too-long", False)])
+    assert Tag.get_or_create_many([]) == []
+
+
+def test_create_project_resolves_tags_in_one_transaction(client, make_user, login, count_queries):
+    headers = login(make_user())
+    client.get("/v1/admin/blocklist/stats")
+    commits = []
+    event.listen(db.engine, "commit", lambda conn: commits.append(conn))
+    count_queries.clear()
+    response = client.post("/v1/projects", headers=headers, json={
+        "name": "Tagged Project",
+        "description": "A sample project",
+        "type": "personal",
+        "status": "completed",
+        "begin_date": "2020-01-01",
+        "tags": [f"tag{i}" for i in range(10)],
+        "tech": ["python", "flask"],
+    })
+    assert response.status_code == 201
+    assert len(response.json["tags"]) == 12
+    assert len([statement for statement in count_queries if "INSERT INTO tags" in statement]) == 1
+    assert len(commits) == 1
@@ -0,0 +1,19 @@
+import email_validator
+import pytest
+
+from app.models.user import User
+
+
+@pytest.fixture(autouse=True)
+def offline_email_validation(monkeypatch):
+    # Deliverability checks resolve MX records, which tests must not depend on
+    monkeypatch.setattr(email_validator, "CHECK_DELIVERABILITY", False)
+
+
+def test_create_user_hashes_password(app):
+    user = User.create(email="contact@7ori.dev", username="test", password="supersafepassword")
+
+    assert user.password != "supersafepassword"
+    assert user.password_matches("supersafepassword")
+    assert not user.password_matches("wrongpassword123456")
+    assert "password" not in user.dump()